@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from ev_parlay import metrics
+
+
+class QueueFull(Exception):
+	"""Raised when the number of unfinished jobs reached the configured limit."""
+
+
+class JobFailed(Exception):
+	"""Raised inside a worker to report a structured (JSON-able) error detail."""
+
+	def __init__(self, detail: Any):
+		super().__init__(detail)
+		self.detail = detail
+		self.metrics: Optional[Dict] = None
+
+
+def _run(fn: Callable[..., Any], *args: Any) -> Tuple[Any, Dict]:
+	"""Worker side of a job: (result, metrics it recorded) so the parent's /metrics sees pool work."""
+	metrics.REGISTRY.reset()  # a worker runs one job at a time
+	try:
+		result = fn(*args)
+	except JobFailed as e:
+		e.metrics = metrics.REGISTRY.export()
+		raise
+	return result, metrics.REGISTRY.export()
+
+
+@dataclass
+class Job:
+	id: str
+	kind: str
+	status: str = "queued"  # queued, running, done, failed, cancelled
+	submitted_at: float = field(default_factory=time.time)
+	finished_at: Optional[float] = None
+	result: Any = None
+	error: Any = None
+	future: Optional[Future] = None
+
+	@property
+	def finished(self) -> bool:
+		return self.status in ("done", "failed", "cancelled")
+
+	def to_dict(self) -> Dict[str, Any]:
+		return {
+			"id": self.id,
+			"kind": self.kind,
+			"status": self.status,
+			"submitted_at": self.submitted_at,
+			"finished_at": self.finished_at,
+			"result": self.result,
+			"error": self.error,
+		}
+
+
+class JobManager:
+	"""Bounded process pool plus a job table for long builds and simulations.
+
+	At most ``max_workers`` jobs run at once and at most ``max_queue`` more wait;
+	beyond that ``submit`` raises QueueFull so the server can answer 429 instead
+	of piling up work. Waiting jobs are held here and handed to the pool only
+	when a worker is free, so "running" means a worker has the job and queued
+	jobs can always be cancelled. Metrics a worker records come back with its
+	job and are merged into this process's registry (``ev_parlay_jobs_total``
+	counts the jobs themselves). Finished jobs are kept (newest
+	``keep_finished``) so clients can poll for results.
+	"""
+
+	def __init__(self, max_workers: int = 2, max_queue: int = 16, keep_finished: int = 256):
+		self.max_workers = max(1, max_workers)
+		self.max_queue = max(0, max_queue)
+		self.keep_finished = keep_finished
+		self._pool: Optional[ProcessPoolExecutor] = None
+		self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+		self._pending: Deque[Tuple[Job, Callable[..., Any], tuple]] = deque()
+		self._active: Dict[str, Job] = {}  # handed to the pool, future not done yet
+		self._lock = threading.Lock()
+
+	@classmethod
+	def from_env(cls) -> "JobManager":
+		return cls(
+			max_workers=int(os.getenv("JOBS_MAX_WORKERS", "2")),
+			max_queue=int(os.getenv("JOBS_MAX_QUEUE", "16")),
+			keep_finished=int(os.getenv("JOBS_KEEP_FINISHED", "256")),
+		)
+
+	def _executor(self) -> ProcessPoolExecutor:
+		# Started on first use so importing the API (or a worker) never spawns processes.
+		# forkserver (spawn where unavailable), not fork: the server has threads (uvicorn,
+		# poller, live-tracker locks) whose held locks a forked child would inherit.
+		if self._pool is None:
+			method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+			self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context(method))
+		return self._pool
+
+	def unfinished(self) -> int:
+		"""Jobs waiting plus jobs occupying a worker (including cancelled ones still running)."""
+		return len(self._pending) + len(self._active)
+
+	def submit(self, kind: str, fn: Callable[..., Any], *args: Any) -> Job:
+		with self._lock:
+			if self.unfinished() >= self.max_workers + self.max_queue:
+				raise QueueFull(f"{self.unfinished()} jobs pending; try again later")
+			job = Job(id=uuid.uuid4().hex, kind=kind)
+			self._jobs[job.id] = job
+			self._prune()
+			self._pending.append((job, fn, args))
+			started = self._dispatch()
+		self._watch(started)
+		return job
+
+	def _dispatch(self) -> List[Job]:
+		# Caller holds the lock; done callbacks are attached by _watch once it is released
+		started = []
+		while self._pending and len(self._active) < self.max_workers:
+			job, fn, args = self._pending.popleft()
+			job.future = self._executor().submit(_run, fn, *args)
+			job.status = "running"
+			self._active[job.id] = job
+			started.append(job)
+		return started
+
+	def _watch(self, started: List[Job]) -> None:
+		for job in started:
+			job.future.add_done_callback(lambda f, job=job: self._finish(job, f))
+
+	def _finish(self, job: Job, future: Future) -> None:
+		with self._lock:
+			self._active.pop(job.id, None)
+			started = self._dispatch() if self._pool is not None else []
+			if job.status != "cancelled":  # result of a job cancelled while running is discarded
+				self._settle(job, future)
+				metrics.JOBS.inc(1, job.kind, job.status)
+		self._watch(started)
+
+	def _settle(self, job: Job, future: Future) -> None:
+		job.finished_at = time.time()
+		if future.cancelled():
+			job.status = "cancelled"
+		elif future.exception() is not None:
+			exc = future.exception()
+			job.status = "failed"
+			job.error = exc.detail if isinstance(exc, JobFailed) else str(exc)
+			if isinstance(exc, JobFailed) and exc.metrics:
+				metrics.REGISTRY.merge(exc.metrics)
+		else:
+			job.result, recorded = future.result()
+			metrics.REGISTRY.merge(recorded)
+			job.status = "done"
+
+	def _prune(self) -> None:
+		finished = [jid for jid, j in self._jobs.items() if j.finished]
+		for jid in finished[: max(0, len(finished) - self.keep_finished)]:
+			del self._jobs[jid]
+
+	def get(self, job_id: str) -> Optional[Job]:
+		with self._lock:
+			return self._jobs.get(job_id)
+
+	def cancel(self, job_id: str) -> Optional[Job]:
+		"""Cancel a job. Queued jobs never start; a running job finishes in its
+		worker and its result is dropped, but it keeps its slot until then."""
+		with self._lock:
+			job = self._jobs.get(job_id)
+			if job is None or job.finished:
+				return job
+			if job.status == "queued":
+				self._pending = deque(p for p in self._pending if p[0] is not job)
+			job.status = "cancelled"
+			job.finished_at = time.time()
+			metrics.JOBS.inc(1, job.kind, "cancelled")
+		return job
+
+	def shutdown(self) -> None:
+		with self._lock:
+			pending = [j for j in self._jobs.values() if not j.finished]
+			pool, self._pool = self._pool, None
+		for job in pending:
+			self.cancel(job.id)
+		if pool is not None:
+			pool.shutdown(wait=False, cancel_futures=True)
@@ -1,24 +1,67 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import RedirectResponse
+from fastapi.responses import PlainTextResponse, RedirectResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 from pathlib import Path
+import hashlib
 import json
+import os
+import threading
 
+from ev_parlay import metrics
 from ev_parlay.config import AppConfig
-from ev_parlay.parser import parse_model_file, parse_model_text
-from ev_parlay.odds_api import fetch_odds, get_best_moneyline, build_game_index
-from ev_parlay.ev_math import attach_single_metrics
-from ev_parlay.builder import greedy_beam_build, ilp_select_with_derivation
-from ev_parlay.models import ParlayTicket
+from ev_parlay.logging_utils import get_logger
+from ev_parlay.parser import parse_model_file, parse_model_text, team_abbrs
+from ev_parlay.live import LiveSlate
+from ev_parlay.model_batch import blend, load_models
+from ev_parlay.odds_api import fetch_odds, OddsIndex
+from ev_parlay.odds_stream import load_odds_file
+from ev_parlay.ev_math import parlay_decimal, parlay_probability
+from ev_parlay.models import ParlayTicket, TeamSelection
 from ev_parlay.simulate import simulate_slate, simulate_slate_samples, save_histogram
-from ev_parlay.team_mapping import normalize_team, abbr
+from ev_parlay.builder import SELECTORS
+from ev_parlay.pipeline import SlateError, SlatePipeline
+from ev_parlay.sensitivity import METHODS as SENSITIVITY_METHODS, sensitivity
+from ev_parlay.ticket_archive import TicketArchive, archive_for, load_archive
+from ev_parlay.poller import OddsPoller, start_background_poller
 
-app = FastAPI(title="EV Parlay API")
+from .jobs import JobFailed, JobManager, QueueFull
+from .sessions import BEAM_FIELDS, SELECT_FIELDS, SlateCache, SlateSession, file_key, payload_key, slate_key, stage_key
+
+logger = get_logger("ev_parlay.api")
+# Metrics are on for the server unless EV_PARLAY_METRICS=0; scrape them at /metrics
+if os.getenv("EV_PARLAY_METRICS", "1") != "0":
+	metrics.enable()
+
+# Optional background odds poller (ODDS_POLLER=1) so builds read a warm cache
+_poller: Optional[OddsPoller] = None
+# Process pool for /api/jobs/* (JOBS_MAX_WORKERS, JOBS_MAX_QUEUE, JOBS_KEEP_FINISHED)
+jobs = JobManager.from_env()
+# Prepared slates keyed by model + odds snapshot (SLATE_CACHE_SIZE, SLATE_CACHE_TTL)
+slates = SlateCache.from_env()
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+	global _poller
+	if os.getenv("ODDS_POLLER") == "1":
+		config = AppConfig()
+		config.region = os.getenv("ODDS_POLLER_REGION", config.region)
+		_poller = start_background_poller(config, cache_file=os.getenv("ODDS_POLLER_CACHE", ".odds_cache_poller.json"))
+	yield
+	jobs.shutdown()
+	if _poller is not None:
+		_poller.stop_event.set()
+		_poller = None
+
+
+app = FastAPI(title="EV Parlay API", lifespan=lifespan)
 app.add_middleware(
 	CORSMiddleware,
 	allow_origins=["*"],
@@ -54,9 +97,16 @@ def api_example_model():
 	return {"text": text}
 
 
+# Upper bound on BuildRequest.sensitivity_draws (SENSITIVITY_MAX_DRAWS); each draw is a legs x tickets pass
+SENSITIVITY_MAX_DRAWS = int(os.getenv("SENSITIVITY_MAX_DRAWS", "20000"))
+
+
 class BuildRequest(BaseModel):
 	model_path: Optional[str] = None
 	model_text: Optional[str] = None
+	# Several model files/exports blended per team (weights keyed by model id)
+	model_paths: Optional[List[str]] = None
+	model_weights: Optional[Dict[str, float]] = None
 	region: str = "us"
 	sportsbooks: List[str] = ["draftkings", "fanduel"]
 	odds_file: Optional[str] = None
@@ -67,6 +117,8 @@ class BuildRequest(BaseModel):
 	team_exposure_cap: float = 0.4
 	beam_width: int = 200
 	candidate_pool_size: int = 200
+	large_slate: bool = False
+	selector: str = "ilp"
 	min_edge: float = 0.0
 	min_parlay_ev: float = 0.0
 	desired_num_tickets: int = 8
@@ -75,15 +127,37 @@ class BuildRequest(BaseModel):
 	max_stake_pct: float = 0.4
 	min_stake: float = 0.0
 	correlation_rho: float = 0.0
+	# Leg-probability sensitivity of the chosen tickets: "normal", "beta" or "bootstrap" (needs model_paths)
+	sensitivity: Optional[str] = None
+	sensitivity_sd: float = 0.03
+	sensitivity_draws: int = 2000
 
 
 class BuildResponse(BaseModel):
 	parlays: List[dict]
 	singles: List[dict]
+	# Key of the cached slate session that served this build
+	session: Optional[str] = None
+	# Per pipeline stage: wall time (ms), output items, whether the session cache served it
+	timings: Optional[List[dict]] = None
+	# Per ticket: EV distribution and P(EV < 0) under leg-probability error, when requested
+	sensitivity: Optional[List[dict]] = None
 
 
-@app.post("/api/build", response_model=BuildResponse)
-def api_build(req: BuildRequest):
+def _check_selector(selector: Optional[str]) -> None:
+	if selector is not None and selector not in SELECTORS:
+		raise HTTPException(status_code=400, detail={"error": f"Unknown selector {selector!r}; expected one of {', '.join(SELECTORS)}"})
+
+
+def _config_for(req: BuildRequest) -> AppConfig:
+	# Sensitivity runs after the build, so bad settings are rejected before any work starts
+	if req.sensitivity and req.sensitivity not in SENSITIVITY_METHODS:
+		raise HTTPException(status_code=400, detail={"error": f"Unknown sensitivity {req.sensitivity!r}; expected one of {', '.join(SENSITIVITY_METHODS)}"})
+	if req.sensitivity and not req.sensitivity_sd > 0:
+		raise HTTPException(status_code=400, detail={"error": "sensitivity_sd must be positive"})
+	if not 1 <= req.sensitivity_draws <= SENSITIVITY_MAX_DRAWS:
+		raise HTTPException(status_code=400, detail={"error": f"sensitivity_draws must be between 1 and {SENSITIVITY_MAX_DRAWS}"})
+	_check_selector(req.selector)
 	config = AppConfig()
 	config.region = req.region
 	config.sportsbooks = [s.lower() for s in req.sportsbooks]
@@ -91,6 +165,8 @@ def api_build(req: BuildRequest):
 	config.team_exposure_cap = req.team_exposure_cap
 	config.beam_width = req.beam_width
 	config.candidate_pool_size = req.candidate_pool_size
+	config.large_slate = req.large_slate
+	config.selector = req.selector
 	config.min_edge = req.min_edge
 	config.min_parlay_ev = req.min_parlay_ev
 	config.desired_num_tickets = req.desired_num_tickets
@@ -103,106 +179,272 @@ def api_build(req: BuildRequest):
 		config.commence_from_iso = req.from_iso
 	if req.to_iso:
 		config.commence_to_iso = req.to_iso
+	return config
+
+
+def _model_source(req: BuildRequest) -> Tuple[tuple, Callable[[], List[TeamSelection]]]:
+	"""Identity of the requested model input and a loader for it."""
+	try:
+		# Parse from text if provided, else from file(s)
+		if req.model_text and req.model_text.strip():
+			return ("text", req.model_text), lambda: parse_model_text(req.model_text)
+		if req.model_paths:
+			key = ("paths", [file_key(p) for p in req.model_paths], req.model_weights, req.week)
+
+			def load() -> List[TeamSelection]:
+				try:
+					return blend(load_models(req.model_paths, week=req.week), req.model_weights, week=req.week)
+				except (OSError, ValueError) as e:
+					raise HTTPException(status_code=400, detail={"error": str(e)})
+
+			return key, load
+		if req.model_path:
+			return ("path", file_key(req.model_path)), lambda: parse_model_file(req.model_path)
+	except OSError as e:
+		raise HTTPException(status_code=400, detail={"error": str(e)})
+	raise HTTPException(status_code=400, detail={"error": "Provide model_text, model_path or model_paths"})
+
+
+def _odds_source(req: BuildRequest, config: AppConfig) -> Tuple[tuple, Callable[[], OddsIndex]]:
+	"""Identity of the odds snapshot a build would use and a loader for its index."""
 	# If week provided, prefer week-specific cache filename and ignore incoming odds_file
 	cache_file = None
 	if req.week:
 		cache_file = Path(f".odds_cache_week{req.week}_all.json")
-
-	# Parse from text if provided, else from file
-	if req.model_text and req.model_text.strip():
-		selections = parse_model_text(req.model_text)
-	elif req.model_path:
-		selections = parse_model_file(req.model_path)
-	else:
-		raise HTTPException(status_code=400, detail={"error": "Provide model_text or model_path"})
 	# Load odds from week cache if exists; else fetch and write cache
-	odds_payload = None
 	if cache_file and cache_file.exists():
-		odds_payload = json.loads(cache_file.read_text(encoding="utf-8"))
-	else:
-		try:
-			odds_payload = fetch_odds(config)
-			if cache_file:
-				cache_file.write_text(json.dumps(odds_payload), encoding="utf-8")
-		except Exception as e:
-			raise HTTPException(status_code=400, detail={
-				"code": "no_odds_for_week",
-				"message": "No cached odds for this week and live fetch failed (missing ODDS_API_KEY?).",
-				"week": req.week,
-				"cache_file": str(cache_file) if cache_file else None,
-				"error": str(e),
-			})
-
-	game_index = build_game_index(odds_payload)
-	validated = []
-	seen_games = set()
-	seen_teams = set()
-	missing = []
-	for s in selections:
-		norm = normalize_team(s.team_name) or s.team_name
-		team_ab = abbr(norm) or s.team_abbr
-		if team_ab not in game_index:
-			missing.append({"team": s.team_name, "abbr": team_ab, "reason": "not in current slate"})
-			continue
-		gid, opp_ab = game_index[team_ab]
-		if gid in seen_games:
-			for i, prev in enumerate(validated):
-				if prev.game_id == gid:
-					# Keep the higher-probability side
-					chosen = s if s.model_win_prob > prev.model_win_prob else prev
-					chosen.game_id = gid
-					chosen.opponent_abbr = opp_ab
-					validated[i] = chosen
-					break
-			continue
-		s.game_id = gid
-		s.opponent_abbr = opp_ab
-		validated.append(s)
-		seen_games.add(gid)
-	if missing:
+		return ("file", file_key(cache_file)), lambda: load_odds_file(cache_file, config)[1]
+	if not req.week and _poller is not None and _poller.payload:
+		payload = _poller.payload
+		return ("poller", payload_key(payload)), lambda: OddsIndex.from_payload(payload, config)
+	index = OddsIndex(config)
+	try:
+		odds_payload = fetch_odds(config, index=index)
+		if cache_file:
+			cache_file.write_text(json.dumps(odds_payload), encoding="utf-8")
+	except Exception as e:
+		raise HTTPException(status_code=400, detail={
+			"code": "no_odds_for_week",
+			"message": "No cached odds for this week and live fetch failed (missing ODDS_API_KEY?).",
+			"week": req.week,
+			"cache_file": str(cache_file) if cache_file else None,
+			"error": str(e),
+		})
+	return ("live", payload_key(odds_payload)), lambda: index
+
+
+def _session(req: BuildRequest, pipeline: SlatePipeline) -> SlateSession:
+	"""Prepared slate for this model + odds snapshot, reused across requests."""
+	config = pipeline.config
+	model_key, load_model = _model_source(req)
+	odds_key, load_index = _odds_source(req, config)
+	key = slate_key(model_key, odds_key, config.market, sorted(config.sportsbooks), config.min_edge)
+	try:
+		return slates.get_or_prepare(key, pipeline, load_model, load_index)
+	except SlateError as e:
+		missing = [{"team": team, "abbr": team_ab, "reason": "not in current slate"} for team, team_ab in e.missing]
 		raise HTTPException(status_code=400, detail={"missing": missing, "hint": "Update model text to only include teams playing this week; one pick per game."})
 
-	with_odds = []
-	for s in validated:
-		od = get_best_moneyline(s.team_name, config, odds_payload)
-		if not od:
-			continue
-		s.best_odds = od
-		s = attach_single_metrics(s)
-		if s.edge is not None and s.edge < config.min_edge:
-			continue
-		with_odds.append(s)
-
-	by_size = greedy_beam_build(with_odds, config)
-	tickets = ilp_select_with_derivation(by_size, config)
-
-	# Allocate budget
-	if config.run_budget is not None and tickets:
-		budget = config.run_budget
-		n = config.desired_num_tickets or len(tickets)
-		selected = tickets[:n]
-		weights = [max(0.0, t.kelly_stake) for t in selected] or [1.0] * len(selected)
-		total = sum(weights)
-		ws = [w / total for w in weights]
-		for t, w in zip(selected, ws):
-			stake = round(budget * w, 2)
-			t.flat_stake = stake
-			t.kelly_stake = stake
-			tickets = selected
 
+def _singles(with_odds: List[TeamSelection]) -> List[dict]:
+	return [{
+		"team": s.team_abbr,
+		"model_p": s.model_win_prob,
+		"implied_p": s.implied_prob_market,
+		"edge": s.edge,
+		"dec": s.best_odds.decimal if s.best_odds else None,
+		"ev": s.expected_value,
+	} for s in with_odds]
+
+
+def _preview(combo: List[TeamSelection], rho: float) -> dict:
+	# Unstaked ticket in the same shape as a built parlay, for progressive rendering
+	P = parlay_probability([l.model_win_prob for l in combo], rho)
+	D = parlay_decimal([l.best_odds.decimal for l in combo if l.best_odds])
+	return {
+		"size": len(combo),
+		"legs": [l.model_dump() for l in combo],
+		"combined_decimal": D,
+		"combined_probability": P,
+		"expected_value": P * (D - 1.0) - (1.0 - P),
+		"flat_stake": 0.0,
+	}
+
+
+def _build_events(req: BuildRequest, config: AppConfig, preview: int = 5) -> Iterator[Tuple[str, dict]]:
+	"""The build pipeline as (event, data) pairs, one per completed stage.
+
+	/api/build drains it and keeps the final ``tickets`` event; the streaming
+	endpoint forwards every event as it happens.
+	"""
+	pipeline = SlatePipeline(config)
+	session = _session(req, pipeline)
+	yield "slate", {"session": session.key, "legs": len(session.legs), "games": len({l.game_id for l in session.legs})}
+	yield "singles", {"singles": _singles(session.legs)}
+	for size in config.parlay_sizes:
+		finalists = session.finalists(size, pipeline)
+		top = [_preview(c, config.correlation_rho) for c in finalists[:preview]]
+		yield "finalists", {"size": size, "count": len(finalists), "top": top}
+	tickets = pipeline.stake(session.select(pipeline))
+	yield "tickets", {"parlays": [t.model_dump() for t in tickets], "timings": pipeline.timings()}
+	if req.sensitivity:
+		yield "sensitivity", {"sensitivity": _sensitivity(req, config, tickets)}
+
+
+def _sensitivity(req: BuildRequest, config: AppConfig, tickets: List[ParlayTicket]) -> List[dict]:
+	table = None
+	if req.sensitivity == "bootstrap" and req.model_paths:
+		try:
+			table = load_models(req.model_paths, week=req.week)
+		except (OSError, ValueError) as e:
+			raise HTTPException(status_code=400, detail={"error": str(e)})
+		if req.week is not None:
+			table = table.select(week=req.week)
+	try:
+		return sensitivity(
+			tickets, draws=req.sensitivity_draws, method=req.sensitivity, sd=req.sensitivity_sd,
+			rho=config.correlation_rho, bankroll=config.bankroll, kelly_fraction=config.kelly_fraction,
+			table=table, weights=req.model_weights,
+		)
+	except ValueError as e:
+		raise HTTPException(status_code=400, detail={"error": str(e)})
+
+
+@app.post("/api/build", response_model=BuildResponse)
+def api_build(req: BuildRequest):
+	config = _config_for(req)
+	data = {}
+	for event, payload in _build_events(req, config, preview=0):
+		data[event] = payload
 	return BuildResponse(
-		parlays=[t.model_dump() for t in tickets],
-		singles=[{
-			"team": s.team_abbr,
-			"model_p": s.model_win_prob,
-			"implied_p": s.implied_prob_market,
-			"edge": s.edge,
-			"dec": s.best_odds.decimal if s.best_odds else None,
-			"ev": s.expected_value,
-		} for s in with_odds],
+		parlays=data["tickets"]["parlays"],
+		singles=data["singles"]["singles"],
+		session=data["slate"]["session"],
+		timings=data["tickets"]["timings"],
+		sensitivity=data.get("sensitivity", {}).get("sensitivity"),
 	)
 
 
+def _sse(event: str, data: dict) -> str:
+	return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.post("/api/build/stream")
+def api_build_stream(req: BuildRequest):
+	"""Same pipeline as /api/build, streamed as Server-Sent Events.
+
+	Events: ``slate``, ``singles``, ``finalists`` (one per parlay size, with
+	the top few unstaked combos), ``tickets``, ``sensitivity`` when requested
+	and finally ``done``; a failure after the slate is prepared is reported as
+	an ``error`` event.
+	"""
+	config = _config_for(req)
+	events = _build_events(req, config)
+	# Prepare the slate before the response starts so bad input is still a plain 400
+	first = next(events)
+
+	def stream() -> Iterator[str]:
+		yield _sse(*first)
+		try:
+			for event, data in events:
+				yield _sse(event, data)
+		except HTTPException as e:
+			yield _sse("error", {"status_code": e.status_code, "detail": e.detail})
+			return
+		except Exception as e:
+			yield _sse("error", {"status_code": 500, "detail": str(e)})
+			return
+		yield _sse("done", {})
+
+	return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+class BuildVariant(BaseModel):
+	"""Overrides applied to the batch's base request; unset fields inherit it."""
+
+	label: Optional[str] = None
+	parlay_sizes: Optional[List[int]] = None
+	team_exposure_cap: Optional[float] = None
+	beam_width: Optional[int] = None
+	candidate_pool_size: Optional[int] = None
+	large_slate: Optional[bool] = None
+	selector: Optional[str] = None
+	min_parlay_ev: Optional[float] = None
+	desired_num_tickets: Optional[int] = None
+	budget: Optional[float] = None
+	stake_method: Optional[str] = None
+	max_stake_pct: Optional[float] = None
+	min_stake: Optional[float] = None
+	correlation_rho: Optional[float] = None
+
+
+# Server-side cap on /api/build_batch threads (BATCH_MAX_WORKERS, default CPU count)
+BATCH_MAX_WORKERS = int(os.getenv("BATCH_MAX_WORKERS", "0")) or (os.cpu_count() or 4)
+
+
+class BatchBuildRequest(BuildRequest):
+	variants: List[BuildVariant]
+	max_workers: int = 4
+
+
+class VariantResult(BaseModel):
+	label: str
+	parlays: List[dict]
+
+
+class BatchBuildResponse(BaseModel):
+	singles: List[dict]
+	results: List[VariantResult]
+
+
+def _batch_workers(requested: int) -> int:
+	"""Threads for a batch build: what the client asked for, capped by BATCH_MAX_WORKERS."""
+	return max(1, min(requested, BATCH_MAX_WORKERS))
+
+
+@app.post("/api/build_batch", response_model=BatchBuildResponse)
+def api_build_batch(req: BatchBuildRequest):
+	"""Evaluate many config variants against one prepared slate.
+
+	The model and odds are loaded and validated once. Beam finalists are shared
+	per (parlay size, beam settings) and ILP selections per selection settings,
+	so variants that only change the budget or staking re-run allocation alone.
+	"""
+	base = _config_for(req)
+	for v in req.variants:
+		_check_selector(v.selector)
+	session = _session(req, SlatePipeline(base))
+	pipelines: List[SlatePipeline] = []
+	for v in req.variants:
+		update = v.model_dump(exclude_none=True, exclude={"label"})
+		if "budget" in update:
+			update["run_budget"] = update.pop("budget")
+		pipelines.append(SlatePipeline(base.model_copy(update=update)))
+
+	# Distinct beam jobs first, then distinct ILP jobs, so no two threads build the same stage
+	# (CBC runs as a subprocess, so threads overlap solves)
+	beam_jobs: Dict[tuple, Tuple[int, SlatePipeline]] = {}
+	for p in pipelines:
+		for size in p.config.parlay_sizes:
+			beam_jobs.setdefault((size,) + stage_key(p.config, BEAM_FIELDS), (size, p))
+	select_jobs = {stage_key(p.config, SELECT_FIELDS): p for p in pipelines}
+	with ThreadPoolExecutor(max_workers=_batch_workers(req.max_workers)) as pool:
+		list(pool.map(lambda job: session.finalists(*job), beam_jobs.values()))
+		list(pool.map(session.select, select_jobs.values()))
+
+	results: List[VariantResult] = []
+	for i, (v, p) in enumerate(zip(req.variants, pipelines)):
+		tickets = p.stake(session.select(p))
+		results.append(VariantResult(label=v.label or f"variant_{i}", parlays=[t.model_dump() for t in tickets]))
+	return BatchBuildResponse(singles=_singles(session.legs), results=results)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def api_metrics():
+	"""Counters and histograms in Prometheus text exposition format."""
+	return PlainTextResponse(metrics.REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 class SimRequest(BaseModel):
 	parlays: List[ParlayTicket]
 	trials: int = 50000
@@ -211,19 +453,148 @@ class SimRequest(BaseModel):
 
 @app.post("/api/simulate")
 def api_simulate(req: SimRequest):
-	print(f"[DEBUG] Simulating {len(req.parlays)} parlays with {req.trials} trials")
+	logger.debug("Simulating %d parlays with %d trials", len(req.parlays), req.trials)
 	stats = simulate_slate(req.parlays, trials=req.trials)
 	image_url = None
 	if req.out_image:
-		print(f"[DEBUG] Generating plot: {req.out_image}")
 		profits = simulate_slate_samples(req.parlays, trials=req.trials)
 		p = Path(req.out_image)
 		# Save under static UI dir if not absolute
 		if not p.is_absolute():
 			p = static_dir / p.name
 		p.parent.mkdir(parents=True, exist_ok=True)
-		print(f"[DEBUG] Saving histogram to: {p}")
 		save_histogram(profits, str(p))
 		image_url = f"/ui/{p.name}"
-		print(f"[DEBUG] Image URL: {image_url}")
+		logger.debug("Saved histogram to %s (%s)", p, image_url)
 	return {"stats": stats, "image": image_url}
+
+
+class LiveRequest(BaseModel):
+	# The placed tickets: a tickets.npz (or the parlays.csv beside it) or the tickets themselves
+	tickets_path: Optional[str] = None
+	parlays: Optional[List[ParlayTicket]] = None
+	# Keyed by team name or abbr: settled results, in-game American odds, win probabilities
+	results: Dict[str, bool] = {}
+	odds: Dict[str, int] = {}
+	probs: Dict[str, float] = {}
+	trials: int = 20000
+	# Start over from the pre-game probabilities instead of the tracker's current state
+	reset: bool = False
+
+
+class LiveResponse(BaseModel):
+	tickets: List[dict]
+	profit: Dict[str, float]
+	hedges: List[dict]
+	settled: Dict[str, bool]
+	# Tickets recomputed by this update and since the tracker was created
+	touched: int
+	recomputed: int
+
+
+# Live trackers per placed slate, so each update only recomputes the tickets it touches.
+# _live_lock guards the table; each tracker has its own lock for update + report.
+_live: Dict[tuple, Tuple[LiveSlate, threading.Lock]] = {}
+_live_lock = threading.Lock()
+LIVE_MAX_SLATES = 16
+# Upper bound on LiveRequest.trials (LIVE_MAX_TRIALS)
+LIVE_MAX_TRIALS = int(os.getenv("LIVE_MAX_TRIALS", "200000"))
+
+
+def _live_slate(req: LiveRequest) -> Tuple[tuple, Callable[[], TicketArchive]]:
+	if req.parlays:
+		digest = hashlib.sha256(json.dumps([t.model_dump() for t in req.parlays], sort_keys=True).encode("utf-8")).hexdigest()
+		return ("parlays", digest), lambda: TicketArchive.from_tickets(req.parlays)
+	path = archive_for(req.tickets_path) if req.tickets_path else None
+	if path is None:
+		raise HTTPException(status_code=400, detail={"error": "Provide parlays or a tickets_path with a tickets.npz"})
+	try:
+		return ("path", file_key(path)), lambda: load_archive(path, mmap=False)
+	except OSError as e:
+		raise HTTPException(status_code=400, detail={"error": str(e)})
+
+
+@app.post("/api/live", response_model=LiveResponse)
+def api_live(req: LiveRequest):
+	"""Update a placed slate with settled legs and in-game odds.
+
+	Trackers are kept per slate, so repeated calls apply results incrementally:
+	only tickets holding a changed leg are recomputed. Returns each ticket's
+	conditional win probability and fair value, the portfolio profit
+	distribution and full-hedge suggestions.
+	"""
+	if not 1 <= req.trials <= LIVE_MAX_TRIALS:
+		raise HTTPException(status_code=400, detail={"error": f"trials must be between 1 and {LIVE_MAX_TRIALS}"})
+	key, load = _live_slate(req)
+
+	with _live_lock:
+		entry = None if req.reset else _live.get(key)
+		if entry is None:
+			try:
+				entry = (LiveSlate(load()), threading.Lock())
+			except ValueError as e:
+				raise HTTPException(status_code=400, detail={"error": str(e)})
+			_live.pop(key, None)
+			if len(_live) >= LIVE_MAX_SLATES:
+				_live.pop(next(iter(_live)))
+			_live[key] = entry
+	live, lock = entry
+	try:
+		abbrs = team_abbrs([*req.results, *req.odds, *req.probs], known=live.legs_of)
+	except ValueError as e:
+		raise HTTPException(status_code=400, detail={"error": str(e)})
+
+	def abbr(mapping: Dict) -> Dict:
+		return {abbrs[team]: v for team, v in mapping.items()}
+
+	with lock:
+		touched = live.update(abbr(req.results), abbr(req.odds), abbr(req.probs))
+		report = live.report(trials=req.trials)
+	return LiveResponse(touched=touched, **report)
+
+
+def _build_job(payload: dict) -> dict:
+	try:
+		return api_build(BuildRequest(**payload)).model_dump()
+	except HTTPException as e:
+		raise JobFailed({"status_code": e.status_code, "detail": e.detail})
+
+
+def _simulate_job(payload: dict) -> dict:
+	return api_simulate(SimRequest(**payload))
+
+
+def _submit(kind: str, fn, payload: dict) -> dict:
+	try:
+		job = jobs.submit(kind, fn, payload)
+	except QueueFull as e:
+		raise HTTPException(status_code=429, detail={"error": str(e)}, headers={"Retry-After": "5"})
+	return {"id": job.id, "status": job.status}
+
+
+@app.post("/api/jobs/build", status_code=202)
+def api_submit_build(req: BuildRequest):
+	"""Queue a build in the worker pool; poll ``GET /api/jobs/{id}`` for the result."""
+	_config_for(req)  # bad options are a 400 now, not a failed job later
+	return _submit("build", _build_job, req.model_dump())
+
+
+@app.post("/api/jobs/simulate", status_code=202)
+def api_submit_simulate(req: SimRequest):
+	return _submit("simulate", _simulate_job, req.model_dump())
+
+
+@app.get("/api/jobs/{job_id}")
+def api_job_status(job_id: str):
+	job = jobs.get(job_id)
+	if job is None:
+		raise HTTPException(status_code=404, detail={"error": f"Unknown job {job_id}"})
+	return job.to_dict()
+
+
+@app.delete("/api/jobs/{job_id}")
+def api_cancel_job(job_id: str):
+	job = jobs.cancel(job_id)
+	if job is None:
+		raise HTTPException(status_code=404, detail={"error": f"Unknown job {job_id}"})
+	return job.to_dict()
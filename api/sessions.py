@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ev_parlay import metrics
+from ev_parlay.config import AppConfig
+from ev_parlay.models import ParlayTicket, TeamSelection
+from ev_parlay.odds_api import OddsIndex
+from ev_parlay.pipeline import BEAM_FIELDS, SlatePipeline
+
+# Config fields each stage depends on; builds agreeing on them share that stage's work
+SELECT_FIELDS = BEAM_FIELDS + ("parlay_sizes", "desired_num_tickets", "max_tickets", "team_exposure_cap", "bankroll", "kelly_fraction", "flat_stake", "selector", "colgen_rounds", "colgen_columns")
+
+
+def stage_key(config: AppConfig, fields) -> tuple:
+	return tuple(tuple(v) if isinstance(v, list) else v for v in (getattr(config, f) for f in fields))
+
+
+def slate_key(*parts: Any) -> str:
+	"""Stable hash of the inputs that determine a prepared slate."""
+	return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+
+def file_key(path: str | os.PathLike) -> Tuple[str, int, int]:
+	st = os.stat(path)
+	return (str(path), st.st_mtime_ns, st.st_size)
+
+
+def payload_key(payload: List[Dict]) -> str:
+	return hashlib.sha256(json.dumps(payload).encode("utf-8")).hexdigest()[:16]
+
+
+class SlateSession:
+	"""A prepared slate plus the beam/ILP results computed on it so far.
+
+	Legs and finalists are shared between requests and must not be mutated;
+	selected tickets are returned as copies so callers can set stakes.
+	"""
+
+	def __init__(self, key: str, legs: List[TeamSelection], odds_index: OddsIndex):
+		self.key = key
+		self.legs = legs
+		self.odds_index = odds_index
+		self.beams: Dict[tuple, List[List[TeamSelection]]] = {}
+		self.selections: Dict[tuple, List[ParlayTicket]] = {}
+		self._lock = threading.Lock()
+
+	def _memo(self, table: Dict, key: tuple, compute: Callable[[], Any]) -> Tuple[Any, bool]:
+		with self._lock:
+			if key in table:
+				return table[key], True
+		value = compute()  # concurrent misses may compute twice; the results are identical
+		with self._lock:
+			return table.setdefault(key, value), False
+
+	def finalists(self, size: int, pipeline: SlatePipeline) -> List[List[TeamSelection]]:
+		"""Beam finalists of one parlay size (each size is built independently)."""
+		key = (size,) + stage_key(pipeline.config, BEAM_FIELDS)
+		combos, hit = self._memo(self.beams, key, lambda: pipeline.build(self.legs, sizes=[size])[size])
+		if hit:
+			pipeline.record("build", items=len(combos), cached=True)
+		return combos
+
+	def select(self, pipeline: SlatePipeline) -> List[ParlayTicket]:
+		"""Selected tickets for the pipeline's config, as copies safe to stake."""
+		config = pipeline.config
+
+		def compute() -> List[ParlayTicket]:
+			return pipeline.select({size: self.finalists(size, pipeline) for size in config.parlay_sizes}, self.legs)
+
+		tickets, hit = self._memo(self.selections, stage_key(config, SELECT_FIELDS), compute)
+		if hit:
+			pipeline.record("select", items=len(tickets), cached=True)
+		return [t.model_copy() for t in tickets]
+
+
+class SlateCache:
+	"""LRU of SlateSessions with a time-to-live since last use."""
+
+	def __init__(self, max_entries: int = 32, ttl_seconds: float = 900.0, clock: Callable[[], float] = time.monotonic):
+		self.max_entries = max_entries
+		self.ttl_seconds = ttl_seconds
+		self.clock = clock
+		self._entries: "OrderedDict[str, Tuple[float, SlateSession]]" = OrderedDict()
+		self._lock = threading.Lock()
+		self.hits = 0
+		self.misses = 0
+
+	@classmethod
+	def from_env(cls) -> "SlateCache":
+		return cls(
+			max_entries=int(os.getenv("SLATE_CACHE_SIZE", "32")),
+			ttl_seconds=float(os.getenv("SLATE_CACHE_TTL", "900")),
+		)
+
+	def __len__(self) -> int:
+		return len(self._entries)
+
+	def get(self, key: str) -> Optional[SlateSession]:
+		now = self.clock()
+		with self._lock:
+			entry = self._entries.get(key)
+			if entry is None or now - entry[0] > self.ttl_seconds:
+				self._entries.pop(key, None)
+				self.misses += 1
+				metrics.SLATE_CACHE.inc(1, "miss")
+				return None
+			self.hits += 1
+			metrics.SLATE_CACHE.inc(1, "hit")
+			self._entries[key] = (now, entry[1])
+			self._entries.move_to_end(key)
+			return entry[1]
+
+	def put(self, session: SlateSession) -> SlateSession:
+		now = self.clock()
+		with self._lock:
+			self._entries[session.key] = (now, session)
+			self._entries.move_to_end(session.key)
+			expired = [k for k, (t, _) in self._entries.items() if now - t > self.ttl_seconds]
+			for k in expired:
+				del self._entries[k]
+			while len(self._entries) > self.max_entries:
+				self._entries.popitem(last=False)
+		return session
+
+	def get_or_prepare(
+		self,
+		key: str,
+		pipeline: SlatePipeline,
+		load_model: Callable[[], List[TeamSelection]],
+		load_odds: Callable[[], OddsIndex],
+	) -> SlateSession:
+		"""Cached session for ``key``, else run the pipeline's preparation stages."""
+		session = self.get(key)
+		if session is None:
+			legs, odds_index = pipeline.prepare(load_model, load_odds)
+			return self.put(SlateSession(key, legs, odds_index))
+		for stage, items in (("parse", len(session.legs)), ("index", session.odds_index.num_events), ("validate", len(session.legs)), ("price", len(session.legs))):
+			pipeline.record(stage, items=items, cached=True)
+		return session
@@ -0,0 +1,46 @@
+"""Beam build time on synthetic slates of 16, 100 and 300 legs, default vs large-slate mode.
+
+Usage: python benchmarks/bench_large_slate.py [--sizes 16 100 300] [--legs-per-game 3]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from ev_parlay.builder import greedy_beam_build
+from ev_parlay.config import AppConfig
+from ev_parlay.synthetic import synthetic_legs
+
+
+def run(legs, config: AppConfig):
+	t0 = time.perf_counter()
+	by_size = greedy_beam_build(legs, config)
+	elapsed = time.perf_counter() - t0
+	return elapsed, sum(len(c) for c in by_size.values())
+
+
+def main():
+	ap = argparse.ArgumentParser()
+	ap.add_argument("--sizes", type=int, nargs="+", default=[16, 100, 300])
+	ap.add_argument("--legs-per-game", type=int, default=3)
+	ap.add_argument("--parlay-sizes", type=int, nargs="+", default=[3, 4, 5, 6])
+	ap.add_argument("--beam-width", type=int, default=50)
+	args = ap.parse_args()
+
+	for n in args.sizes:
+		legs = synthetic_legs(n, legs_per_game=args.legs_per_game)
+		for large in (False, True):
+			config = AppConfig(
+				parlay_sizes=args.parlay_sizes,
+				beam_width=args.beam_width,
+				candidate_pool_size=0,  # no edge truncation: score the whole universe
+				min_edge=-1.0,
+				large_slate=large,
+			)
+			elapsed, finalists = run(legs, config)
+			mode = "large-slate" if large else "default"
+			print(f"{n:4d} legs  {mode:12s} {elapsed * 1000:9.1f} ms  finalists={finalists}")
+
+
+if __name__ == "__main__":
+	main()
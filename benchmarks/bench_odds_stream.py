@@ -0,0 +1,64 @@
+"""Parse time and peak memory: whole-payload json.loads vs streaming, market-filtered parse.
+
+Usage: python benchmarks/bench_odds_stream.py [--events 2000] [--books 12]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from ev_parlay.config import AppConfig
+from ev_parlay.odds_api import build_game_index, get_best_moneyline
+from ev_parlay.odds_stream import load_odds_file
+from ev_parlay.synthetic import SYNTHETIC_BOOKS, synthetic_payload
+
+
+def current_path(path: Path, config: AppConfig, teams):
+	payload = json.loads(path.read_text(encoding="utf-8"))
+	build_game_index(payload)
+	return [get_best_moneyline(t, config, payload) for t in teams]
+
+
+def streaming_path(path: Path, config: AppConfig, teams):
+	_, index = load_odds_file(path, config)
+	return [index.best_moneyline(t) for t in teams]
+
+
+def measure(fn, *args):
+	t0 = time.perf_counter()
+	fn(*args)
+	elapsed = time.perf_counter() - t0
+	tracemalloc.start()
+	fn(*args)
+	_, peak = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	return elapsed, peak
+
+
+def main():
+	ap = argparse.ArgumentParser()
+	ap.add_argument("--events", type=int, default=2000)
+	ap.add_argument("--books", type=int, default=12)
+	ap.add_argument("--teams", type=int, default=16, help="Model teams looked up after parsing")
+	args = ap.parse_args()
+
+	payload = synthetic_payload(args.events, books=SYNTHETIC_BOOKS[: args.books], markets=("h2h", "spreads", "totals"))
+	config = AppConfig(sportsbooks=["draftkings", "fanduel", "betmgm"])
+	teams = [f"Team {i}" for i in range(args.teams)]
+	with tempfile.TemporaryDirectory() as d:
+		path = Path(d) / "odds.json"
+		path.write_text(json.dumps(payload), encoding="utf-8")
+		size_mb = path.stat().st_size / 1e6
+		assert current_path(path, config, teams) == streaming_path(path, config, teams)
+		print(f"payload: {args.events} events x {args.books} books x 3 markets, {size_mb:.1f} MB")
+		for name, fn in (("json.loads + scans", current_path), ("streaming + index", streaming_path)):
+			elapsed, peak = measure(fn, path, config, teams)
+			print(f"{name:20s} {elapsed * 1000:9.1f} ms   peak {peak / 1e6:8.1f} MB")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,94 @@
+"""Memory and scoring throughput of 10k candidate tickets: pydantic ParlayTickets vs SlateArrays records.
+
+Three representations of the same random candidate set (one leg per game):
+``pydantic`` scores each combo with builder._parlay_ev and builds a ParlayTicket
+(what ilp_select used to do for every candidate), ``records`` builds
+``__slots__`` TicketRecords from leg indices, and ``vectorized`` scores an
+index matrix per ticket size with SlateArrays.evaluate_many.
+
+Usage: python benchmarks/bench_slate_arrays.py [--tickets 10000] [--games 32] [--sizes 3 4 5] [--repeat 3]
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from ev_parlay.builder import _parlay_ev
+from ev_parlay.ev_math import kelly_fraction
+from ev_parlay.models import ParlayTicket
+from ev_parlay.slate_arrays import SlateArrays
+from ev_parlay.synthetic import synthetic_slate
+
+
+def candidates(arrays: SlateArrays, n: int, sizes: List[int], seed: int = 7) -> List[Tuple[int, ...]]:
+	rng = random.Random(seed)
+	by_game: Dict[int, List[int]] = {}
+	for i, g in enumerate(arrays.g):
+		by_game.setdefault(g, []).append(i)
+	games = list(by_game)
+	return [tuple(rng.choice(by_game[g]) for g in rng.sample(games, rng.choice(sizes))) for _ in range(n)]
+
+
+def measure(fn: Callable[[], object], repeat: int) -> Tuple[float, float]:
+	"""(best ms, retained MiB): wall time untraced, then memory still held by one result."""
+	times = []
+	for _ in range(repeat):
+		t0 = time.perf_counter()
+		fn()
+		times.append((time.perf_counter() - t0) * 1000.0)
+	gc.collect()
+	tracemalloc.start()
+	result = fn()
+	retained, _ = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	del result
+	return min(times), retained / 2**20
+
+
+def main():
+	ap = argparse.ArgumentParser()
+	ap.add_argument("--tickets", type=int, default=10000)
+	ap.add_argument("--games", type=int, default=32)
+	ap.add_argument("--sizes", type=int, nargs="+", default=[3, 4, 5])
+	ap.add_argument("--repeat", type=int, default=3)
+	args = ap.parse_args()
+
+	_, legs = synthetic_slate(args.games)
+	arrays = SlateArrays(legs)
+	combos = candidates(arrays, args.tickets, args.sizes)
+
+	def pydantic() -> List[ParlayTicket]:
+		out = []
+		for c in combos:
+			selected = [legs[i] for i in c]
+			P, D, EV = _parlay_ev(selected, 0.0)
+			out.append(ParlayTicket(
+				size=len(selected), legs=selected, combined_decimal=D, combined_probability=P, expected_value=EV,
+				flat_stake=10.0, kelly_stake=round(1000.0 * 0.5 * kelly_fraction(P, D), 2),
+				books={l.team_abbr: l.best_odds.book if l.best_odds else "" for l in selected},
+			))
+		return out
+
+	def records():
+		return [arrays.record(c) for c in combos]
+
+	def vectorized():
+		by_size: Dict[int, List[Tuple[int, ...]]] = {}
+		for c in combos:
+			by_size.setdefault(len(c), []).append(c)
+		return {k: arrays.evaluate_many(np.array(v, dtype=np.int32)) for k, v in by_size.items()}
+
+	print(f"{len(combos)} candidate tickets over {len(arrays)} legs (sizes {args.sizes})")
+	for name, fn in (("pydantic", pydantic), ("records", records), ("vectorized", vectorized)):
+		ms, mib = measure(fn, args.repeat)
+		print(f"{name:11s} {ms:9.1f} ms  {len(combos) / ms * 1000.0:12,.0f} tickets/s  {mib:7.2f} MiB retained")
+
+
+if __name__ == "__main__":
+	main()
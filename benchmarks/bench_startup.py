@@ -0,0 +1,78 @@
+"""CLI startup budget: import time (python -X importtime) for ``--help`` and a cached ``fetch-odds``.
+
+Fails (exit 1) when a scenario's import time exceeds its budget or a heavy
+dependency (numpy, pandas, pulp, requests) is imported.
+
+Interpreter startup (``site`` and whatever .pth files it runs) is not
+counted. Budgets leave roughly 2x headroom over a typical dev machine so
+slower CI runners do not flake.
+
+Usage: python benchmarks/bench_startup.py [--repeat 5] [--help-budget-ms 200] [--fetch-budget-ms 400]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+HEAVY = ("numpy", "pandas", "pulp", "requests")
+# Imported by the interpreter before ev_parlay.cli runs
+STARTUP = ("site", "runpy", "encodings")
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def import_profile(args: List[str], cwd: str) -> Tuple[float, List[str]]:
+	"""Total import time in ms (sum of top-level entries) and the heavy modules imported."""
+	env = dict(os.environ, PYTHONPATH=str(ROOT), NO_RICH="1")
+	proc = subprocess.run(
+		[sys.executable, "-X", "importtime", "-m", "ev_parlay.cli", *args],
+		cwd=cwd, env=env, capture_output=True, text=True,
+	)
+	if proc.returncode != 0:
+		raise RuntimeError(proc.stdout + proc.stderr)
+	total_us = 0
+	heavy = set()
+	for line in proc.stderr.splitlines():
+		if not line.startswith("import time:") or "cumulative" in line:
+			continue
+		_, cumulative, name = line[len("import time:"):].split("|")
+		if not name[1:].startswith(" ") and name.strip() not in STARTUP:  # top-level entry (no nesting indent)
+			total_us += int(cumulative)
+		mod = name.strip().split(".")[0]
+		if mod in HEAVY:
+			heavy.add(mod)
+	return total_us / 1000.0, sorted(heavy)
+
+
+def main():
+	ap = argparse.ArgumentParser()
+	ap.add_argument("--repeat", type=int, default=5)
+	ap.add_argument("--help-budget-ms", type=float, default=200.0)
+	ap.add_argument("--fetch-budget-ms", type=float, default=400.0)
+	args = ap.parse_args()
+
+	with tempfile.TemporaryDirectory() as d:
+		cache = Path(d) / "odds.json"
+		cache.write_text(json.dumps([]), encoding="utf-8")  # fresh cache: no network
+		scenarios: Dict[str, Tuple[List[str], float]] = {
+			"--help": (["--help"], args.help_budget_ms),
+			"fetch-odds (cached)": (["fetch-odds", "--cache", str(cache)], args.fetch_budget_ms),
+		}
+		failed = False
+		for name, (cli_args, budget) in scenarios.items():
+			runs = [import_profile(cli_args, d) for _ in range(args.repeat)]
+			best = min(ms for ms, _ in runs)
+			heavy = runs[0][1]
+			ok = best <= budget and not heavy
+			failed |= not ok
+			print(f"{name:22s} imports {best:7.1f} ms (budget {budget:.0f} ms)  heavy={heavy or '-'}  {'OK' if ok else 'FAIL'}")
+	sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,137 @@
+"""Timed hot-path scenarios on seeded synthetic slates, with baseline regression checks.
+
+Scenarios: ``beam`` (greedy_beam_build), ``ilp`` (ilp_select on the beam's
+finalists), ``moneyline`` (get_best_moneyline for every team) and ``simulate``
+(simulate_slate), each at several slate sizes. Results are JSON: per scenario
+the min/median wall time over ``--repeat`` runs plus its parameters.
+
+Usage:
+  python benchmarks/suite.py [--quick] [--only beam ilp] [--out results.json]
+  python benchmarks/suite.py --compare benchmarks/baseline.json [--threshold 0.3]
+
+``--compare`` exits 1 when a scenario's min time exceeds the baseline's by more
+than ``--threshold`` (fraction) and ``--min-delta-ms`` (absolute noise floor).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from ev_parlay.builder import greedy_beam_build, ilp_select
+from ev_parlay.config import AppConfig
+from ev_parlay.odds_api import get_best_moneyline
+from ev_parlay.simulate import simulate_slate
+from ev_parlay.synthetic import synthetic_books, synthetic_slate, synthetic_tickets
+
+# (games, books) per slate size; --quick keeps the first two
+BEAM_SLATES = [(8, 6), (16, 6), (32, 8)]
+MONEYLINE_SLATES = [(16, 6), (64, 12), (256, 12)]
+SIM_TICKETS = [8, 64, 256]
+SIM_TRIALS = 20000
+
+Scenario = Tuple[str, Dict, Callable[[], object]]
+
+
+def _beam_config(books: int) -> AppConfig:
+	return AppConfig(
+		sportsbooks=synthetic_books(books),
+		parlay_sizes=[2, 3, 4, 5],
+		beam_width=50,
+		candidate_pool_size=0,  # score the whole slate
+		min_edge=-1.0,
+		desired_num_tickets=8,
+	)
+
+
+def scenarios(quick: bool) -> List[Scenario]:
+	out: List[Scenario] = []
+	cut = 2 if quick else None
+	for games, books in BEAM_SLATES[:cut]:
+		_, legs = synthetic_slate(games, books)
+		config = _beam_config(books)
+		params = {"games": games, "books": books, "legs": len(legs), "beam_width": config.beam_width}
+		out.append((f"beam/{games}g", params, lambda legs=legs, config=config: greedy_beam_build(legs, config)))
+		by_size = greedy_beam_build(legs, config)
+		finalists = sum(len(v) for v in by_size.values())
+		out.append((f"ilp/{games}g", {**params, "finalists": finalists}, lambda b=by_size, config=config: ilp_select(b, config)))
+	for games, books in MONEYLINE_SLATES[:cut]:
+		payload, legs = synthetic_slate(games, books)
+		config = AppConfig(sportsbooks=synthetic_books(books))
+		teams = [l.team_name for l in legs]
+		out.append((
+			f"moneyline/{games}g{books}b",
+			{"games": games, "books": books, "lookups": len(teams)},
+			lambda p=payload, c=config, t=teams: [get_best_moneyline(x, c, p) for x in t],
+		))
+	_, legs = synthetic_slate(32, 6)
+	for n in SIM_TICKETS[:cut]:
+		tickets = synthetic_tickets(n, legs)
+		out.append((f"simulate/{n}t", {"tickets": n, "trials": SIM_TRIALS}, lambda t=tickets: simulate_slate(t, trials=SIM_TRIALS)))
+	return out
+
+
+def run(quick: bool = False, repeat: int = 5, only: List[str] | None = None) -> Dict:
+	results: Dict[str, Dict] = {}
+	for name, params, fn in scenarios(quick):
+		if only and name.split("/")[0] not in only:
+			continue
+		fn()  # warm-up (imports, CBC binary lookup, caches)
+		times = []
+		for _ in range(repeat):
+			t0 = time.perf_counter()
+			fn()
+			times.append((time.perf_counter() - t0) * 1000.0)
+		results[name] = {"min_ms": round(min(times), 3), "median_ms": round(statistics.median(times), 3), "repeat": repeat, "params": params}
+	return {
+		"meta": {"python": platform.python_version(), "platform": platform.platform(), "quick": quick},
+		"results": results,
+	}
+
+
+def compare(current: Dict, baseline: Dict, threshold: float, min_delta_ms: float = 0.5) -> List[Tuple[str, float, float, bool]]:
+	"""(scenario, baseline ms, current ms, regressed) for scenarios present in both runs."""
+	rows = []
+	for name, cur in current["results"].items():
+		base = baseline["results"].get(name)
+		if base is None:
+			continue
+		b, c = base["min_ms"], cur["min_ms"]
+		regressed = c > b * (1.0 + threshold) and c - b > min_delta_ms
+		rows.append((name, b, c, regressed))
+	return rows
+
+
+def main():
+	ap = argparse.ArgumentParser()
+	ap.add_argument("--quick", action="store_true", help="Only the two smallest sizes per scenario")
+	ap.add_argument("--repeat", type=int, default=5)
+	ap.add_argument("--only", nargs="+", choices=["beam", "ilp", "moneyline", "simulate"])
+	ap.add_argument("--out", help="Write results JSON here (default: stdout)")
+	ap.add_argument("--compare", help="Baseline results JSON to compare against")
+	ap.add_argument("--threshold", type=float, default=0.3, help="Allowed slowdown as a fraction of the baseline")
+	ap.add_argument("--min-delta-ms", type=float, default=0.5, help="Ignore slowdowns smaller than this")
+	args = ap.parse_args()
+
+	current = run(quick=args.quick, repeat=args.repeat, only=args.only)
+	text = json.dumps(current, indent=2)
+	if args.out:
+		Path(args.out).write_text(text + "\n", encoding="utf-8")
+	elif not args.compare:
+		print(text)
+	if not args.compare:
+		return
+	baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+	rows = compare(current, baseline, args.threshold, args.min_delta_ms)
+	for name, b, c, regressed in rows:
+		print(f"{name:24s} {b:10.2f} ms -> {c:10.2f} ms  {c / b if b else float('inf'):5.2f}x  {'REGRESSED' if regressed else 'ok'}")
+	sys.exit(1 if any(r[3] for r in rows) else 0)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import csv
+import hashlib
+import json
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .config import AppConfig
+from .model_batch import WEEK_RE, blend, load_models
+from .models import ParlayTicket, TeamSelection
+from .odds_stream import load_odds_file
+from .parser import parse_won, team_abbrs
+from .pipeline import SlateError, SlatePipeline
+from .ticket_archive import TicketArchive
+
+MODEL_SUFFIXES = (".txt", ".csv", ".json")
+RESULT_NAMES = ("results.csv", "results.json")
+CACHE_DIR = ".backtest_cache"
+# Config fields the parse/index/validate/price stages depend on
+PREP_FIELDS = ("sportsbooks", "market", "min_edge", "commence_from_iso", "commence_to_iso")
+CALIBRATION_BINS = (0.0, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0)
+
+
+@dataclass
+class WeekInputs:
+	week: int
+	models: List[Path] = field(default_factory=list)
+	odds: Optional[Path] = None
+
+
+def _is_odds(path: Path) -> bool:
+	return path.name.lstrip(".").lower().startswith(("odds", "odds_cache"))
+
+
+def discover_weeks(root: str | Path) -> Dict[int, WeekInputs]:
+	"""Per-week model and odds files under ``root`` (any depth), keyed by week.
+
+	Files named like ``odds_week5.json`` or ``.odds_cache_week5_all.json`` are
+	odds payloads, other ``*week5*`` .txt/.csv/.json files are models (several
+	per week are blended with equal weights). The results file and the prep
+	cache are skipped. Weeks without both a model and an odds file are dropped.
+	"""
+	weeks: Dict[int, WeekInputs] = {}
+	for path in sorted(Path(root).rglob("*")):
+		if not path.is_file() or CACHE_DIR in path.parts or path.name in RESULT_NAMES:
+			continue
+		m = WEEK_RE.search(path.name)
+		if not m or path.suffix.lower() not in MODEL_SUFFIXES:
+			continue
+		entry = weeks.setdefault(int(m.group(1)), WeekInputs(int(m.group(1))))
+		if _is_odds(path):
+			entry.odds = path
+		else:
+			entry.models.append(path)
+	return {wk: e for wk, e in sorted(weeks.items()) if e.models and e.odds is not None}
+
+
+def load_results(path: str | Path) -> Dict[int, Dict[str, bool]]:
+	"""``{week: {team abbr: won}}`` from a CSV or JSON list of ``week, team, won`` rows.
+
+	``won`` accepts 1/0, W/L, win/loss or true/false; anything else (ties,
+	postponed games) leaves the team ungraded so its tickets are void. A team
+	name that does not resolve raises ValueError rather than voiding tickets.
+	"""
+	path = Path(path)
+	if path.suffix.lower() == ".json":
+		rows = json.loads(path.read_text(encoding="utf-8"))
+	else:
+		with path.open(newline="", encoding="utf-8") as fh:
+			rows = list(csv.DictReader(fh))
+	try:
+		abbrs = team_abbrs(row["team"] for row in rows)
+	except ValueError as e:
+		raise ValueError(f"{path}: {e}") from None
+	out: Dict[int, Dict[str, bool]] = {}
+	for row in rows:
+		won = parse_won(row.get("won", row.get("result", "")))
+		if won is None:
+			continue
+		out.setdefault(int(row["week"]), {})[abbrs[row["team"]]] = won
+	return out
+
+
+def prep_key(inputs: WeekInputs, config: AppConfig) -> str:
+	files = [(str(p), os.stat(p).st_mtime_ns, os.stat(p).st_size) for p in [*inputs.models, inputs.odds]]
+	fields = {f: getattr(config, f) for f in PREP_FIELDS}
+	raw = json.dumps([inputs.week, files, fields], sort_keys=True, default=str)
+	return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def prepare_week(inputs: WeekInputs, config: AppConfig, cache_dir: Optional[Path] = None) -> Tuple[List[TeamSelection], SlatePipeline, bool]:
+	"""Priced legs for one week, from ``cache_dir`` when the inputs and prep fields match.
+
+	Returns (legs, pipeline, cached); raises SlateError like the CLI build.
+	"""
+	pipeline = SlatePipeline(config)
+	path = cache_dir / f"{prep_key(inputs, config)}.pkl" if cache_dir is not None else None
+	if path is not None and path.exists():
+		with path.open("rb") as fh:
+			legs = pickle.load(fh)
+		for stage in ("parse", "index", "validate", "price"):
+			pipeline.record(stage, items=len(legs), cached=True)
+		return legs, pipeline, True
+
+	def load_model() -> List[TeamSelection]:
+		return blend(load_models(inputs.models, week=inputs.week), week=inputs.week)
+
+	legs, _ = pipeline.prepare(load_model, lambda: load_odds_file(inputs.odds, config)[1])
+	if path is not None:
+		path.parent.mkdir(parents=True, exist_ok=True)
+		tmp = path.with_suffix(f".{os.getpid()}.tmp")
+		with tmp.open("wb") as fh:
+			pickle.dump(legs, fh, protocol=pickle.HIGHEST_PROTOCOL)
+		os.replace(tmp, path)  # atomic, so parallel weeks never read half a file
+	return legs, pipeline, False
+
+
+def grade(tickets: Sequence[ParlayTicket], results: Dict[str, bool]) -> Dict[str, np.ndarray]:
+	"""Vectorized grading: one leg-result lookup, then a tickets x legs product.
+
+	Returns per-ticket ``stake``, ``profit``, ``prob`` (predicted), ``won`` and
+	``void`` (a leg without a result; stake refunded, profit 0).
+	"""
+	archive = TicketArchive.from_tickets(list(tickets))
+	abbrs = archive.legs["team_abbr"]
+	leg_state = np.array([results.get(str(a)) for a in abbrs], dtype=object)
+	known = np.array([s is not None for s in leg_state], dtype=bool)
+	lost = np.array([s is False for s in leg_state], dtype=bool)
+	member = archive.membership.astype(np.int32)
+	void = (member @ ~known) > 0
+	won = ((member @ lost) == 0) & ~void
+	stakes = np.where(void, 0.0, archive.stakes)
+	profit = np.where(won, stakes * (archive.tickets["combined_decimal"] - 1.0), -stakes)
+	return {"stake": stakes, "profit": profit, "prob": archive.tickets["combined_probability"], "won": won, "void": void}
+
+
+def _run_week(inputs: WeekInputs, configs: Dict[str, AppConfig], results: Dict[str, bool], cache_dir: Optional[str]) -> List[Dict]:
+	"""Every config on one week; runs in a worker process."""
+	rows: List[Dict] = []
+	for name, config in configs.items():
+		start = time.perf_counter()
+		row: Dict = {"config": name, "week": inputs.week}
+		try:
+			legs, pipeline, cached = prepare_week(inputs, config, Path(cache_dir) if cache_dir else None)
+		except SlateError as e:
+			rows.append({**row, "error": str(e)})
+			continue
+		tickets = pipeline.stake(pipeline.select(pipeline.build(legs), legs))
+		graded = grade(tickets, results)
+		rows.append({
+			**row,
+			"prep_cached": cached,
+			"tickets": len(tickets),
+			"void": int(graded["void"].sum()),
+			"staked": float(graded["stake"].sum()),
+			"profit": float(graded["profit"].sum()),
+			"prob": graded["prob"][~graded["void"]].tolist(),
+			"won": graded["won"][~graded["void"]].tolist(),
+			"seconds": time.perf_counter() - start,
+		})
+	return rows
+
+
+def summarize(rows: List[Dict], bankroll: float) -> Dict:
+	"""ROI, drawdown and calibration for one config's week rows (ordered by week)."""
+	rows = sorted((r for r in rows if "error" not in r), key=lambda r: r["week"])
+	staked = sum(r["staked"] for r in rows)
+	profit = np.array([r["profit"] for r in rows], dtype=np.float64)
+	equity = bankroll + np.concatenate([[0.0], np.cumsum(profit)])
+	peaks = np.maximum.accumulate(equity)
+	drawdown = peaks - equity
+	prob = np.array([p for r in rows for p in r["prob"]], dtype=np.float64)
+	won = np.array([w for r in rows for w in r["won"]], dtype=bool)
+	bins = np.digitize(prob, CALIBRATION_BINS[1:-1])
+	calibration = []
+	for b in range(len(CALIBRATION_BINS) - 1):
+		mask = bins == b
+		if mask.any():
+			calibration.append({
+				"bin": f"{CALIBRATION_BINS[b]:.2f}-{CALIBRATION_BINS[b + 1]:.2f}",
+				"tickets": int(mask.sum()),
+				"predicted": float(prob[mask].mean()),
+				"actual": float(won[mask].mean()),
+			})
+	return {
+		"weeks": len(rows),
+		"tickets": int(prob.shape[0]),
+		"staked": round(staked, 2),
+		"profit": round(float(profit.sum()), 2),
+		"roi": float(profit.sum() / staked) if staked else 0.0,
+		"max_drawdown": round(float(drawdown.max()), 2),
+		"max_drawdown_pct": float((drawdown / peaks).max()),
+		"hit_rate": float(won.mean()) if won.size else 0.0,
+		"brier": float(np.mean((prob - won) ** 2)) if won.size else None,
+		"calibration": calibration,
+	}
+
+
+def run_backtest(
+	root: str | Path,
+	configs: Dict[str, AppConfig],
+	results_path: Optional[str | Path] = None,
+	weeks: Optional[Sequence[int]] = None,
+	workers: int = 0,
+	cache_dir: Optional[str | Path] = None,
+) -> Dict:
+	"""Build, stake and grade every week under ``root`` for each named config.
+
+	Weeks run in parallel processes (``workers`` 0 = one per CPU, 1 = inline).
+	Priced legs are pickled per (week inputs, PREP_FIELDS) under ``cache_dir``
+	(default ``root/.backtest_cache``), so a config that only changes beam,
+	selection or stake settings skips straight to the build stage.
+	"""
+	root = Path(root)
+	inputs = discover_weeks(root)
+	if weeks:
+		inputs = {wk: e for wk, e in inputs.items() if wk in set(weeks)}
+	if results_path is None:
+		results_path = next((root / n for n in RESULT_NAMES if (root / n).exists()), root / RESULT_NAMES[0])
+	results = load_results(results_path)
+	cache = str(cache_dir if cache_dir is not None else root / CACHE_DIR)
+
+	rows: List[Dict] = []
+	jobs = [(e, configs, results.get(wk, {}), cache) for wk, e in inputs.items()]
+	if workers == 1 or len(jobs) <= 1:
+		for job in jobs:
+			rows.extend(_run_week(*job))
+	else:
+		with ProcessPoolExecutor(max_workers=workers or None) as pool:
+			for week_rows in pool.map(_run_week, *zip(*jobs)):
+				rows.extend(week_rows)
+
+	report: Dict = {"weeks": sorted(inputs), "configs": {}}
+	for name, config in configs.items():
+		mine = [r for r in rows if r["config"] == name]
+		report["configs"][name] = {
+			**summarize(mine, config.bankroll),
+			"errors": {r["week"]: r["error"] for r in mine if "error" in r},
+			"by_week": [{k: v for k, v in r.items() if k not in ("prob", "won", "config")} for r in sorted(mine, key=lambda r: r["week"])],
+		}
+	return report
@@ -1,15 +1,20 @@
 from __future__ import annotations
 
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import math
+import time
 from collections import Counter
 
-import pulp  # type: ignore
-
+from . import metrics
+from .colgen import colgen_select
 from .config import AppConfig
 from .ev_math import parlay_probability, parlay_decimal, kelly_fraction
 from .models import ParlayTicket, TeamSelection
+from .slate_arrays import SlateArrays, TicketRecord
+
+# config.selector: ILP over beam finalists, or column generation over all candidate legs
+SELECTORS = ("ilp", "colgen")
 
 
 def _parlay_ev(legs: List[TeamSelection], rho: float) -> Tuple[float, float, float]:
@@ -23,75 +28,195 @@ def _parlay_ev(legs: List[TeamSelection], rho: float) -> Tuple[float, float, flo
 	return P, Dec, EV
 
 
-def greedy_beam_build(legs: List[TeamSelection], config: AppConfig) -> Dict[int, List[List[TeamSelection]]]:
-	# Start with candidates: +EV singles OR legs meeting min_edge threshold
+def prune_dominated(legs: List[TeamSelection]) -> List[TeamSelection]:
+	"""Drop legs beaten on both model probability and price by another leg of the same game.
+
+	Tickets hold at most one leg per game, so swapping a dominated leg for its
+	dominator never lowers a ticket's probability or payout.
+	"""
+	by_game: Dict[str, List[TeamSelection]] = {}
+	kept: List[TeamSelection] = []
+	for l in legs:
+		if l.game_id and l.best_odds:
+			by_game.setdefault(l.game_id, []).append(l)
+		else:
+			kept.append(l)
+	for group in by_game.values():
+		# Sort by probability desc, then price desc: a leg is dominated iff an earlier
+		# leg has a price at least as good (ties on both keep the first)
+		group.sort(key=lambda l: (l.model_win_prob, l.best_odds.decimal), reverse=True)
+		best_dec = -math.inf
+		for l in group:
+			if l.best_odds.decimal > best_dec:
+				kept.append(l)
+				best_dec = l.best_odds.decimal
+	return kept
+
+
+def _leg_factor(leg: TeamSelection) -> float:
+	# Multiplicative EV contribution: EV(combo + leg) + 1 = (P * p) * (D * d) when rho == 0
+	return leg.model_win_prob * (leg.best_odds.decimal if leg.best_odds else 0.0)
+
+
+def _large_slate_beam(candidates: List[TeamSelection], config: AppConfig) -> Dict[int, List[List[TeamSelection]]]:
+	# Keep the best few legs per game instead of a global top-N by edge
+	buckets: Dict[str, List[TeamSelection]] = {}
+	pool: List[TeamSelection] = []
+	for l in prune_dominated(candidates):
+		if not l.best_odds:
+			continue
+		if l.game_id:
+			buckets.setdefault(l.game_id, []).append(l)
+		else:
+			pool.append(l)
+	for group in buckets.values():
+		group.sort(key=_leg_factor, reverse=True)
+		pool.extend(group[: max(1, config.legs_per_game)])
+	# With legs ordered by factor, the best extensions of any combo are the first
+	# non-conflicting legs, so each combo scans O(k + used games) legs, not all n
+	pool.sort(key=_leg_factor, reverse=True)
+	arrays = SlateArrays(pool)
+	probs, decs, teams, games = arrays.p, arrays.d, arrays.t, arrays.g
+	rho = config.correlation_rho
+	monotone = rho == 0.0
+	k = max(1, config.expansion_per_combo)
+	width = config.beam_width
+
+	def score(p_ind: float, d: float, min_p: float) -> float:
+		P = p_ind if monotone else p_ind * (1.0 - rho) + rho * min_p
+		return P * (d - 1.0) - (1.0 - P)
+
+	by_size: Dict[int, List[List[TeamSelection]]] = {}
+	evaluated = pruned = 0
+	for size in config.parlay_sizes:
+		# State: (leg indices, independent prob, decimal, min prob); seeds are the best legs
+		beam: List[Tuple[Tuple[int, ...], float, float, float]] = [
+			((i,), probs[i], decs[i], probs[i]) for i in range(min(len(pool), max(width, k)))
+		]
+		for _ in range(1, size):
+			seen = set()
+			scored: List[Tuple[float, Tuple[Tuple[int, ...], float, float, float]]] = []
+			for combo, p_ind, d, min_p in beam:
+				used_teams = {teams[i] for i in combo}
+				used_games = {games[i] for i in combo}
+				taken = 0
+				for j in range(len(pool)):
+					if teams[j] in used_teams or games[j] in used_games:
+						continue
+					p2, d2, m2 = p_ind * probs[j], d * decs[j], min(min_p, probs[j])
+					ev = score(p2, d2, m2)
+					evaluated += 1
+					if ev <= config.min_parlay_ev:
+						pruned += 1
+						if monotone:
+							break  # every later leg has a smaller factor
+						continue
+					taken += 1
+					combo2 = combo + (j,)
+					sig = frozenset(combo2)
+					if sig not in seen:
+						seen.add(sig)
+						scored.append((ev, (combo2, p2, d2, m2)))
+					if taken >= k:
+						break
+			scored.sort(key=lambda x: x[0], reverse=True)
+			pruned += max(0, len(scored) - width)
+			beam = [state for _, state in scored[:width]]
+		by_size[size] = [[pool[i] for i in combo] for combo, *_ in beam]
+	metrics.BEAM_EVALUATED.inc(evaluated, "large_slate")
+	metrics.BEAM_PRUNED.inc(pruned, "large_slate")
+	return by_size
+
+
+def candidate_legs(legs: List[TeamSelection], config: AppConfig) -> List[TeamSelection]:
+	# +EV singles OR legs meeting min_edge threshold
 	candidates: List[TeamSelection] = []
 	for l in legs:
 		edge = l.edge or -1.0
 		if (l.expected_value or 0.0) > 0.0 or edge >= (config.min_edge or 0.0):
 			candidates.append(l)
+	return candidates
+
+
+def greedy_beam_build(legs: List[TeamSelection], config: AppConfig) -> Dict[int, List[List[TeamSelection]]]:
+	candidates = candidate_legs(legs, config)
+	if config.large_slate:
+		return _large_slate_beam(candidates, config)
 	# Rank by edge
 	candidates.sort(key=lambda x: (x.edge or -1.0), reverse=True)
 	if config.candidate_pool_size > 0:
 		candidates = candidates[: config.candidate_pool_size]
 
-	by_size: Dict[int, List[Tuple[List[TeamSelection], float]]] = {}
+	# Beam states are (leg indices, team bitmask, game bitmask) over the candidate arrays
+	arrays = SlateArrays(candidates)
+	team_bit = [1 << t for t in arrays.t]
+	game_bit = [1 << g for g in arrays.g]
+	rho = config.correlation_rho
+	by_size: Dict[int, List[List[TeamSelection]]] = {}
+	# Counted off the hot path: extensions scored = below threshold + survivors of each round
+	below = survivors = truncated = 0
 
 	for size in config.parlay_sizes:
-		beam: List[Tuple[List[TeamSelection], float]] = []
 		# initialize with single best legs
-		for leg in candidates:
-			seed = [leg]
-			beam.append((seed, leg.edge or 0.0))
+		beam: List[Tuple[Tuple[int, ...], int, int]] = [((i,), team_bit[i], game_bit[i]) for i in range(len(arrays))]
 		# grow
 		for _ in range(1, size):
-			new_beam: List[Tuple[List[TeamSelection], float]] = []
-			for combo, _score in beam:
-				used_teams = {l.team_abbr for l in combo}
-				used_games = {l.game_id for l in combo if l.game_id}
-				for leg in candidates:
-					if leg.team_abbr in used_teams:
-						continue
-					if leg.game_id and leg.game_id in used_games:
-						continue  # one pick per game
-					combo2 = combo + [leg]
-					P, D, EV = _parlay_ev(combo2, config.correlation_rho)
+			new_beam: List[Tuple[float, Tuple[Tuple[int, ...], int, int]]] = []
+			for combo, tmask, gmask in beam:
+				for j in range(len(arrays)):
+					if tmask & team_bit[j] or gmask & game_bit[j]:
+						continue  # one pick per team and per game
+					combo2 = combo + (j,)
+					EV = arrays.evaluate(combo2, rho)[2]
 					if EV <= config.min_parlay_ev:
+						below += 1
 						continue
-					new_beam.append((combo2, EV))
+					new_beam.append((EV, (combo2, tmask | team_bit[j], gmask | game_bit[j])))
 			# keep top beam_width
-			new_beam.sort(key=lambda x: x[1], reverse=True)
-			beam = new_beam[: config.beam_width]
+			new_beam.sort(key=lambda x: x[0], reverse=True)
+			survivors += len(new_beam)
+			truncated += max(0, len(new_beam) - config.beam_width)
+			beam = [state for _, state in new_beam[: config.beam_width]]
 		# store final combos with correct size
-		by_size[size] = [combo for combo, _ in beam]
+		by_size[size] = [[arrays.selections[i] for i in combo] for combo, _, _ in beam]
+	metrics.BEAM_EVALUATED.inc(below + survivors, "beam")
+	metrics.BEAM_PRUNED.inc(below + truncated, "beam")
 	return by_size
 
 
 def ilp_select(finalist_by_size: Dict[int, List[List[TeamSelection]]], config: AppConfig) -> List[ParlayTicket]:
-	# Flatten candidate tickets
-	candidates: List[Tuple[int, List[TeamSelection]]] = []
-	for size, combos in finalist_by_size.items():
+	import pulp  # type: ignore
+
+	# Finalists share leg objects; index them once and score tickets as records
+	legs_by_id: Dict[int, TeamSelection] = {}
+	for combos in finalist_by_size.values():
+		for c in combos:
+			for l in c:
+				legs_by_id.setdefault(id(l), l)
+	arrays = SlateArrays(list(legs_by_id.values()))
+	position = {key: i for i, key in enumerate(legs_by_id)}
+	cand: List[TicketRecord] = []
+	for combos in finalist_by_size.values():
 		for c in combos:
-			candidates.append((size, c))
-	# Compute EVs
-	cand_evs: List[Tuple[int, List[TeamSelection], float, float, float]] = []
-	for size, legs in candidates:
-		P, D, EV = _parlay_ev(legs, config.correlation_rho)
-		if math.isfinite(EV) and EV > 0:
-			cand_evs.append((size, legs, P, D, EV))
+			rec = arrays.record([position[id(l)] for l in c], config.correlation_rho)
+			if math.isfinite(rec.expected_value) and rec.expected_value > 0:
+				cand.append(rec)
 	# If too many, keep top pool
-	cand_evs.sort(key=lambda x: x[4], reverse=True)
-	cand_evs = cand_evs[: max(config.max_tickets * 5, 50)]
+	cand.sort(key=lambda r: r.expected_value, reverse=True)
+	cand = cand[: max(config.max_tickets * 5, 50)]
 
-	idx = list(range(len(cand_evs)))
-	ev = {i: cand_evs[i][4] for i in idx}
-	teams_of = {i: [l.team_abbr for l in cand_evs[i][1]] for i in idx}
+	idx = list(range(len(cand)))
+	# Team -> candidates holding it, in first-seen order per team
+	holders: Dict[str, List[int]] = {}
+	for i, rec in enumerate(cand):
+		for j in rec.legs:
+			holders.setdefault(arrays.teams[arrays.t[j]], []).append(i)
 
 	model = pulp.LpProblem("ParlaySelection", pulp.LpMaximize)
 	x = pulp.LpVariable.dicts("x", idx, lowBound=0, upBound=1, cat=pulp.LpBinary)
 
 	# Objective: maximize total EV
-	model += pulp.lpSum(x[i] * ev[i] for i in idx)
+	model += pulp.lpSum(x[i] * cand[i].expected_value for i in idx)
 
 	# Ticket count constraint
 	desired = config.desired_num_tickets
@@ -103,32 +228,17 @@ def ilp_select(finalist_by_size: Dict[int, List[List[TeamSelection]]], config: A
 	# Exposure caps
 	cap_count = math.floor(config.team_exposure_cap * (desired or config.max_tickets))
 	if cap_count >= 0:
-		all_teams = sorted({t for arr in teams_of.values() for t in arr})
-		for t in all_teams:
-			model += pulp.lpSum(x[i] for i in idx if t in teams_of[i]) <= cap_count
+		for t in sorted(holders):
+			model += pulp.lpSum(x[i] for i in sorted(set(holders[t]))) <= cap_count
 
 	# Solve
+	metrics.ILP_VARIABLES.observe(len(idx))
+	metrics.ILP_CONSTRAINTS.observe(len(model.constraints))
+	start = time.perf_counter()
 	model.solve(pulp.PULP_CBC_CMD(msg=False))
-	chosen = [i for i in idx if x[i].value() == 1.0]
-
-	tickets: List[ParlayTicket] = []
-	for i in chosen:
-		size, legs, P, D, EV = cand_evs[i]
-		books = {l.team_abbr: (l.best_odds.book if l.best_odds else "") for l in legs}
-		k = kelly_fraction(P, D)
-		kelly_stake = config.bankroll * config.kelly_fraction * k
-		tickets.append(
-			ParlayTicket(
-				size=size,
-				legs=legs,
-				combined_decimal=D,
-				combined_probability=P,
-				expected_value=EV,
-				flat_stake=config.flat_stake,
-				kelly_stake=round(kelly_stake, 2),
-				books=books,
-			)
-		)
+	metrics.ILP_SOLVE_SECONDS.observe(time.perf_counter() - start)
+	# Pydantic tickets only for the chosen records
+	tickets = [arrays.to_ticket(cand[i], config) for i in idx if x[i].value() == 1.0]
 
 	# Remove duplicates by team set signature
 	seen = set()
@@ -202,8 +312,18 @@ def _derive_from_base_tickets(base: List[ParlayTicket], config: AppConfig) -> Li
 	return flat
 
 
-def ilp_select_with_derivation(finalist_by_size: Dict[int, List[List[TeamSelection]]], config: AppConfig) -> List[ParlayTicket]:
-	primary = ilp_select(finalist_by_size, config)
+def ilp_select_with_derivation(
+	finalist_by_size: Dict[int, List[List[TeamSelection]]],
+	config: AppConfig,
+	legs: Optional[List[TeamSelection]] = None,
+) -> List[ParlayTicket]:
+	if config.selector not in SELECTORS:
+		raise ValueError(f"Unknown selector {config.selector!r}; expected one of {', '.join(SELECTORS)}")
+	# colgen prices combos over all candidate legs (the finalists' legs when not given)
+	if config.selector == "colgen":
+		primary = colgen_select(finalist_by_size, config, candidate_legs(legs, config) if legs is not None else None)
+	else:
+		primary = ilp_select(finalist_by_size, config)
 	if config.desired_num_tickets is None:
 		return primary
 	need = config.desired_num_tickets - len(primary)
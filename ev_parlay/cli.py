@@ -3,22 +3,17 @@ from __future__ import annotations
 from pathlib import Path
 from typing import List, Optional
 
+import importlib.util
 import json
 import sys
 import typer
 
-from .config import AppConfig
 from .logging_utils import get_logger
-from .parser import parse_model_file
-from .odds_api import fetch_odds, get_best_moneyline, build_game_index
-from .ev_math import attach_single_metrics
-from .builder import greedy_beam_build, ilp_select, ilp_select_with_derivation
-from .reporting import print_console_report, write_artifacts
-from .simulate import simulate_slate
-from .models import ParlayTicket
-from .team_mapping import normalize_team, abbr
-
-app = typer.Typer(help="NFL Moneyline EV Calculator + Parlay Builder")
+
+# Keep module import cheap: pydantic, numpy, pulp and requests are
+# imported inside the commands that need them (see benchmarks/bench_startup.py)
+
+app = typer.Typer(help="NFL Moneyline EV Calculator + Parlay Builder", rich_markup_mode=None)
 logger = get_logger(__name__)
 
 
@@ -30,7 +25,12 @@ def fetch_odds_cmd(
 	cache_file: Optional[str] = typer.Option(None, "--cache", help="Override cache file path"),
 	commence_from: Optional[str] = typer.Option(None, "--from", help="Commence time from (ISO)"),
 	commence_to: Optional[str] = typer.Option(None, "--to", help="Commence time to (ISO)"),
+	store: Optional[str] = typer.Option(None, "--store", help="Also append the payload to this snapshot store directory"),
+	week: Optional[int] = typer.Option(None, "--week", help="Week label recorded with the snapshot"),
 ):
+	from .config import AppConfig
+	from .odds_api import fetch_odds
+
 	config = AppConfig.load(config_path)
 	if region:
 		config.region = region
@@ -42,13 +42,87 @@ def fetch_odds_cmd(
 		config.commence_from_iso = commence_from
 	if commence_to:
 		config.commence_to_iso = commence_to
-	_ = fetch_odds(config)
+	payload = fetch_odds(config)
 	logger.info("Odds fetched and cached at %s", config.cache_file)
+	if store:
+		from .snapshot_store import SnapshotStore
+
+		snap_id = SnapshotStore(store).append(payload, week=week, label=config.cache_file)
+		logger.info("Appended snapshot %d to %s", snap_id, store)
+
+
+@app.command("poll-odds")
+def poll_odds(
+	config_path: Optional[str] = typer.Option(None, "--config", help="Path to config.yaml"),
+	region: Optional[str] = typer.Option(None, "--region", help="Region/state code"),
+	cache_file: Optional[str] = typer.Option(None, "--cache", help="Cache file kept warm by the poller"),
+	commence_from: Optional[str] = typer.Option(None, "--from", help="Commence time from (ISO)"),
+	commence_to: Optional[str] = typer.Option(None, "--to", help="Commence time to (ISO)"),
+	store: Optional[str] = typer.Option(None, "--store", help="Also append every poll to this snapshot store"),
+	week: Optional[int] = typer.Option(None, "--week", help="Week label recorded with stored snapshots"),
+	max_polls: Optional[int] = typer.Option(None, "--max-polls", help="Stop after this many polls"),
+	quota_reserve: Optional[int] = typer.Option(None, "--quota-reserve", help="Stop when remaining API quota reaches this"),
+):
+	"""Poll odds until kickoff, faster as games approach, within the API quota."""
+	from .config import AppConfig
+	from .poller import OddsPoller
+	from .snapshot_store import SnapshotStore
+
+	config = AppConfig.load(config_path)
+	if region:
+		config.region = region
+	if commence_from:
+		config.commence_from_iso = commence_from
+	if commence_to:
+		config.commence_to_iso = commence_to
+	if quota_reserve is not None:
+		config.poll_quota_reserve = quota_reserve
+	poller = OddsPoller(config, cache_file=cache_file, store=SnapshotStore(store) if store else None, week=week)
+	polls = poller.run(max_polls=max_polls)
+	logger.info("Completed %d polls; cache at %s", polls, poller.cache_file)
+
+
+@app.command("snapshot-import")
+def snapshot_import(
+	files: List[str] = typer.Argument(..., help="Odds JSON cache files to import"),
+	store: str = typer.Option(..., "--store", help="Snapshot store directory"),
+	week: Optional[int] = typer.Option(None, "--week", help="Week label for the imported snapshots"),
+):
+	"""Import existing odds JSON caches into a snapshot store (fetch time = file mtime)."""
+	from .snapshot_store import SnapshotStore
+
+	snapshots = SnapshotStore(store)
+	for f in files:
+		path = Path(f)
+		payload = json.loads(path.read_text(encoding="utf-8"))
+		snap_id = snapshots.append(payload, ts=path.stat().st_mtime, week=week, label=path.name)
+		print(f"{path} -> snapshot {snap_id}")
+
+
+@app.command("odds-diff")
+def odds_diff(
+	old_file: str = typer.Argument(..., help="Earlier odds JSON"),
+	new_file: str = typer.Argument(..., help="Later odds JSON"),
+	config_path: Optional[str] = typer.Option(None, "--config", help="Path to config.yaml"),
+	sportsbooks: Optional[str] = typer.Option(None, "--sportsbooks", help="Comma-separated book keys"),
+):
+	"""Print per-(team, book) price changes between two odds snapshots as JSON lines."""
+	from .config import AppConfig
+	from .deltas import diff_snapshots
+
+	config = AppConfig.load(config_path)
+	if sportsbooks:
+		config.sportsbooks = [s.strip().lower() for s in sportsbooks.split(",") if s.strip()]
+	old_payload = json.loads(Path(old_file).read_text(encoding="utf-8"))
+	new_payload = json.loads(Path(new_file).read_text(encoding="utf-8"))
+	for ch in diff_snapshots(old_payload, new_payload, config):
+		print(json.dumps(ch.__dict__))
 
 
 @app.command()
 def build_parlays(
-	model: str = typer.Option(..., "--model", help="Path to model.txt"),
+	model: List[str] = typer.Option(..., "--model", help="Path to model.txt (repeat, or .csv/.json exports, to blend models)"),
+	model_weights: Optional[str] = typer.Option(None, "--model-weights", help="Blend weights: 'elo=0.6,sim=0.4' or positional '0.6,0.4'"),
 	config_path: Optional[str] = typer.Option(None, "--config", help="Path to config.yaml"),
 	region: Optional[str] = typer.Option(None, "--region", help="Region/state code"),
 	sportsbooks: Optional[str] = typer.Option(None, "--sportsbooks", help="Comma-separated book keys"),
@@ -60,13 +134,45 @@ def build_parlays(
 	budget: Optional[float] = typer.Option(None, "--budget", help="Total budget for this run (overrides flat/kelly stakes)"),
 	beam_width: Optional[int] = typer.Option(None, "--beam-width", help="Beam width for greedy expansion"),
 	candidate_pool_size: Optional[int] = typer.Option(None, "--candidate-pool-size", help="Top N singles to consider"),
+	large_slate: bool = typer.Option(False, "--large-slate", help="Dominance pruning + per-game buckets for 100+ leg slates"),
+	selector: Optional[str] = typer.Option(None, "--selector", help="Ticket selection: ilp (top beam finalists) or colgen (column generation over all legs)"),
 	min_edge: Optional[float] = typer.Option(None, "--min-edge", help="Minimum single-leg edge to include"),
 	min_parlay_ev: Optional[float] = typer.Option(None, "--min-parlay-ev", help="Minimum parlay EV to keep"),
-	odds_file: Optional[str] = typer.Option(None, "--odds-file", help="Read odds JSON from this file instead of API"),
+	odds_file: Optional[str] = typer.Option(None, "--odds-file", help="Read odds JSON (or a snapshot store directory) instead of API"),
+	week: Optional[int] = typer.Option(None, "--week", help="Snapshot store: restrict to snapshots labelled with this week"),
+	snapshot_at: Optional[str] = typer.Option(None, "--snapshot-at", help="Snapshot store: use the latest snapshot at or before this time (ISO)"),
 	commence_from: Optional[str] = typer.Option(None, "--from", help="Commence time from (ISO)"),
 	commence_to: Optional[str] = typer.Option(None, "--to", help="Commence time to (ISO)"),
 	outdir: str = typer.Option("outputs", "--outdir", help="Output directory"),
+	out_format: str = typer.Option("csv", "--format", help="Table format for parlays/exposure: csv, jsonl or parquet (needs pyarrow)"),
+	timings: bool = typer.Option(False, "--timings", help="Print wall time and item count per pipeline stage"),
+	sensitivity_method: Optional[str] = typer.Option(None, "--sensitivity", help="Perturb leg probabilities (normal, beta or bootstrap over the blended models) and report each ticket's EV distribution"),
+	sensitivity_sd: float = typer.Option(0.03, "--sensitivity-sd", help="Leg probability error (sd) for normal/beta sensitivity"),
+	sensitivity_draws: int = typer.Option(2000, "--sensitivity-draws", help="Probability draws for sensitivity"),
 ):
+	from .builder import SELECTORS
+	from .config import AppConfig
+	from .daemon import cached_file
+	from .model_batch import blend, load_models, parse_weights
+	from .odds_api import fetch_odds, OddsIndex
+	from .odds_stream import load_odds_file
+	from .parser import parse_model_file
+	from .pipeline import SlateError, SlatePipeline
+	from .reporting import TABLE_FORMATS, print_console_report, write_artifacts
+	from .snapshot_store import load_payload
+
+	if selector is not None and selector not in SELECTORS:
+		print(f"Unknown --selector {selector!r}; expected one of {', '.join(SELECTORS)}")
+		return
+	if out_format not in TABLE_FORMATS:
+		print(f"Unknown --format {out_format!r}; expected one of {', '.join(TABLE_FORMATS)}")
+		return
+	if out_format == "parquet" and importlib.util.find_spec("pyarrow") is None:
+		print("--format parquet needs pyarrow (pip install pyarrow)")
+		return
+	if sensitivity_method is not None and sensitivity_method not in ("normal", "beta", "bootstrap"):
+		print(f"Unknown --sensitivity {sensitivity_method!r}; expected normal, beta or bootstrap")
+		return
 	config = AppConfig.load(config_path)
 	if region:
 		config.region = region
@@ -88,6 +194,10 @@ def build_parlays(
 		config.beam_width = beam_width
 	if candidate_pool_size is not None:
 		config.candidate_pool_size = candidate_pool_size
+	if large_slate:
+		config.large_slate = True
+	if selector:
+		config.selector = selector
 	if min_edge is not None:
 		config.min_edge = min_edge
 	if min_parlay_ev is not None:
@@ -97,168 +207,299 @@ def build_parlays(
 	if commence_to:
 		config.commence_to_iso = commence_to
 
-	# Load inputs
-	selections = parse_model_file(model)
-	if odds_file:
-		odds_payload = json.loads(Path(odds_file).read_text(encoding="utf-8"))
-	else:
-		odds_payload = fetch_odds(config)
-
-	# Build game index for this slate and validate model picks
-	game_index = build_game_index(odds_payload)
-	validated = []
-	seen_games = set()
-	missing_from_slate: List[str] = []
-	for s in selections:
-		norm = normalize_team(s.team_name) or s.team_name
-		team_ab = abbr(norm) or s.team_abbr
-		if team_ab not in game_index:
-			missing_from_slate.append(team_ab)
-			continue
-		gid, opp_ab = game_index[team_ab]
-		# Resolve same-game conflicts by keeping only higher model prob
-		if gid in seen_games:
-			for i, prev in enumerate(validated):
-				if prev.game_id == gid:
-					if s.model_win_prob > prev.model_win_prob:
-						validated[i] = s
-					logger.info("Resolved same-game conflict for %s vs %s", team_ab, prev.team_abbr)
-					break
-			continue
-		s.game_id = gid
-		s.opponent_abbr = opp_ab
-		validated.append(s)
-		seen_games.add(gid)
-
-	# If any picks are missing from slate, prompt user to update model and exit gracefully
-	if missing_from_slate:
-		msg = (
-			"Some teams in model.txt are not in the current slate: "
-			+ ", ".join(sorted(set(missing_from_slate)))
-			+ ". Please update model.txt to match the week’s games (one pick per game)."
-		)
+	# Parsed inputs are memoized per file version when running inside the daemon
+	def load_model():
+		if len(model) == 1 and not model_weights and Path(model[0]).suffix.lower() not in (".csv", ".json"):
+			return cached_file("model", model[0], lambda: parse_model_file(model[0]))
+		table = load_models(model, week=week)
+		return blend(table, parse_weights(model_weights, table.model_ids), week=week)
+
+	def load_odds():
+		books_key = (config.market, tuple(sorted(config.sportsbooks or [])))
+		if odds_file and Path(odds_file).is_dir():
+			return cached_file(
+				"store",
+				Path(odds_file) / "meta.json",
+				lambda: OddsIndex.from_payload(load_payload(odds_file, at=snapshot_at, week=week), config),
+				books_key,
+				snapshot_at,
+				week,
+			)
+		if odds_file:
+			# Stream the file, keeping only the configured market and books
+			return cached_file("odds", odds_file, lambda: load_odds_file(odds_file, config)[1], books_key)
+		index = OddsIndex(config)
+		fetch_odds(config, index=index)
+		return index
+
+	pipeline = SlatePipeline(config)
+	try:
+		with_odds, _ = pipeline.prepare(load_model, load_odds)
+	except SlateError as e:
+		# Prompt user to update model and exit gracefully
+		msg = f"{e}. Please update model.txt to match the week’s games (one pick per game)."
 		logger.error(msg)
 		print(msg)
 		return
-
-	# Attach best odds and metrics; collect any missing odds as a soft failure
-	with_odds = []
-	missing_odds: List[str] = []
-	for s in validated:
-		od = get_best_moneyline(s.team_name, config, odds_payload)
-		if od is None:
-			missing_odds.append(s.team_abbr)
-			continue
-		s.best_odds = od
-		s = attach_single_metrics(s)
-		# Filter by min_edge if set
-		if config.min_edge is not None and (s.edge or -1.0) < config.min_edge:
-			pass
-		else:
-			with_odds.append(s)
-
-	if missing_odds:
+	for team_ab, other in pipeline.conflicts:
+		logger.info("Resolved same-game conflict for %s vs %s", team_ab, other)
+	if pipeline.missing_odds:
 		msg = (
 			"Some teams have no available odds from the selected books: "
-			+ ", ".join(sorted(set(missing_odds)))
+			+ ", ".join(sorted(set(pipeline.missing_odds)))
 			+ ". Consider adjusting --sportsbooks or the date window."
 		)
 		logger.warning(msg)
 		print(msg)
 
-	# Greedy beam (one-per-game enforced) then ILP selection (+ derivation)
-	by_size = greedy_beam_build(with_odds, config)
-	tickets = ilp_select_with_derivation(by_size, config)
-	if config.min_parlay_ev is not None and config.min_parlay_ev > 0:
-		tickets = [t for t in tickets if t.expected_value >= config.min_parlay_ev]
-
-	# Budget allocation
-	if config.run_budget is not None and tickets:
-		budget = config.run_budget
-		n = config.desired_num_tickets or min(config.max_tickets, len(tickets))
-		selected = tickets[:n]
-		# Weighting methods
-		if config.stake_method == "equal":
-			weights = [1.0] * len(selected)
-		elif config.stake_method == "ev_sqrt":
-			weights = [max(0.0, (t.expected_value + 1e-9)) ** 0.5 for t in selected]
-		else:  # kelly_norm default
-			weights = [max(0.0, t.kelly_stake) for t in selected]
-		if sum(weights) <= 0:
-			weights = [1.0] * len(selected)
-		# Normalize and apply caps/mins
-		ws = [w / sum(weights) for w in weights]
-		max_cap = config.max_stake_pct * budget if config.max_stake_pct else budget
-		remaining = budget
-		stakes = [0.0] * len(selected)
-		# First pass proportional
-		for i, w in enumerate(ws):
-			stakes[i] = round(min(max_cap, max(config.min_stake, budget * w)), 2)
-			remaining -= stakes[i]
-		# Distribute any leftover equally respecting cap
-		idx = 0
-		while remaining > 0.01 and any(s < max_cap for s in stakes):
-			if stakes[idx] < max_cap:
-				add = min(max_cap - stakes[idx], remaining, 0.01 * round(remaining / 0.01))
-				if add <= 0:
-					idx = (idx + 1) % len(stakes)
-					continue
-				stakes[idx] = round(stakes[idx] + add, 2)
-				remaining = round(remaining - add, 2)
-			idx = (idx + 1) % len(stakes)
-		for t, stake in zip(selected, stakes):
-			t.flat_stake = stake
-			t.kelly_stake = stake
-		if config.desired_num_tickets is not None:
-			tickets = selected
+	# Greedy beam (one-per-game enforced) then ILP selection (+ derivation), then budget allocation
+	tickets = pipeline.stake(pipeline.select(pipeline.build(with_odds), with_odds))
+	if timings:
+		for row in pipeline.timings():
+			print(f"{row['stage']:<9} {row['ms']:>10.1f} ms  {row['items']:>7} items")
 
 	print_console_report(with_odds, tickets)
-	_ = write_artifacts(outdir, tickets)
+	_ = write_artifacts(outdir, tickets, fmt=out_format)
+	if sensitivity_method:
+		_print_sensitivity(tickets, config, sensitivity_method, sensitivity_sd, sensitivity_draws, model, model_weights, week, outdir)
+
+
+def _print_sensitivity(tickets, config, method, sd, draws, model, model_weights, week, outdir) -> None:
+	"""Per-ticket EV spread under leg-probability error; also saved as sensitivity.json."""
+	from .model_batch import load_models, parse_weights
+	from .sensitivity import sensitivity
+
+	table = weights = None
+	if method == "bootstrap":
+		table = load_models(model, week=week)
+		if week is not None:
+			table = table.select(week=week)
+		weights = parse_weights(model_weights, table.model_ids)
+	try:
+		rows = sensitivity(
+			tickets, draws=draws, method=method, sd=sd, rho=config.correlation_rho,
+			bankroll=config.bankroll, kelly_fraction=config.kelly_fraction, table=table, weights=weights,
+		)
+	except ValueError as e:
+		print(f"Sensitivity skipped: {e}")
+		return
+	print(f"Sensitivity ({method}, {draws} draws): EV per $1")
+	print(f"{'legs':<28} {'EV':>7} {'p05':>7} {'p50':>7} {'p95':>7} {'P(EV<0)':>8} {'kelly p05-p95':>16}")
+	for r in rows:
+		kelly = f"{r['kelly_p05']:.2f}-{r['kelly_p95']:.2f}"
+		print(f"{','.join(r['teams']):<28} {r['ev']:>7.3f} {r['ev_p05']:>7.3f} {r['ev_p50']:>7.3f} {r['ev_p95']:>7.3f} {r['p_negative']:>8.1%} {kelly:>16}")
+	path = Path(outdir) / "sensitivity.json"
+	path.write_text(json.dumps(rows, indent=2), encoding="utf-8")
+	print(f"Saved sensitivity to {path}")
 
 
 @app.command()
 def simulate(
-	parlays_csv: str = typer.Option("outputs/parlays.csv", "--parlays", help="Path to parlays.csv"),
+	parlays_csv: str = typer.Option("outputs/parlays.csv", "--parlays", help="Path to tickets.npz or parlays.csv (a tickets.npz beside it is preferred)"),
 	trials: int = typer.Option(50000, "--trials", help="Monte-Carlo trials"),
 	out_image: Optional[str] = typer.Option(None, "--out-image", help="Save histogram PNG to this path"),
 	save_samples: Optional[str] = typer.Option(None, "--save-samples", help="Optional CSV of profit samples"),
 ):
-	import pandas as pd
-	from .simulate import simulate_slate, simulate_slate_samples, save_histogram
+	from .simulate import profit_stats, save_histogram, simulate_archive_samples
+	from .ticket_archive import TicketArchive, archive_for, load_archive
+
+	archive_path = archive_for(parlays_csv)
+	if archive_path is not None:
+		archive = load_archive(archive_path)
+	else:
+		archive = TicketArchive.from_tickets(_legacy_tickets(parlays_csv))
+	profits = simulate_archive_samples(archive, trials=trials)
+	print(json.dumps(profit_stats(profits), indent=2))
+	if out_image:
+		path = save_histogram(profits, out_image)
+		if path:
+			print(f"Saved histogram to {path}")
+		else:
+			print("matplotlib not available; cannot save histogram")
+	if save_samples:
+		import numpy as np
+		np.savetxt(save_samples, profits, fmt="%.6f", header="profit", comments="")
+		print(f"Saved samples to {save_samples}")
+
+
+def _legacy_tickets(parlays_csv: str):
+	"""Leg-less tickets from a parlays.csv written before ticket archives existed."""
+	import csv
+	from .models import ParlayTicket
 
-	df = pd.read_csv(parlays_csv)
 	tickets = []
-	for _, row in df.iterrows():
-		teams = str(row["legs"]).split(",")
-		tickets.append(
-			ParlayTicket(
-				size=int(row["size"]),
-				legs=[],
-				combined_decimal=float(row["decimal_odds"]),
-				combined_probability=float(row["probability"]),
-				expected_value=float(row["EV_dollars"]),
-				flat_stake=float(row["flat_stake"]),
-				kelly_stake=float(row["kelly_stake"]),
-				books={t: "" for t in teams},
+	with open(parlays_csv, newline="", encoding="utf-8") as fh:
+		for row in csv.DictReader(fh):
+			teams = str(row["legs"]).split(",")
+			tickets.append(
+				ParlayTicket(
+					size=int(row["size"]),
+					legs=[],
+					combined_decimal=float(row["decimal_odds"]),
+					combined_probability=float(row["probability"]),
+					expected_value=float(row["EV_dollars"]),
+					flat_stake=float(row["flat_stake"]),
+					kelly_stake=float(row["kelly_stake"]),
+					books={t: "" for t in teams},
+				)
 			)
-		)
-	stats = simulate_slate(tickets, trials=trials)
-	print(json.dumps(stats, indent=2))
-	if out_image or save_samples:
-		profits = simulate_slate_samples(tickets, trials=trials)
-		if out_image:
-			path = save_histogram(profits, out_image)
-			if path:
-				print(f"Saved histogram to {path}")
-			else:
-				print("matplotlib not available; cannot save histogram")
-		if save_samples:
-			import pandas as pd
-			pd.DataFrame({"profit": profits}).to_csv(save_samples, index=False)
-			print(f"Saved samples to {save_samples}")
+	return tickets
+
+
+@app.command()
+def live(
+	tickets: str = typer.Option("outputs/tickets.npz", "--tickets", help="Placed tickets: tickets.npz or the parlays.csv beside it"),
+	updates: Optional[List[str]] = typer.Option(None, "--update", help="CSV/JSON rows of team,won,odds,prob (settled results, in-game American odds; repeat to apply in order)"),
+	trials: int = typer.Option(20000, "--trials", help="Monte-Carlo trials over the open legs"),
+	out: Optional[str] = typer.Option(None, "--out", help="Write the full JSON report here"),
+):
+	"""Conditional ticket probabilities, profit distribution and hedge stakes as legs settle."""
+	from .live import LiveSlate, load_updates
+	from .ticket_archive import archive_for, load_archive
+
+	path = archive_for(tickets)
+	if path is None or not path.exists():
+		print(f"No tickets.npz for {tickets}; live tracking needs the archive written by build-parlays")
+		return
+	slate = LiveSlate(load_archive(path))
+	for update in updates or []:
+		try:
+			touched = slate.update(*load_updates(update, known=slate.legs_of))
+		except ValueError as e:
+			print(e)
+			return
+		print(f"{update}: recomputed {touched} of {len(slate.archive)} tickets")
+	report = slate.report(trials=trials)
+	print(f"{'#':>3} {'legs':<24} {'status':<6} {'prob':>7} {'stake':>8} {'fair value':>10}")
+	for r in report["tickets"]:
+		print(f"{r['ticket']:>3} {','.join(r['teams']):<24} {r['status']:<6} {r['probability']:>7.1%} {r['stake']:>8.2f} {r['fair_value']:>10.2f}")
+	print(json.dumps(report["profit"], indent=2))
+	for h in report["hedges"]:
+		print(f"Hedge {h['hedge_on']} (vs {h['leg']}, tickets {','.join(map(str, h['tickets']))}): stake {h['hedge_stake']:.2f} at {h['hedge_decimal']:.2f} locks {h['locked_profit']:.2f}")
+	if out:
+		Path(out).write_text(json.dumps(report, indent=2), encoding="utf-8")
+		print(f"Saved report to {out}")
+
+
+@app.command()
+def backtest(
+	season_dir: str = typer.Argument(..., help="Directory of per-week model files and odds snapshots (e.g. model_week5.txt, odds_week5.json)"),
+	config_paths: Optional[List[str]] = typer.Option(None, "--config", help="config.yaml to evaluate (repeat to compare configs)"),
+	results: Optional[str] = typer.Option(None, "--results", help="Results file: week,team,won rows (default: <dir>/results.csv)"),
+	weeks: Optional[List[int]] = typer.Option(None, "--week", help="Only these weeks (repeatable)"),
+	workers: int = typer.Option(0, "--workers", help="Worker processes (0 = one per CPU, 1 = inline)"),
+	cache_dir: Optional[str] = typer.Option(None, "--cache-dir", help="Prepared-slate cache (default: <dir>/.backtest_cache)"),
+	out: Optional[str] = typer.Option(None, "--out", help="Write the full JSON report (per week, calibration) here"),
+):
+	"""Replay a season: build, stake and grade every week per config; report ROI, drawdown and calibration."""
+	from .backtest import run_backtest
+	from .config import AppConfig
+
+	configs = {Path(p).stem: AppConfig.load(p) for p in config_paths} if config_paths else {"default": AppConfig.load(None)}
+	try:
+		report = run_backtest(season_dir, configs, results_path=results, weeks=weeks, workers=workers, cache_dir=cache_dir)
+	except ValueError as e:
+		print(e)
+		return
+	print(f"{len(report['weeks'])} weeks: {', '.join(map(str, report['weeks'])) or '-'}")
+	print(f"{'config':<16} {'tickets':>7} {'staked':>10} {'profit':>10} {'ROI':>7} {'max DD':>9} {'hit':>6} {'brier':>6}")
+	for name, r in report["configs"].items():
+		brier = f"{r['brier']:.3f}" if r["brier"] is not None else "-"
+		print(f"{name:<16} {r['tickets']:>7} {r['staked']:>10.2f} {r['profit']:>10.2f} {r['roi']:>7.1%} {r['max_drawdown']:>9.2f} {r['hit_rate']:>6.1%} {brier:>6}")
+		for week, err in r["errors"].items():
+			print(f"  week {week}: {err}")
+	if out:
+		Path(out).write_text(json.dumps(report, indent=2), encoding="utf-8")
+		print(f"Saved report to {out}")
+
+
+@app.command()
+def sweep(
+	season_dir: str = typer.Argument(..., help="Directory of per-week model files and odds snapshots (same layout as backtest)"),
+	params: Optional[List[str]] = typer.Option(None, "--param", help="Values to try, e.g. beam_width=50,200 or parlay_sizes=2-3,2-5 (repeatable)"),
+	space_file: Optional[str] = typer.Option(None, "--space", help="YAML/JSON search space: {field: [values]}"),
+	samples: Optional[int] = typer.Option(None, "--samples", help="Random search: evaluate this many configs from the grid"),
+	seed: int = typer.Option(0, "--seed", help="Random search seed"),
+	config_path: Optional[str] = typer.Option(None, "--config", help="Base config.yaml; swept fields override it"),
+	weeks: Optional[List[int]] = typer.Option(None, "--week", help="Only these weeks (repeatable)"),
+	workers: int = typer.Option(0, "--workers", help="Worker processes (0 = one per CPU, 1 = inline)"),
+	objective: str = typer.Option("expected_profit", "--objective", help="Sort key: expected_profit, log_growth or ev_sum"),
+	out: str = typer.Option("sweep.csv", "--out", help="Results table (.csv or .jsonl)"),
+	top: int = typer.Option(10, "--top", help="Rows to print"),
+):
+	"""Grid or random search over builder settings; writes objective, runtime and exposure per config."""
+	from .backtest import CACHE_DIR, discover_weeks
+	from .config import AppConfig
+	from .sweep import OBJECTIVES, expand, iter_sweep, load_space, parse_param, prepare_slates, write_table
+
+	if objective not in OBJECTIVES:
+		print(f"Unknown --objective {objective!r}; expected one of {', '.join(OBJECTIVES)}")
+		return
+	try:
+		space = load_space(space_file) if space_file else {}
+		space.update(dict(parse_param(p) for p in params or []))
+	except ValueError as e:
+		print(e)
+		return
+	if not space:
+		print("Nothing to sweep: pass --param or --space")
+		return
+	base = AppConfig.load(config_path)
+	inputs = discover_weeks(season_dir)
+	if weeks:
+		inputs = {wk: e for wk, e in inputs.items() if wk in set(weeks)}
+	slates, errors = prepare_slates(list(inputs.values()), base, Path(season_dir) / CACHE_DIR)
+	for name, err in errors.items():
+		print(f"{name}: {err}")
+	if not slates:
+		print("No slates to sweep")
+		return
+	configs = expand(space, samples=samples, seed=seed)
+	print(f"{len(configs)} configs x {len(slates)} slates")
+	rows = sorted(iter_sweep(slates, base, configs, workers=workers), key=lambda r: r[objective], reverse=True)
+	write_table(out, rows)
+	for r in rows[:top]:
+		settings = " ".join(f"{k}={'-'.join(map(str, v)) if isinstance(v, list) else v}" for k, v in r.items() if k in space)
+		print(f"{r[objective]:>12.4f}  {r['seconds'] * 1000:>9.1f} ms  exposure {r['max_exposure']:.2f}  {settings}")
+	print(f"Saved {len(rows)} rows to {out}")
+
+
+daemon_app = typer.Typer(help="Warm background process that serves build-parlays/simulate/odds-diff", rich_markup_mode=None)
+app.add_typer(daemon_app, name="daemon")
+
+
+@daemon_app.command("start")
+def daemon_start():
+	"""Run the daemon in the foreground (background it with '&' or a service manager)."""
+	from .daemon import serve, socket_path
+
+	logger.info("ev-parlay daemon listening on %s", socket_path())
+	serve()
+
+
+@daemon_app.command("stop")
+def daemon_stop():
+	from .daemon import send_control
+
+	reply = send_control("stop")
+	print(reply["stdout"].strip() if reply else "No daemon running")
+
+
+@daemon_app.command("status")
+def daemon_status():
+	from .daemon import send_control
+
+	reply = send_control("status")
+	print(reply["stdout"].strip() if reply else "No daemon running")
 
 
 def main():
+	# Transparently use a running daemon for repeatable commands (EV_PARLAY_NO_DAEMON=1 disables)
+	from .daemon import try_forward
+
+	code = try_forward(sys.argv[1:])
+	if code is not None:
+		sys.exit(code)
 	app()
 
 
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import math
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import metrics
+from .config import AppConfig
+from .models import ParlayTicket, TeamSelection
+from .slate_arrays import SlateArrays, TicketRecord
+
+# Objective penalty per unfilled ticket slot, so the master LP is feasible from the first round
+SHORTFALL_PENALTY = 1000.0
+TOL = 1e-9
+
+
+def solve_master(
+	columns: List[TicketRecord],
+	arrays: SlateArrays,
+	config: AppConfig,
+	relax: bool,
+) -> Tuple[List[float], float, np.ndarray]:
+	"""Selection problem over ``columns``: (x values, ticket-count dual, per-team exposure duals).
+
+	Same objective and constraints as builder.ilp_select, plus a penalized
+	shortfall variable on the ticket count. With ``relax`` the x are continuous
+	in [0, 1] and the duals price new columns; otherwise x are binary and the
+	duals are zero.
+	"""
+	import pulp  # type: ignore
+
+	model = pulp.LpProblem("ParlayColumns", pulp.LpMaximize)
+	cat = pulp.LpContinuous if relax else pulp.LpBinary
+	idx = range(len(columns))
+	x = pulp.LpVariable.dicts("x", idx, lowBound=0, upBound=1, cat=cat)
+	desired = config.desired_num_tickets
+	slots = desired or config.max_tickets
+	short = pulp.LpVariable("short", lowBound=0, upBound=slots, cat=pulp.LpContinuous if relax else pulp.LpInteger)
+	model += pulp.lpSum(x[i] * columns[i].expected_value for i in idx) - SHORTFALL_PENALTY * short
+	# Keep the constraint objects: duals are read from them, not by name through
+	# model.constraints (a deprecated mapping in PuLP 3.3, a list in PuLP 4)
+	if desired is not None:
+		count = pulp.lpSum(x[i] for i in idx) + short == desired
+	else:
+		count = pulp.lpSum(x[i] for i in idx) <= config.max_tickets
+	model += count, "count"
+
+	holders: Dict[int, List[int]] = {}
+	for i, rec in enumerate(columns):
+		for j in rec.legs:
+			holders.setdefault(arrays.t[j], []).append(i)
+	cap_count = math.floor(config.team_exposure_cap * slots)
+	caps = {}
+	for t in sorted(holders):
+		caps[t] = pulp.lpSum(x[i] for i in holders[t]) <= cap_count
+		model += caps[t], f"team_{t}"
+
+	if not relax:
+		metrics.ILP_VARIABLES.observe(len(columns))
+		metrics.ILP_CONSTRAINTS.observe(1 + len(caps))
+	start = time.perf_counter()
+	model.solve(pulp.PULP_CBC_CMD(msg=False))
+	if not relax:
+		metrics.ILP_SOLVE_SECONDS.observe(time.perf_counter() - start)
+	values = [x[i].value() or 0.0 for i in idx]
+	team_dual = np.zeros(len(arrays.teams))
+	if not relax:
+		return values, 0.0, team_dual
+	for t, cons in caps.items():
+		team_dual[t] = cons.pi or 0.0
+	return values, count.pi or 0.0, team_dual
+
+
+def price_columns(
+	arrays: SlateArrays,
+	leg_dual: np.ndarray,
+	count_dual: float,
+	sizes: Sequence[int],
+	width: int,
+	rho: float = 0.0,
+	min_ev: float = 0.0,
+	exclude: Optional[set] = None,
+) -> List[Tuple[float, Tuple[int, ...]]]:
+	"""Leg combinations with positive reduced cost, best first.
+
+	Reduced cost = EV - count dual - sum of the exposure duals of the ticket's
+	teams. Combos (one leg per game and team, sorted leg indices) grow one leg
+	at a time, keeping the ``width`` best by reduced cost at independent
+	probabilities; every size in ``sizes`` is scored exactly (with ``rho``).
+	"""
+	exclude = exclude or set()
+	valid = np.isfinite(arrays.decimal)
+	legs = np.flatnonzero(valid)
+	if legs.size == 0 or not sizes:
+		return []
+	factor = np.where(valid, arrays.prob * np.nan_to_num(arrays.decimal), 0.0)
+	states = legs[:, None]
+	found: Dict[Tuple[int, ...], float] = {}
+	for k in range(1, max(sizes) + 1):
+		if k in sizes:
+			_, _, ev = arrays.evaluate_many(states, rho)
+			rc = ev - count_dual - leg_dual[states].sum(axis=1)
+			for row in np.flatnonzero((rc > TOL) & (ev > min_ev)):
+				key = tuple(int(j) for j in states[row])
+				if key not in exclude:
+					found[key] = float(rc[row])
+		if k == max(sizes):
+			break
+		games, teams = arrays.game[states], arrays.team[states]
+		clash = (games[:, :, None] == arrays.game[None, None, :]).any(axis=1)
+		clash |= (teams[:, :, None] == arrays.team[None, None, :]).any(axis=1)
+		clash |= ~valid[None, :]
+		prod = factor[states].prod(axis=1)
+		pen = leg_dual[states].sum(axis=1)
+		score = prod[:, None] * factor[None, :] - 1.0 - pen[:, None] - leg_dual[None, :]
+		rows, cols = np.nonzero(~clash)
+		if rows.size == 0:
+			break
+		order = np.argsort(-score[rows, cols], kind="stable")
+		rows, cols = rows[order], cols[order]
+		grown = np.sort(np.concatenate([states[rows], cols[:, None]], axis=1), axis=1)
+		# First occurrence of each combo is its best-scored one
+		_, first = np.unique(grown, axis=0, return_index=True)
+		states = grown[np.sort(first)[:width]]
+	return sorted(((rc, key) for key, rc in found.items()), reverse=True)
+
+
+def colgen_select(
+	finalist_by_size: Dict[int, List[List[TeamSelection]]],
+	config: AppConfig,
+	legs: Optional[List[TeamSelection]] = None,
+) -> List[ParlayTicket]:
+	"""Ticket selection by column generation over every leg combination.
+
+	The LP relaxation starts from the best beam finalists; each round its
+	duals (ticket count, team exposure) price new combos over ``legs``, and the
+	``colgen_columns`` with the highest reduced cost join the pool. When
+	pricing finds nothing improving (or after ``colgen_rounds``), the binary
+	problem is solved over the generated pool, which stays far smaller than
+	enumerating combos up front. Pricing is a beam search, so optimality holds
+	up to that heuristic.
+	"""
+	legs_by_id: Dict[int, TeamSelection] = {id(l): l for l in legs or []}
+	for combos in finalist_by_size.values():
+		for c in combos:
+			for l in c:
+				legs_by_id.setdefault(id(l), l)
+	arrays = SlateArrays(list(legs_by_id.values()))
+	position = {key: i for i, key in enumerate(legs_by_id)}
+	rho = config.correlation_rho
+	sizes = sorted(set(config.parlay_sizes))
+
+	columns: List[TicketRecord] = []
+	seen: set = set()
+
+	def add(legs_idx: Sequence[int]) -> None:
+		key = tuple(sorted(legs_idx))
+		if key in seen:
+			return
+		rec = arrays.record(key, rho)
+		if math.isfinite(rec.expected_value) and rec.expected_value > max(0.0, config.min_parlay_ev):
+			seen.add(key)
+			columns.append(rec)
+
+	initial = [[position[id(l)] for l in c] for size in sizes for c in finalist_by_size.get(size, [])]
+	initial.sort(key=lambda c: arrays.evaluate(c, rho)[2], reverse=True)
+	for c in initial[: max(2 * (config.desired_num_tickets or config.max_tickets), 20)]:
+		add(c)
+
+	for _ in range(config.colgen_rounds):
+		_, count_dual, team_dual = solve_master(columns, arrays, config, relax=True)
+		priced = price_columns(
+			arrays, team_dual[arrays.team], count_dual, sizes, config.beam_width, rho, max(0.0, config.min_parlay_ev), seen,
+		)
+		if not priced:
+			break
+		for _, key in priced[: config.colgen_columns]:
+			add(key)
+
+	if not columns:
+		return []
+	values, _, _ = solve_master(columns, arrays, config, relax=False)
+	tickets = [arrays.to_ticket(rec, config) for rec, v in zip(columns, values) if v > 0.5]
+	tickets.sort(key=lambda t: t.expected_value, reverse=True)
+	return tickets
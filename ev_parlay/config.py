@@ -4,13 +4,13 @@ from pathlib import Path
 from typing import List, Optional
 
 import os
-import yaml
 from pydantic import BaseModel, Field
 
 
 class AppConfig(BaseModel):
 	# Odds API and filtering
 	odds_api_key: Optional[str] = Field(default_factory=lambda: os.getenv("ODDS_API_KEY"))
+	odds_api_base: str = "https://api.the-odds-api.com/v4/sports/americanfootball_nfl/odds"
 	sportsbooks: List[str] = Field(default_factory=lambda: ["draftkings", "fanduel", "betmgm"])
 	region: str = "us"
 	market: str = "h2h"
@@ -23,6 +23,10 @@ class AppConfig(BaseModel):
 	# Caching
 	ttl_seconds: int = 300
 	cache_file: str = ".odds_cache.json"
+	# Background odds polling: (seconds to next kickoff, poll interval) tiers
+	poll_tiers: List[List[float]] = Field(default_factory=lambda: [[3600, 60], [6 * 3600, 300], [24 * 3600, 1800]])
+	poll_far_interval: float = 3 * 3600
+	poll_quota_reserve: int = 25
 	# Parlays
 	parlay_sizes: List[int] = Field(default_factory=lambda: list(range(3, 11)))
 	beam_width: int = 50
@@ -31,6 +35,14 @@ class AppConfig(BaseModel):
 	team_exposure_cap: float = 0.35
 	avoid_same_game: bool = True
 	correlation_rho: float = 0.0
+	# Ticket selection: ilp (ILP over the top beam finalists) or colgen (column generation over all legs)
+	selector: str = "ilp"
+	colgen_rounds: int = 50
+	colgen_columns: int = 20
+	# Large-slate mode: dominance pruning + per-game buckets + bounded expansion
+	large_slate: bool = False
+	legs_per_game: int = 3
+	expansion_per_combo: int = 24
 	# Duplication/derivation controls
 	allow_duplicate_across_tickets: bool = True
 	derivation_sizes: List[int] = Field(default_factory=lambda: [6, 5, 4, 3])
@@ -41,14 +53,19 @@ class AppConfig(BaseModel):
 	kelly_fraction: float = 0.5
 	run_budget: Optional[float] = None
 	flat_stake: float = 10.0
-	stake_method: str = "kelly_norm"  # options: kelly_norm, equal, ev_sqrt
+	stake_method: str = "kelly_norm"  # options: kelly_norm, equal, ev_sqrt, kelly_joint
 	max_stake_pct: float = 0.4
 	min_stake: float = 0.0
+	# kelly_joint: enumerate leg outcomes up to this many legs, else sample scenarios
+	kelly_exact_legs: int = 12
+	kelly_scenarios: int = 20000
 
 	@staticmethod
 	def load(config_path: Optional[str] = None) -> "AppConfig":
 		data = {}
 		if config_path and Path(config_path).exists():
+			import yaml
+
 			with open(config_path, "r", encoding="utf-8") as f:
 				data = yaml.safe_load(f) or {}
 		return AppConfig(**data)
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import traceback
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Commands worth forwarding: short, repeatable and helped by warm caches.
+# Long-running ones (poll-odds) or daemon control always run in-process.
+FORWARDED_COMMANDS = {"build-parlays", "simulate", "odds-diff"}
+
+
+def socket_path() -> Path:
+	env = os.getenv("EV_PARLAY_SOCKET")
+	if env:
+		return Path(env)
+	return Path(tempfile.gettempdir()) / f"ev-parlay-{os.getuid()}.sock"
+
+
+class WarmCache:
+	"""LRU of parsed inputs keyed by file identity (path, mtime, size) plus caller keys."""
+
+	def __init__(self, max_entries: int = 32):
+		self.max_entries = max_entries
+		self._entries: "OrderedDict[Tuple, Any]" = OrderedDict()
+		self.hits = 0
+		self.misses = 0
+
+	def get(self, key: Tuple, path: str | Path, loader: Callable[[], Any]) -> Any:
+		p = Path(path).resolve()
+		st = p.stat()
+		full_key = key + (str(p), st.st_mtime_ns, st.st_size)
+		if full_key in self._entries:
+			self.hits += 1
+			self._entries.move_to_end(full_key)
+			return self._entries[full_key]
+		self.misses += 1
+		value = loader()
+		self._entries[full_key] = value
+		if len(self._entries) > self.max_entries:
+			self._entries.popitem(last=False)
+		return value
+
+
+# Only set inside a running daemon; plain CLI runs load everything fresh
+WARM: Optional[WarmCache] = None
+
+
+def cached_file(kind: str, path: str | Path, loader: Callable[[], Any], *key: Any) -> Any:
+	"""Return ``loader()``, memoized per file version when running inside the daemon."""
+	if WARM is None:
+		return loader()
+	return WARM.get((kind,) + key, path, loader)
+
+
+def _run_cli(argv: List[str]) -> Tuple[int, str, str]:
+	from .cli import app
+
+	out, err = io.StringIO(), io.StringIO()
+	code = 0
+	with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+		try:
+			result = app(args=argv, prog_name="ev-parlay", standalone_mode=False)
+			code = result if isinstance(result, int) else 0
+		except SystemExit as e:
+			code = e.code if isinstance(e.code, int) else 1
+		except Exception as e:
+			# click/typer Exit and usage errors carry an exit code (click may be vendored by typer)
+			exit_code = getattr(e, "exit_code", None)
+			if isinstance(exit_code, int):
+				if hasattr(e, "show"):
+					e.show(file=err)
+				code = exit_code
+			else:
+				traceback.print_exc(file=err)
+				code = 1
+	return code, out.getvalue(), err.getvalue()
+
+
+class _Handler(socketserver.StreamRequestHandler):
+	def handle(self) -> None:
+		request = json.loads(self.rfile.readline().decode("utf-8"))
+		if request.get("control") == "stop":
+			self._reply({"exit_code": 0, "stdout": "daemon stopping\n", "stderr": ""})
+			threading.Thread(target=self.server.shutdown, daemon=True).start()
+			return
+		if request.get("control") == "status":
+			warm = WARM or WarmCache()
+			status = f"daemon pid {os.getpid()}: cache hits={warm.hits} misses={warm.misses}\n"
+			self._reply({"exit_code": 0, "stdout": status, "stderr": ""})
+			return
+		prev_cwd = os.getcwd()
+		prev_columns = os.environ.get("COLUMNS")
+		try:
+			os.chdir(request.get("cwd") or prev_cwd)
+			if request.get("columns"):
+				os.environ["COLUMNS"] = str(request["columns"])
+			code, out, err = _run_cli(request.get("argv", []))
+		finally:
+			os.chdir(prev_cwd)
+			if prev_columns is None:
+				os.environ.pop("COLUMNS", None)
+			else:
+				os.environ["COLUMNS"] = prev_columns
+		self._reply({"exit_code": code, "stdout": out, "stderr": err})
+
+	def _reply(self, payload: Dict) -> None:
+		self.wfile.write((json.dumps(payload) + "\n").encode("utf-8"))
+
+
+class DaemonServer(socketserver.UnixStreamServer):
+	# Requests run one at a time: commands chdir and redirect stdout process-wide
+	pass
+
+
+def serve(path: Optional[Path] = None, ready: Optional[threading.Event] = None) -> None:
+	"""Serve CLI requests on a Unix socket until a stop request arrives."""
+	global WARM
+	path = path or socket_path()
+	if path.exists():
+		if _send(path, {"control": "status"}) is not None:
+			raise RuntimeError(f"A daemon is already listening on {path}")
+		path.unlink()  # stale socket from a crashed daemon
+	WARM = WarmCache()
+	server = DaemonServer(str(path), _Handler)
+	os.chmod(path, 0o600)
+	try:
+		if ready is not None:
+			ready.set()
+		server.serve_forever()
+	finally:
+		server.server_close()
+		WARM = None
+		with contextlib.suppress(FileNotFoundError):
+			path.unlink()
+
+
+def _send(path: Path, request: Dict, timeout: Optional[float] = None) -> Optional[Dict]:
+	try:
+		with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+			sock.settimeout(timeout)
+			sock.connect(str(path))
+			sock.sendall((json.dumps(request) + "\n").encode("utf-8"))
+			with sock.makefile("rb") as f:
+				line = f.readline()
+	except OSError:
+		return None
+	return json.loads(line.decode("utf-8")) if line else None
+
+
+def send_control(command: str, path: Optional[Path] = None) -> Optional[Dict]:
+	return _send(path or socket_path(), {"control": command}, timeout=5.0)
+
+
+def try_forward(argv: List[str]) -> Optional[int]:
+	"""Run ``argv`` in a running daemon; None means "run it in-process instead"."""
+	if os.getenv("EV_PARLAY_NO_DAEMON") == "1" or not argv or argv[0] not in FORWARDED_COMMANDS:
+		return None
+	path = socket_path()
+	if not path.exists():
+		return None
+	columns = None
+	with contextlib.suppress(OSError):
+		columns = os.get_terminal_size().columns
+	reply = _send(path, {"argv": argv, "cwd": os.getcwd(), "columns": columns})
+	if reply is None:
+		return None
+	sys.stdout.write(reply.get("stdout", ""))
+	sys.stderr.write(reply.get("stderr", ""))
+	return int(reply.get("exit_code", 1))
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .config import AppConfig
+from .ev_math import attach_single_metrics, kelly_fraction, parlay_decimal, parlay_probability
+from .models import MoneylineOdds, ParlayTicket, TeamSelection
+from .odds_api import american_to_decimal, implied_prob_from_american, normalize_book_key
+from .team_mapping import normalize_team
+
+PriceKey = Tuple[str, str]  # (canonical team name, book key)
+
+
+@dataclass
+class PriceChange:
+	team: str
+	book: str
+	old: Optional[int]
+	new: Optional[int]
+
+
+@dataclass
+class DeltaResult:
+	changes: List[PriceChange]
+	changed_legs: List[str] = field(default_factory=list)
+	updated_tickets: List[int] = field(default_factory=list)
+	needs_rebuild: bool = False
+	reasons: List[str] = field(default_factory=list)
+
+
+def price_table(odds_payload: Dict | List, config: AppConfig) -> Dict[PriceKey, int]:
+	"""Flatten a payload to (team, book) -> american price for the configured market and books."""
+	allowed_books = {normalize_book_key(b) for b in (config.sportsbooks or [])}
+	table: Dict[PriceKey, int] = {}
+	for event in odds_payload:
+		for bk in event.get("bookmakers", []):
+			key = normalize_book_key(bk.get("key", ""))
+			if allowed_books and key not in allowed_books:
+				continue
+			for market in bk.get("markets", []):
+				if market.get("key") != config.market:
+					continue
+				for outcome in market.get("outcomes", []):
+					name = outcome.get("name")
+					if not name:
+						continue
+					try:
+						price = int(outcome.get("price"))
+					except Exception:
+						continue
+					table[(normalize_team(name) or name, key)] = price
+	return table
+
+
+def diff_prices(prev: Dict[PriceKey, int], cur: Dict[PriceKey, int]) -> List[PriceChange]:
+	changes: List[PriceChange] = []
+	for key, price in cur.items():
+		old = prev.get(key)
+		if old != price:
+			changes.append(PriceChange(team=key[0], book=key[1], old=old, new=price))
+	for key, old in prev.items():
+		if key not in cur:
+			changes.append(PriceChange(team=key[0], book=key[1], old=old, new=None))
+	return changes
+
+
+def diff_snapshots(prev_payload: Dict | List, cur_payload: Dict | List, config: AppConfig) -> List[PriceChange]:
+	"""Per-(team, book) price change events between two consecutive payloads."""
+	return diff_prices(price_table(prev_payload, config), price_table(cur_payload, config))
+
+
+def leg_ticket_index(tickets: Sequence[ParlayTicket]) -> Dict[str, List[int]]:
+	"""Reverse index: leg team abbreviation -> positions of the tickets containing it."""
+	index: Dict[str, List[int]] = {}
+	for i, t in enumerate(tickets):
+		for team in t.teams:
+			index.setdefault(team, []).append(i)
+	return index
+
+
+def _best_price(book_prices: Dict[str, int]) -> Optional[Tuple[str, int]]:
+	best: Optional[Tuple[str, int]] = None
+	for book, price in book_prices.items():
+		if best is None or price > best[1]:
+			best = (book, price)
+	return best
+
+
+class TicketReevaluator:
+	"""Apply price changes to an already-built slate, touching only affected tickets.
+
+	``tickets`` are the selected tickets; ``pool`` optionally holds the beam
+	finalists so a price move that lets an unselected combination overtake a
+	selected ticket is detected. ``needs_rebuild`` is set conservatively,
+	whenever the change could alter the candidate set or the selection:
+
+	- a leg loses all prices, or its edge crosses ``min_edge``
+	- a leg outside every selected ticket gets a better price
+	- a selected ticket's EV drops to the selection floor
+	- a pooled combination now beats the weakest selected ticket
+	"""
+
+	def __init__(
+		self,
+		legs: Iterable[TeamSelection],
+		tickets: List[ParlayTicket],
+		config: AppConfig,
+		odds_payload: Dict | List,
+		pool: Optional[Iterable[Sequence[TeamSelection]]] = None,
+	):
+		self.config = config
+		self.tickets = tickets
+		self.legs: Dict[str, TeamSelection] = {l.team_abbr: l for l in legs}
+		self._abbr_of_team = {l.team_name: l.team_abbr for l in self.legs.values()}
+		self.prices: Dict[PriceKey, int] = {}
+		self._by_team: Dict[str, Dict[str, int]] = {}
+		self._set_prices(price_table(odds_payload, config))
+		self.leg_to_tickets = leg_ticket_index(tickets)
+		selected = {frozenset(t.teams) for t in tickets}
+		self.pool: List[Tuple[str, ...]] = []
+		self.leg_to_pool: Dict[str, List[int]] = {}
+		for combo in pool or []:
+			teams = tuple(l.team_abbr for l in combo)
+			if frozenset(teams) in selected:
+				continue
+			for team in teams:
+				self.leg_to_pool.setdefault(team, []).append(len(self.pool))
+			self.pool.append(teams)
+
+	def _set_prices(self, table: Dict[PriceKey, int]) -> None:
+		for (team, book), price in table.items():
+			self.prices[(team, book)] = price
+			self._by_team.setdefault(team, {})[book] = price
+
+	def _combo_ev(self, teams: Sequence[str]) -> float:
+		legs = [self.legs[t] for t in teams]
+		if any(l.best_odds is None for l in legs):
+			return float("-inf")
+		P = parlay_probability([l.model_win_prob for l in legs], self.config.correlation_rho)
+		D = parlay_decimal([l.best_odds.decimal for l in legs])
+		return P * (D - 1.0) - (1.0 - P)
+
+	def ingest(self, odds_payload: Dict | List) -> DeltaResult:
+		"""Diff a new payload against the current prices and apply the changes."""
+		return self.apply(diff_prices(self.prices, price_table(odds_payload, self.config)))
+
+	def apply(self, changes: List[PriceChange]) -> DeltaResult:
+		result = DeltaResult(changes=changes)
+		touched_teams = set()
+		for ch in changes:
+			book_prices = self._by_team.setdefault(ch.team, {})
+			if ch.new is None:
+				self.prices.pop((ch.team, ch.book), None)
+				book_prices.pop(ch.book, None)
+			else:
+				self.prices[(ch.team, ch.book)] = ch.new
+				book_prices[ch.book] = ch.new
+			touched_teams.add(ch.team)
+
+		min_edge = self.config.min_edge or 0.0
+		affected_tickets = set()
+		affected_pool = set()
+		for team in touched_teams:
+			ab = self._abbr_of_team.get(team)
+			if ab is None:
+				continue  # not one of our legs
+			leg = self.legs[ab]
+			best = _best_price(self._by_team.get(team, {}))
+			old = leg.best_odds
+			if best is None:
+				result.changed_legs.append(ab)
+				result.needs_rebuild = True
+				result.reasons.append(f"{ab}: no prices left")
+				continue
+			book, price = best
+			if old is not None and old.american == price:
+				if old.book != book:
+					leg.best_odds = old.model_copy(update={"book": book})
+					affected_tickets.update(self.leg_to_tickets.get(ab, []))
+				continue
+			old_edge = leg.edge
+			leg.best_odds = MoneylineOdds(
+				book=book,
+				american=price,
+				decimal=american_to_decimal(price),
+				implied_prob=implied_prob_from_american(price),
+			)
+			attach_single_metrics(leg)
+			result.changed_legs.append(ab)
+			if old_edge is not None and (old_edge >= min_edge) != ((leg.edge or -1.0) >= min_edge):
+				result.needs_rebuild = True
+				result.reasons.append(f"{ab}: edge crossed min_edge")
+			in_tickets = self.leg_to_tickets.get(ab, [])
+			if not in_tickets and (old is None or leg.best_odds.decimal > old.decimal):
+				result.needs_rebuild = True
+				result.reasons.append(f"{ab}: unselected leg improved")
+			affected_tickets.update(in_tickets)
+			affected_pool.update(self.leg_to_pool.get(ab, []))
+
+		floor = max(0.0, self.config.min_parlay_ev or 0.0)
+		for i in sorted(affected_tickets):
+			t = self.tickets[i]
+			D = parlay_decimal([l.best_odds.decimal for l in t.legs if l.best_odds])
+			P = t.combined_probability
+			t.combined_decimal = D
+			t.expected_value = P * (D - 1.0) - (1.0 - P)
+			t.books = {l.team_abbr: (l.best_odds.book if l.best_odds else "") for l in t.legs}
+			if self.config.run_budget is None:
+				# Budgeted stakes are an allocation over the whole slate; only per-ticket Kelly is local
+				t.kelly_stake = round(self.config.bankroll * self.config.kelly_fraction * kelly_fraction(P, D), 2)
+			if t.expected_value <= floor:
+				result.needs_rebuild = True
+				result.reasons.append(f"ticket {','.join(t.teams)}: EV fell to {t.expected_value:.3f}")
+			result.updated_tickets.append(i)
+
+		if affected_pool and self.tickets:
+			weakest = min(t.expected_value for t in self.tickets)
+			for j in affected_pool:
+				ev = self._combo_ev(self.pool[j])
+				if ev > weakest:
+					result.needs_rebuild = True
+					result.reasons.append(f"pool combo {','.join(self.pool[j])} now beats a selected ticket")
+					break
+		return result
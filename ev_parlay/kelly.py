@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import math
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .models import ParlayTicket
+
+
+def leg_index(tickets: List[ParlayTicket]) -> Tuple[List[Tuple[str, str]], np.ndarray, np.ndarray]:
+	"""(leg keys, leg win probabilities, tickets x legs bool matrix) over the tickets' distinct legs.
+
+	Legs are keyed by (team abbr, game id). A ticket without legs (e.g. read
+	back from parlays.csv) becomes one pseudo-leg keyed by its teams, with its
+	combined probability, i.e. an independent bet.
+	"""
+	ids: Dict[Tuple[str, str], int] = {}
+	keys: List[Tuple[str, str]] = []
+	probs: List[float] = []
+	rows: List[List[int]] = []
+	for t in tickets:
+		row = []
+		if t.legs:
+			for leg in t.legs:
+				key = (leg.team_abbr, leg.game_id or "")
+				if key not in ids:
+					ids[key] = len(probs)
+					keys.append(key)
+					probs.append(leg.model_win_prob)
+				row.append(ids[key])
+		else:
+			row.append(len(probs))
+			keys.append((",".join(t.teams), f"_ticket{len(rows)}"))
+			probs.append(t.combined_probability)
+		rows.append(row)
+	membership = np.zeros((len(tickets), len(probs)), dtype=bool)
+	for i, row in enumerate(rows):
+		membership[i, row] = True
+	return keys, np.array(probs, dtype=np.float64), membership
+
+
+def leg_membership(tickets: List[ParlayTicket]) -> Tuple[np.ndarray, np.ndarray]:
+	"""(leg win probabilities, tickets x legs bool matrix); see ``leg_index``."""
+	_, probs, membership = leg_index(tickets)
+	return probs, membership
+
+
+def scenario_returns(
+	tickets: List[ParlayTicket],
+	max_exact_legs: int = 12,
+	samples: int = 20000,
+	seed: int = 42,
+) -> Tuple[np.ndarray, np.ndarray]:
+	"""(net return per $1 staked, scenarios x tickets; scenario weights summing to 1).
+
+	Legs win independently with their model probability. Up to ``max_exact_legs``
+	legs every outcome is enumerated with its exact probability; beyond that
+	``samples`` outcomes are drawn. Scenarios with the same ticket results are
+	merged, so the solver sees at most 2**tickets rows.
+	"""
+	probs, membership = leg_membership(tickets)
+	n_legs = probs.shape[0]
+	if n_legs <= max_exact_legs:
+		codes = np.arange(1 << n_legs, dtype=np.int64)
+		won = ((codes[:, None] >> np.arange(n_legs)) & 1).astype(bool)
+		weights = np.where(won, probs, 1.0 - probs).prod(axis=1)
+	else:
+		rng = np.random.default_rng(seed)
+		won = rng.random((samples, n_legs)) < probs
+		weights = np.full(samples, 1.0 / samples)
+	wins = ((~won).astype(np.float32) @ membership.T.astype(np.float32)) == 0
+	patterns, inverse = np.unique(wins, axis=0, return_inverse=True)
+	merged = np.bincount(inverse.reshape(-1), weights=weights, minlength=patterns.shape[0])
+	decimals = np.array([t.combined_decimal for t in tickets], dtype=np.float64)
+	returns = np.where(patterns, decimals - 1.0, -1.0)
+	keep = merged > 0
+	return returns[keep], merged[keep] / merged[keep].sum()
+
+
+def _project(y: np.ndarray, lo: np.ndarray, hi: np.ndarray, total: float) -> np.ndarray:
+	"""Euclidean projection onto {lo <= s <= hi, sum(s) <= total}."""
+	s = np.clip(y, lo, hi)
+	if s.sum() <= total:
+		return s
+	a, b = 0.0, float(np.max(y - lo))
+	for _ in range(60):  # sum(clip(y - t)) is monotone in t
+		t = 0.5 * (a + b)
+		if np.clip(y - t, lo, hi).sum() > total:
+			a = t
+		else:
+			b = t
+	return np.clip(y - b, lo, hi)
+
+
+def optimize_stakes(
+	returns: np.ndarray,
+	weights: np.ndarray,
+	wealth: float,
+	total: float,
+	lo: np.ndarray,
+	hi: np.ndarray,
+	max_iter: int = 500,
+	tol: float = 1e-7,
+) -> np.ndarray:
+	"""Maximize sum_k w_k log(wealth + returns_k . s) over lo <= s <= hi, sum(s) <= total.
+
+	Projected gradient ascent with backtracking; the objective is concave, so
+	this converges to the constrained optimum. ``total`` must stay below
+	``wealth`` when any scenario loses every ticket.
+	"""
+	s = _project(lo.copy(), lo, hi, total)
+
+	def value(x: np.ndarray) -> float:
+		w = wealth + returns @ x
+		return -math.inf if np.any(w <= 0) else float(weights @ np.log(w))
+
+	f = value(s)
+	step = total / max(1.0, wealth)
+	for _ in range(max_iter):
+		grad = returns.T @ (weights / (wealth + returns @ s))
+		while True:
+			cand = _project(s + step * grad, lo, hi, total)
+			delta = cand - s
+			f_cand = value(cand)
+			# Sufficient increase for a concave objective with step-size 1/L estimate
+			if f_cand >= f + grad @ delta - (delta @ delta) / (2.0 * step) or step < 1e-12:
+				break
+			step *= 0.5
+		if not math.isfinite(f_cand):
+			break
+		moved = float(np.abs(delta).max())
+		s, f = cand, f_cand
+		if moved <= tol * max(1.0, total):
+			break
+		step *= 2.0
+	return s
+
+
+def joint_kelly_stakes(
+	tickets: List[ParlayTicket],
+	bankroll: float,
+	budget: float,
+	max_stake: float,
+	min_stake: float = 0.0,
+	fraction: float = 1.0,
+	max_exact_legs: int = 12,
+	samples: int = 20000,
+	seed: int = 42,
+) -> np.ndarray:
+	"""Stakes maximizing expected log bankroll with the tickets bet simultaneously.
+
+	Tickets that share legs win and lose together, so correlated tickets get
+	less than their stand-alone Kelly stakes. Each stake lies in
+	[``min_stake``, ``max_stake``] and the stakes total at most ``budget`` (less
+	when growth-optimal). ``fraction`` scales the optimum (fractional Kelly),
+	then the bounds are reapplied.
+	"""
+	n = len(tickets)
+	if n == 0:
+		return np.zeros(0)
+	returns, weights = scenario_returns(tickets, max_exact_legs, samples, seed)
+	# Losing every ticket must leave something to take the log of
+	total = min(budget, 0.999 * bankroll)
+	lo = np.full(n, min(min_stake, total / n))
+	hi = np.full(n, max(float(lo[0]), min(max_stake, total)))
+	stakes = optimize_stakes(returns, weights, bankroll, total, lo, hi)
+	return np.clip(stakes * fraction, lo, hi)
+
+
+def fill_budget(weights: np.ndarray, budget: float, lo: float, hi: float) -> np.ndarray:
+	"""Stakes proportional to ``weights``, clipped to [lo, hi], scaled to total ``budget``.
+
+	The scale is found by bisection (the clipped total is monotone in it), so
+	capped tickets' leftovers land on the others in proportion to their weights.
+	When every ticket is capped the total stays below ``budget``; when the
+	minimums alone exceed it they are kept.
+	"""
+	w = np.asarray(weights, dtype=np.float64)
+	if w.max() <= 0:
+		w = np.ones_like(w)
+	w = np.maximum(w, 1e-9 * w.max())  # zero-weight tickets still absorb leftovers
+	if hi * w.shape[0] <= budget:
+		return np.full(w.shape, float(hi))
+	a, b = 0.0, hi / w.min()
+	for _ in range(100):
+		t = 0.5 * (a + b)
+		if np.clip(t * w, lo, hi).sum() < budget:
+			a = t
+		else:
+			b = t
+	return np.clip(b * w, lo, hi)
+
+
+def round_stakes(stakes: np.ndarray, budget: Optional[float], lo: float, hi: float) -> List[float]:
+	"""Stakes rounded to cents; the rounding remainder (<= 1 cent per ticket) goes to tickets with room."""
+	cents = np.round(np.asarray(stakes) * 100.0).astype(np.int64)
+	if budget is not None:
+		target = int(round(min(budget, float(np.asarray(stakes).sum())) * 100.0))
+		diff = target - int(cents.sum())
+		order = np.argsort(-np.asarray(stakes), kind="stable")
+		for i in order:
+			if diff == 0:
+				break
+			step = 1 if diff > 0 else -1
+			if lo * 100.0 <= cents[i] + step <= hi * 100.0:
+				cents[i] += step
+				diff -= step
+	return [c / 100.0 for c in cents.tolist()]
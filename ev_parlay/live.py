@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import csv
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .odds_api import american_to_decimal, implied_prob_from_american
+from .parser import parse_won, team_abbrs
+from .simulate import profit_stats, simulate_archive_samples
+from .ticket_archive import TicketArchive
+
+OPEN, LOST, WON = -1, 0, 1
+
+
+def load_updates(path: str | Path, known: Iterable[str] = ()) -> Tuple[Dict[str, bool], Dict[str, int], Dict[str, float]]:
+	"""(settled results, in-game American odds, win probabilities) keyed by team abbr.
+
+	CSV or JSON list of rows with ``team`` and any of ``won`` (1/0, W/L, ...;
+	anything else leaves the leg open), ``odds`` (American) or ``prob``.
+	Raises ValueError for team names that neither resolve nor are in ``known``.
+	"""
+	path = Path(path)
+	if path.suffix.lower() == ".json":
+		rows = json.loads(path.read_text(encoding="utf-8"))
+	else:
+		with path.open(newline="", encoding="utf-8") as fh:
+			rows = list(csv.DictReader(fh))
+	try:
+		abbrs = team_abbrs((row["team"] for row in rows), known)
+	except ValueError as e:
+		raise ValueError(f"{path}: {e}") from None
+	results: Dict[str, bool] = {}
+	odds: Dict[str, int] = {}
+	probs: Dict[str, float] = {}
+	for row in rows:
+		team_ab = abbrs[row["team"]]
+		won = parse_won(row.get("won", ""))
+		if won is not None:
+			results[team_ab] = won
+		if str(row.get("odds", "")).strip():
+			odds[team_ab] = int(float(row["odds"]))
+		if str(row.get("prob", "")).strip():
+			probs[team_ab] = float(row["prob"])
+	return results, odds, probs
+
+
+class LiveSlate:
+	"""Conditional ticket probabilities for a placed slate as legs settle.
+
+	Leg state lives in arrays (open/won/lost, current win probability and the
+	opponent's live decimal odds). ``update`` touches only the
+	tickets holding a changed leg, found through a leg -> tickets reverse
+	index, and returns how many it recomputed; it also keeps each ticket's
+	open and lost leg counts, so status and hedges never rescan the slate.
+	Legs are treated as independent.
+	"""
+
+	def __init__(self, archive: TicketArchive):
+		if not archive.has_legs:
+			raise ValueError("Live tracking needs tickets with legs (a tickets.npz archive)")
+		self.archive = archive
+		n_legs = archive.num_legs
+		self.abbr = [str(a) for a in archive.legs["team_abbr"]]
+		self.opponent = [str(a) for a in archive.legs["opponent_abbr"]]
+		self.legs_of: Dict[str, List[int]] = {}
+		for j, ab in enumerate(self.abbr):
+			self.legs_of.setdefault(ab, []).append(j)
+		member = np.asarray(archive.membership)
+		self.tickets_of = [np.flatnonzero(member[:, j]) for j in range(n_legs)]
+		self.order = np.asarray(archive.order)
+		self.stakes = np.asarray(archive.stakes, dtype=np.float64)
+		self.decimal = np.asarray(archive.tickets["combined_decimal"], dtype=np.float64)
+		self.state = np.full(n_legs, OPEN, dtype=np.int8)
+		self.open_legs = (self.order >= 0).sum(axis=1).astype(np.int16)
+		self.lost_legs = np.zeros(len(archive), dtype=np.int16)
+		self.leg_prob = np.array(archive.legs["model_win_prob"], dtype=np.float64)
+		self.opponent_decimal = np.full(n_legs, np.nan)
+		self.prob = np.empty(len(archive))
+		self.recomputed = 0
+		self._refresh(np.arange(len(archive)))
+
+	def current(self) -> np.ndarray:
+		"""Per-leg win probability given settled results."""
+		return np.where(self.state == OPEN, self.leg_prob, (self.state == WON).astype(np.float64))
+
+	def _refresh(self, tickets: np.ndarray) -> None:
+		order = self.order[tickets]
+		p = self.current()
+		self.prob[tickets] = np.where(order >= 0, p[np.maximum(order, 0)], 1.0).prod(axis=1)
+		self.recomputed += int(tickets.shape[0])
+
+	def update(
+		self,
+		results: Optional[Dict[str, bool]] = None,
+		odds: Optional[Dict[str, int]] = None,
+		probs: Optional[Dict[str, float]] = None,
+	) -> int:
+		"""Apply settled results and in-game prices; returns the number of tickets recomputed.
+
+		``odds`` are American prices. A leg whose opponent is also priced uses
+		the no-vig probability of the pair, otherwise the implied probability.
+		``probs`` set win probabilities directly. Teams not on any ticket are
+		ignored.
+		"""
+		changed: List[int] = []
+		for team, won in (results or {}).items():
+			for j in self.legs_of.get(team, []):
+				new = WON if won else LOST
+				if self.state[j] != new:
+					self._settle(j, new)
+					changed.append(j)
+		odds = odds or {}
+		for team, price in odds.items():
+			for j in self.legs_of.get(team, []):
+				implied = implied_prob_from_american(price)
+				other = odds.get(self.opponent[j])
+				if other is not None:
+					self.opponent_decimal[j] = american_to_decimal(other)
+					implied /= implied + implied_prob_from_american(other)
+				self._set_prob(j, implied, changed)
+		for team, p in (probs or {}).items():
+			for j in self.legs_of.get(team, []):
+				self._set_prob(j, p, changed)
+		if not changed:
+			return 0
+		touched = np.unique(np.concatenate([self.tickets_of[j] for j in changed]))
+		self._refresh(touched)
+		return int(touched.shape[0])
+
+	def _settle(self, j: int, new: int) -> None:
+		tickets = self.tickets_of[j]
+		old = self.state[j]
+		self.open_legs[tickets] += int(new == OPEN) - int(old == OPEN)
+		self.lost_legs[tickets] += int(new == LOST) - int(old == LOST)
+		self.state[j] = new
+
+	def _set_prob(self, j: int, p: float, changed: List[int]) -> None:
+		p = min(max(float(p), 0.0), 1.0)
+		if self.leg_prob[j] != p:
+			self.leg_prob[j] = p
+			if self.state[j] == OPEN:
+				changed.append(j)
+
+	def ticket_rows(self) -> List[Dict]:
+		"""Per ticket: status, conditional win probability and fair cash-out value."""
+		rows = []
+		for i in range(len(self.archive)):
+			status = "lost" if self.lost_legs[i] else ("won" if self.open_legs[i] == 0 else "open")
+			rows.append({
+				"ticket": i,
+				"teams": [self.abbr[j] for j in self.order[i] if j >= 0],
+				"status": status,
+				"open_legs": int(self.open_legs[i]),
+				"probability": float(self.prob[i]),
+				"stake": float(self.stakes[i]),
+				"payout": float(self.stakes[i] * self.decimal[i]),
+				"fair_value": float(self.prob[i] * self.stakes[i] * self.decimal[i]),
+			})
+		return rows
+
+	def profit(self, trials: int = 20000, seed: int = 42) -> Dict[str, float]:
+		"""Portfolio profit (stakes already placed) over the open legs' outcomes."""
+		expected = float((self.prob * self.stakes * self.decimal).sum() - self.stakes.sum())
+		samples = simulate_archive_samples(self.archive, trials=trials, random_seed=seed, leg_probs=self.current())
+		return {"expected": expected, **profit_stats(samples), "p_profit": float((samples > 0).mean())}
+
+	def hedges(self) -> List[Dict]:
+		"""Full hedges on the opponent of each leg that is the last open leg of live tickets.
+
+		Staking ``payout / opponent decimal`` on the opponent pays the same
+		whichever side wins, locking in ``locked_profit``. The opponent price is
+		the live one when given, else the fair price 1 / (1 - p). ``ev_cost`` is
+		the hedge's expected loss at the leg's current probability; scale the
+		stake down for a partial hedge.
+		"""
+		p = self.current()
+		live = np.flatnonzero((self.lost_legs == 0) & (self.open_legs == 1))
+		legs = self.order[live]
+		is_open = (legs >= 0) & (self.state[np.maximum(legs, 0)] == OPEN)
+		last: Dict[int, List[int]] = {}
+		for i, j in zip(live.tolist(), legs[np.arange(live.shape[0]), is_open.argmax(axis=1)].tolist()):
+			last.setdefault(j, []).append(i)
+		rows = []
+		for j, tickets in sorted(last.items()):
+			if p[j] >= 1.0:
+				continue
+			payout = float((self.stakes[tickets] * self.decimal[tickets]).sum())
+			staked = float(self.stakes[tickets].sum())
+			dec = self.opponent_decimal[j] if not np.isnan(self.opponent_decimal[j]) else 1.0 / (1.0 - p[j])
+			stake = payout / dec
+			rows.append({
+				"leg": self.abbr[j],
+				"hedge_on": self.opponent[j] or f"against {self.abbr[j]}",
+				"tickets": [int(i) for i in tickets],
+				"payout": payout,
+				"hedge_decimal": float(dec),
+				"hedge_stake": round(float(stake), 2),
+				"locked_profit": float(payout - stake - staked),
+				"ev_cost": float(stake * (1.0 - (1.0 - p[j]) * dec)),
+			})
+		return rows
+
+	def report(self, trials: int = 20000, seed: int = 42) -> Dict:
+		return {
+			"tickets": self.ticket_rows(),
+			"profit": self.profit(trials, seed),
+			"hedges": self.hedges(),
+			"settled": {self.abbr[j]: bool(self.state[j] == WON) for j in np.flatnonzero(self.state != OPEN)},
+			"recomputed": self.recomputed,
+		}
@@ -1,13 +1,26 @@
 from __future__ import annotations
 
+import importlib.util
 import logging
 import os
 
-try:
-	from rich.logging import RichHandler  # type: ignore
-	_USE_RICH = True
-except Exception:
-	_USE_RICH = False
+_USE_RICH = importlib.util.find_spec("rich") is not None
+
+
+class _LazyRichHandler(logging.Handler):
+	"""Defers importing rich until the first record is emitted (keeps CLI startup fast)."""
+
+	def __init__(self, level: int = logging.NOTSET):
+		super().__init__(level)
+		self._inner: logging.Handler | None = None
+
+	def emit(self, record: logging.LogRecord) -> None:
+		if self._inner is None:
+			from rich.logging import RichHandler  # type: ignore
+
+			self._inner = RichHandler(rich_tracebacks=True)
+			self._inner.setFormatter(self.formatter)
+		self._inner.handle(record)
 
 
 def get_logger(name: str = "ev_parlay", level: int = logging.INFO) -> logging.Logger:
@@ -17,7 +30,7 @@ def get_logger(name: str = "ev_parlay", level: int = logging.INFO) -> logging.Lo
 	logger.setLevel(level)
 	handler: logging.Handler
 	if _USE_RICH and os.getenv("NO_RICH") != "1":
-		handler = RichHandler(rich_tracebacks=True)
+		handler = _LazyRichHandler()
 	else:
 		handler = logging.StreamHandler()
 	formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
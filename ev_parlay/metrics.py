@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import bisect
+import math
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Off by default so library/CLI hot paths pay one global lookup per call site;
+# the API turns it on (EV_PARLAY_METRICS=0 keeps it off there too)
+ENABLED = os.getenv("EV_PARLAY_METRICS") == "1"
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 50000)
+RATE_BUCKETS = (1e4, 1e5, 5e5, 1e6, 5e6, 1e7, 5e7, 1e8)
+
+
+def enable(on: bool = True) -> None:
+	global ENABLED
+	ENABLED = on
+
+
+def _escape(value: str) -> str:
+	return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Tuple[str, ...], extra: str = "") -> str:
+	parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+	if extra:
+		parts.append(extra)
+	return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt(value: float) -> str:
+	if value == math.inf:
+		return "+Inf"
+	return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+	kind = "counter"
+
+	def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+		self.name = name
+		self.help = help
+		self.labelnames = tuple(labelnames)
+		self._values: Dict[Tuple[str, ...], float] = {}
+		self._lock = threading.Lock()
+
+	def inc(self, amount: float = 1.0, *labels: str) -> None:
+		if not ENABLED:
+			return
+		with self._lock:
+			self._values[labels] = self._values.get(labels, 0.0) + amount
+
+	def value(self, *labels: str) -> float:
+		return self._values.get(labels, 0.0)
+
+	def _merge(self, labels: Tuple[str, ...], value: float) -> None:
+		self._values[labels] = self._values.get(labels, 0.0) + value
+
+	def samples(self) -> List[str]:
+		return [f"{self.name}{_labels(self.labelnames, k)} {_fmt(v)}" for k, v in sorted(self._values.items())]
+
+
+class Histogram:
+	kind = "histogram"
+
+	def __init__(self, name: str, help: str, buckets: Sequence[float] = LATENCY_BUCKETS, labelnames: Sequence[str] = ()):
+		self.name = name
+		self.help = help
+		self.buckets = tuple(sorted(buckets))
+		self.labelnames = tuple(labelnames)
+		# labels -> (per-bucket counts incl. +Inf, sum, count)
+		self._values: Dict[Tuple[str, ...], Tuple[List[int], float, int]] = {}
+		self._lock = threading.Lock()
+
+	def observe(self, value: float, *labels: str) -> None:
+		if not ENABLED:
+			return
+		with self._lock:
+			counts, total, n = self._values.get(labels) or ([0] * (len(self.buckets) + 1), 0.0, 0)
+			counts[bisect.bisect_left(self.buckets, value)] += 1
+			self._values[labels] = (counts, total + value, n + 1)
+
+	def count(self, *labels: str) -> int:
+		entry = self._values.get(labels)
+		return entry[2] if entry else 0
+
+	def _merge(self, labels: Tuple[str, ...], value: Tuple[List[int], float, int]) -> None:
+		counts, total, n = self._values.get(labels) or ([0] * (len(self.buckets) + 1), 0.0, 0)
+		self._values[labels] = ([a + b for a, b in zip(counts, value[0])], total + value[1], n + value[2])
+
+	def samples(self) -> List[str]:
+		lines: List[str] = []
+		for key, (counts, total, n) in sorted(self._values.items()):
+			cumulative = 0
+			for bound, c in zip(self.buckets + (math.inf,), counts):
+				cumulative += c
+				le = 'le="' + _fmt(bound) + '"'
+				lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+			lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_fmt(total)}")
+			lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {n}")
+		return lines
+
+
+class Registry:
+	def __init__(self):
+		self._metrics: Dict[str, Counter | Histogram] = {}
+
+	def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+		return self._metrics.setdefault(name, Counter(name, help, labelnames))  # type: ignore[return-value]
+
+	def histogram(self, name: str, help: str, buckets: Sequence[float] = LATENCY_BUCKETS, labelnames: Sequence[str] = ()) -> Histogram:
+		return self._metrics.setdefault(name, Histogram(name, help, buckets, labelnames))  # type: ignore[return-value]
+
+	def get(self, name: str) -> Optional[Counter | Histogram]:
+		return self._metrics.get(name)
+
+	def reset(self) -> None:
+		for m in self._metrics.values():
+			with m._lock:
+				m._values.clear()
+
+	def export(self) -> Dict[str, Dict[Tuple[str, ...], object]]:
+		"""Picklable copy of every metric's values, for ``merge`` in another process."""
+		out: Dict[str, Dict[Tuple[str, ...], object]] = {}
+		for name, m in self._metrics.items():
+			with m._lock:
+				out[name] = {k: (list(v[0]), v[1], v[2]) if isinstance(v, tuple) else v for k, v in m._values.items()}
+		return out
+
+	def merge(self, data: Dict[str, Dict[Tuple[str, ...], object]]) -> None:
+		"""Add values exported from another registry (a job worker's) into this one."""
+		for name, values in data.items():
+			m = self._metrics.get(name)
+			if m is None:
+				continue
+			with m._lock:
+				for key, value in values.items():
+					m._merge(key, value)  # type: ignore[arg-type]
+
+	def render(self) -> str:
+		"""Prometheus text exposition format (version 0.0.4)."""
+		lines: List[str] = []
+		for m in self._metrics.values():
+			lines.append(f"# HELP {m.name} {m.help}")
+			lines.append(f"# TYPE {m.name} {m.kind}")
+			lines.extend(m.samples())
+		return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.histogram("ev_parlay_stage_seconds", "Slate pipeline stage wall time", labelnames=("stage",))
+STAGE_CACHED = REGISTRY.counter("ev_parlay_stage_cached_total", "Pipeline stages served from a slate session cache", ("stage",))
+BEAM_EVALUATED = REGISTRY.counter("ev_parlay_beam_candidates_evaluated_total", "Beam extensions scored", ("mode",))
+BEAM_PRUNED = REGISTRY.counter("ev_parlay_beam_candidates_pruned_total", "Beam extensions dropped (EV threshold or beam width)", ("mode",))
+ILP_VARIABLES = REGISTRY.histogram("ev_parlay_ilp_variables", "Binary variables per ticket-selection ILP", SIZE_BUCKETS)
+ILP_CONSTRAINTS = REGISTRY.histogram("ev_parlay_ilp_constraints", "Constraints per ticket-selection ILP", SIZE_BUCKETS)
+ILP_SOLVE_SECONDS = REGISTRY.histogram("ev_parlay_ilp_solve_seconds", "CBC solve wall time")
+SIM_TRIALS = REGISTRY.counter("ev_parlay_sim_trials_total", "Monte Carlo trials simulated")
+SIM_TRIALS_PER_SECOND = REGISTRY.histogram("ev_parlay_sim_trials_per_second", "Monte Carlo throughput (trials x tickets per second)", RATE_BUCKETS)
+ODDS_FETCHES = REGISTRY.counter("ev_parlay_odds_fetch_total", "Odds loads by outcome (cache_hit, fetched, error)", ("outcome",))
+JOBS = REGISTRY.counter("ev_parlay_jobs_total", "Pool jobs finished by kind and status (done, failed, cancelled)", ("kind", "status"))
+SLATE_CACHE = REGISTRY.counter("ev_parlay_slate_cache_total", "API slate session lookups by outcome (hit, miss)", ("outcome",))
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import csv
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .models import TeamSelection
+from .parser import iter_model_rows
+from .team_mapping import abbr, normalize_team
+
+WEEK_RE = re.compile(r"week[_-]?(\d+)", re.IGNORECASE)
+PROB_KEYS = ("prob", "probability", "win_prob", "model_win_prob", "p")
+TEAM_KEYS = ("team", "team_name", "name", "abbr", "team_abbr")
+
+
+@dataclass
+class ModelTable:
+	"""Columnar model picks: one row per (model, week, team)."""
+
+	team: np.ndarray  # canonical full name (object)
+	team_abbr: np.ndarray  # object
+	week: np.ndarray  # int32, -1 when unknown
+	model_id: np.ndarray  # object
+	prob: np.ndarray  # float64
+	margin: np.ndarray  # float64, NaN when missing
+
+	def __len__(self) -> int:
+		return int(self.prob.shape[0])
+
+	def _take(self, mask: np.ndarray) -> "ModelTable":
+		return ModelTable(*(getattr(self, f)[mask] for f in self.__dataclass_fields__))
+
+	def select(self, week: Optional[int] = None, model_id: Optional[str] = None) -> "ModelTable":
+		mask = np.ones(len(self), dtype=bool)
+		if week is not None:
+			mask &= self.week == week
+		if model_id is not None:
+			mask &= self.model_id == model_id
+		return self._take(mask)
+
+	@property
+	def model_ids(self) -> List[str]:
+		# Order of first appearance, so positional weights line up with inputs
+		seen: Dict[str, None] = {}
+		for m in self.model_id:
+			seen.setdefault(m, None)
+		return list(seen)
+
+
+def _split_stem(path: Path) -> tuple[str, Optional[int]]:
+	m = WEEK_RE.search(path.stem)
+	if not m:
+		return path.stem, None
+	model_id = (path.stem[: m.start()] + path.stem[m.end() :]).strip("_- ") or path.stem
+	return model_id, int(m.group(1))
+
+
+def _first(rec: Dict, keys) -> Optional[str]:
+	for k in keys:
+		v = rec.get(k)
+		if v not in (None, ""):
+			return v
+	return None
+
+
+def team_and_abbr(name: str) -> tuple[str, str]:
+	"""(canonical full name, abbreviation) for a model row's team; unknown names keep a made-up abbreviation."""
+	full = normalize_team(str(name)) or str(name)
+	return full, abbr(full) or str(name)[:3].upper()
+
+
+def load_models(paths: Iterable[str | Path], week: Optional[int] = None) -> ModelTable:
+	"""Parse many model files (.txt, .csv, .json) into one table in a single pass.
+
+	Model id and week come from the record when present (``model_id``,
+	``week``), else from the file name (``elo_week5.csv`` -> ``elo``, 5), else
+	``week``. CSV/JSON probabilities may be fractions or percentages.
+	"""
+	cols: Dict[str, List] = {"team": [], "team_abbr": [], "week": [], "model_id": [], "prob": [], "margin": []}
+
+	def add(team: str, team_ab: str, wk: Optional[int], mid: str, prob: float, margin: Optional[float]) -> None:
+		cols["team"].append(team)
+		cols["team_abbr"].append(team_ab)
+		cols["week"].append(-1 if wk is None else int(wk))
+		cols["model_id"].append(mid)
+		cols["prob"].append(prob / 100.0 if prob > 1.0 else prob)
+		cols["margin"].append(np.nan if margin is None else float(margin))
+
+	for raw_path in paths:
+		path = Path(raw_path)
+		file_model, file_week = _split_stem(path)
+		file_week = file_week if file_week is not None else week
+		suffix = path.suffix.lower()
+		if suffix in (".csv", ".json"):
+			if suffix == ".csv":
+				with open(path, newline="", encoding="utf-8") as f:
+					records: List[Dict] = list(csv.DictReader(f))
+			else:
+				data = json.loads(path.read_text(encoding="utf-8"))
+				if isinstance(data, dict):
+					# {"model_id": ..., "week": ..., "picks": [...]}
+					file_model = data.get("model_id", file_model)
+					file_week = data.get("week", file_week)
+					records = data.get("picks", [])
+				else:
+					records = data
+			for rec in records:
+				name = _first(rec, TEAM_KEYS)
+				prob = _first(rec, PROB_KEYS)
+				if name is None or prob is None:
+					continue
+				team, team_ab = team_and_abbr(name)
+				margin = rec.get("margin")
+				add(
+					team,
+					team_ab,
+					rec.get("week") or file_week,
+					rec.get("model_id") or file_model,
+					float(prob),
+					float(margin) if margin not in (None, "") else None,
+				)
+		else:
+			for team, team_ab, prob, margin in iter_model_rows(path.read_text(encoding="utf-8")):
+				add(team, team_ab, file_week, file_model, prob, margin)
+
+	return ModelTable(
+		team=np.array(cols["team"], dtype=object),
+		team_abbr=np.array(cols["team_abbr"], dtype=object),
+		week=np.array(cols["week"], dtype=np.int32),
+		model_id=np.array(cols["model_id"], dtype=object),
+		prob=np.array(cols["prob"], dtype=np.float64),
+		margin=np.array(cols["margin"], dtype=np.float64),
+	)
+
+
+def blend(table: ModelTable, weights: Optional[Dict[str, float]] = None, week: Optional[int] = None) -> List[TeamSelection]:
+	"""Weighted average of model probabilities (and margins) per team.
+
+	Weights default to equal and are renormalized per team over the models
+	that actually rate it. Pass ``week`` when the table spans several weeks.
+	"""
+	if week is not None:
+		table = table.select(week=week)
+	elif len(set(table.week.tolist())) > 1:
+		raise ValueError("Model table spans several weeks; pass week= to blend one slate")
+	if len(table) == 0:
+		return []
+	weights = weights or {}
+	w = np.array([float(weights.get(m, 1.0 if not weights else 0.0)) for m in table.model_id], dtype=np.float64)
+	teams, inverse = np.unique(table.team, return_inverse=True)
+	n = teams.shape[0]
+	w_sum = np.bincount(inverse, weights=w, minlength=n)
+	p_sum = np.bincount(inverse, weights=w * table.prob, minlength=n)
+	has_margin = ~np.isnan(table.margin)
+	wm = np.where(has_margin, w, 0.0)
+	m_w = np.bincount(inverse, weights=wm, minlength=n)
+	m_sum = np.bincount(inverse, weights=wm * np.nan_to_num(table.margin), minlength=n)
+
+	first_row = np.full(n, len(table))
+	np.minimum.at(first_row, inverse, np.arange(len(table)))
+	selections: List[TeamSelection] = []
+	for i in np.argsort(first_row):
+		if w_sum[i] <= 0:
+			continue
+		selections.append(
+			TeamSelection(
+				team_name=str(teams[i]),
+				team_abbr=str(table.team_abbr[first_row[i]]),
+				model_win_prob=float(p_sum[i] / w_sum[i]),
+				margin=float(m_sum[i] / m_w[i]) if m_w[i] > 0 else None,
+			)
+		)
+	return selections
+
+
+def parse_weights(spec: Optional[str], model_ids: List[str]) -> Optional[Dict[str, float]]:
+	"""``"elo=0.6,sim=0.4"`` or positional ``"0.6,0.4"`` (in model order) -> weights."""
+	if not spec:
+		return None
+	weights: Dict[str, float] = {}
+	parts = [p.strip() for p in spec.split(",") if p.strip()]
+	for i, part in enumerate(parts):
+		if "=" in part:
+			key, value = part.split("=", 1)
+			weights[key.strip()] = float(value)
+		elif i < len(model_ids):
+			weights[model_ids[i]] = float(part)
+	return weights
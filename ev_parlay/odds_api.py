@@ -2,11 +2,11 @@ from __future__ import annotations
 
 import json
 import time
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
-import requests
-
+from . import metrics
 from .config import AppConfig
 from .logging_utils import get_logger
 from .models import MoneylineOdds
@@ -52,19 +52,79 @@ def implied_prob_from_american(american: int) -> float:
 		return a / (a + 100.0)
 
 
+@dataclass
+class QuotaStatus:
+	"""Request quota as reported by The Odds API response headers."""
+
+	remaining: Optional[int] = None
+	used: Optional[int] = None
+	last_cost: Optional[int] = None
+
+	@staticmethod
+	def from_headers(headers) -> "QuotaStatus":
+		def _int(name: str) -> Optional[int]:
+			value = headers.get(name)
+			try:
+				return int(float(value)) if value is not None else None
+			except ValueError:
+				return None
+
+		return QuotaStatus(
+			remaining=_int("x-requests-remaining"),
+			used=_int("x-requests-used"),
+			last_cost=_int("x-requests-last"),
+		)
+
+
+# Quota reported by the most recent live request (None until one is made)
+LAST_QUOTA: Optional[QuotaStatus] = None
+
+
+def fresh_until_path(cache_file: Path) -> Path:
+	"""Sidecar where a running poller records when the cache is next refreshed."""
+	return cache_file.with_name(cache_file.name + ".fresh")
+
+
 def _cache_valid(path: Path, ttl_seconds: int) -> bool:
+	"""Fresh within ``ttl_seconds`` of its last write, or until a poller's next scheduled poll."""
 	if not path.exists():
 		return False
-	age = time.time() - path.stat().st_mtime
-	return age <= ttl_seconds
+	now = time.time()
+	if now - path.stat().st_mtime <= ttl_seconds:
+		return True
+	try:
+		return now <= float(fresh_until_path(path).read_text(encoding="utf-8"))
+	except (OSError, ValueError):
+		return False
 
 
-def fetch_odds(config: AppConfig, cache_override: Optional[str] = None) -> Dict:
-	cache_file = Path(cache_override or config.cache_file)
-	if _cache_valid(cache_file, config.ttl_seconds):
-		logger.info("Using cached odds from %s", cache_file)
-		return json.loads(cache_file.read_text(encoding="utf-8"))
+def _read_events(fp, index: Optional[OddsIndex]) -> List[Dict]:
+	"""Events decoded one at a time from a payload stream, each also added to ``index``."""
+	from .odds_stream import iter_events
+
+	events: List[Dict] = []
+	for ev in iter_events(fp):
+		if index is not None:
+			index.add_event(ev)
+		events.append(ev)
+	return events
 
+
+def request_odds(
+	config: AppConfig,
+	commence_from_iso: Optional[str] = None,
+	index: Optional[OddsIndex] = None,
+) -> Tuple[List[Dict], QuotaStatus]:
+	"""Make one live Odds API request; returns the payload and the reported quota.
+
+	The response body is decoded event by event as it arrives (never held as
+	one string); pass ``index`` to build the OddsIndex in the same pass.
+	"""
+	import io
+
+	import requests
+
+	global LAST_QUOTA
 	params = {
 		"apiKey": config.odds_api_key,
 		"regions": config.region,
@@ -74,22 +134,86 @@ def fetch_odds(config: AppConfig, cache_override: Optional[str] = None) -> Dict:
 	if config.date:
 		params["dateFormat"] = "iso"
 		params["date"] = config.date
-	if config.commence_from_iso:
-		params["commenceTimeFrom"] = config.commence_from_iso
+	commence_from_iso = commence_from_iso or config.commence_from_iso
+	if commence_from_iso:
+		params["commenceTimeFrom"] = commence_from_iso
 	if config.commence_to_iso:
 		params["commenceTimeTo"] = config.commence_to_iso
 	if not config.odds_api_key:
+		metrics.ODDS_FETCHES.inc(1, "error")
 		raise RuntimeError("ODDS_API_KEY is not set. Set env var or config.")
 
 	logger.info("Fetching odds from The Odds API ...")
-	resp = requests.get(ODDS_API_BASE, params=params, timeout=20)
-	resp.raise_for_status()
-	data = resp.json()
+	try:
+		resp = requests.get(config.odds_api_base or ODDS_API_BASE, params=params, timeout=20, stream=True)
+		resp.raise_for_status()
+		with resp:
+			resp.raw.decode_content = True  # undo gzip while streaming
+			data = _read_events(io.TextIOWrapper(resp.raw, encoding=resp.encoding or "utf-8"), index)
+	except Exception:
+		metrics.ODDS_FETCHES.inc(1, "error")
+		raise
+	metrics.ODDS_FETCHES.inc(1, "fetched")
+	LAST_QUOTA = QuotaStatus.from_headers(resp.headers)
+	if LAST_QUOTA.remaining is not None:
+		logger.info("Odds API quota: %s requests remaining", LAST_QUOTA.remaining)
+	return data, LAST_QUOTA
+
+
+def fetch_odds(config: AppConfig, cache_override: Optional[str] = None, index: Optional[OddsIndex] = None) -> Dict:
+	"""Payload from the cache file while fresh, else a live request (then cached).
+
+	Either way the events are streamed; pass ``index`` to fill an OddsIndex
+	in the same pass instead of re-walking the payload.
+	"""
+	cache_file = Path(cache_override or config.cache_file)
+	if _cache_valid(cache_file, config.ttl_seconds):
+		logger.info("Using cached odds from %s", cache_file)
+		metrics.ODDS_FETCHES.inc(1, "cache_hit")
+		with cache_file.open("r", encoding="utf-8") as fh:
+			return _read_events(fh, index)
+
+	data, _ = request_odds(config, index=index)
 	cache_file.write_text(json.dumps(data), encoding="utf-8")
 	logger.info("Saved odds cache to %s", cache_file)
 	return data
 
 
+def _event_pair(ev: Dict) -> Optional[Tuple[str, str, str]]:
+	"""(game_id, team_abbr, opponent_abbr) for an event, or None if it can't be resolved."""
+	game_id = ev.get("id") or ev.get("event_id") or ""
+	home = ev.get("home_team") or ev.get("homeTeam")
+	away = ev.get("away_team") or ev.get("awayTeam")
+	pair_abbrs: List[str] = []
+	if home and away:
+		for t in (home, away):
+			norm = normalize_team(t) or t
+			ab = abbr(norm)
+			if ab:
+				pair_abbrs.append(ab)
+	else:
+		# Fallback: collect from outcomes
+		teams: List[str] = []
+		for bk in ev.get("bookmakers", []):
+			for market in bk.get("markets", []):
+				if market.get("key") != "h2h":
+					continue
+				for oc in market.get("outcomes", []):
+					name = oc.get("name")
+					if name:
+						teams.append(name)
+		abbrs = []
+		for t in set(teams):
+			norm = normalize_team(t) or t
+			ab = abbr(norm)
+			if ab:
+				abbrs.append(ab)
+		pair_abbrs = abbrs
+	if len(pair_abbrs) != 2:
+		return None
+	return game_id, pair_abbrs[0], pair_abbrs[1]
+
+
 def build_game_index(odds_payload: Dict | List) -> Dict[str, Tuple[str, str]]:
 	"""
 	Return mapping: team_abbr -> (game_id, opponent_abbr)
@@ -97,36 +221,9 @@ def build_game_index(odds_payload: Dict | List) -> Dict[str, Tuple[str, str]]:
 	"""
 	index: Dict[str, Tuple[str, str]] = {}
 	for ev in odds_payload:
-		game_id = ev.get("id") or ev.get("event_id") or ""
-		home = ev.get("home_team") or ev.get("homeTeam")
-		away = ev.get("away_team") or ev.get("awayTeam")
-		pair_abbrs: List[str] = []
-		if home and away:
-			for t in (home, away):
-				norm = normalize_team(t) or t
-				ab = abbr(norm)
-				if ab:
-					pair_abbrs.append(ab)
-		else:
-			# Fallback: collect from outcomes
-			teams: List[str] = []
-			for bk in ev.get("bookmakers", []):
-				for market in bk.get("markets", []):
-					if market.get("key") != "h2h":
-						continue
-					for oc in market.get("outcomes", []):
-						name = oc.get("name")
-						if name:
-							teams.append(name)
-			abbrs = []
-			for t in set(teams):
-				norm = normalize_team(t) or t
-				ab = abbr(norm)
-				if ab:
-					abbrs.append(ab)
-			pair_abbrs = abbrs
-		if len(pair_abbrs) == 2:
-			a, b = pair_abbrs
+		pair = _event_pair(ev)
+		if pair:
+			game_id, a, b = pair
 			index[a] = (game_id, b)
 			index[b] = (game_id, a)
 	return index
@@ -170,3 +267,69 @@ def get_best_moneyline(team_full_name: str, config: AppConfig, odds_payload: Dic
 		decimal=american_to_decimal(price),
 		implied_prob=implied_prob_from_american(price),
 	)
+
+
+def _to_moneyline(book: str, price: int) -> MoneylineOdds:
+	return MoneylineOdds(
+		book=book,
+		american=price,
+		decimal=american_to_decimal(price),
+		implied_prob=implied_prob_from_american(price),
+	)
+
+
+class OddsIndex:
+	"""Game index and best price per team, built in one pass over the events.
+
+	Equivalent to ``build_game_index`` plus ``get_best_moneyline`` for every
+	team, but each event is visited once and lookups are dict hits. Events can
+	be fed one at a time (see ``odds_stream``) so the full payload never has to
+	be held in memory.
+	"""
+
+	def __init__(self, config: AppConfig):
+		self.market = config.market
+		self.allowed_books = {normalize_book_key(b) for b in (config.sportsbooks or [])}
+		self.game_index: Dict[str, Tuple[str, str]] = {}
+		self.best: Dict[str, Tuple[str, int]] = {}
+		self.num_events = 0
+
+	@classmethod
+	def from_payload(cls, odds_payload: Dict | List, config: AppConfig) -> "OddsIndex":
+		index = cls(config)
+		for ev in odds_payload:
+			index.add_event(ev)
+		return index
+
+	def add_event(self, ev: Dict) -> None:
+		self.num_events += 1
+		pair = _event_pair(ev)
+		if pair:
+			game_id, a, b = pair
+			self.game_index[a] = (game_id, b)
+			self.game_index[b] = (game_id, a)
+		for bk in ev.get("bookmakers", []):
+			key = normalize_book_key(bk.get("key", ""))
+			if self.allowed_books and key not in self.allowed_books:
+				continue
+			for market in bk.get("markets", []):
+				if market.get("key") != self.market:
+					continue
+				for outcome in market.get("outcomes", []):
+					name = outcome.get("name")
+					if not name:
+						continue
+					try:
+						price = int(outcome.get("price"))
+					except Exception:
+						continue
+					team = normalize_team(name) or name
+					cur = self.best.get(team)
+					if cur is None or price > cur[1]:
+						self.best[team] = (key, price)
+
+	def best_moneyline(self, team_full_name: str) -> Optional[MoneylineOdds]:
+		best = self.best.get(normalize_team(team_full_name) or team_full_name)
+		if best is None:
+			return None
+		return _to_moneyline(*best)
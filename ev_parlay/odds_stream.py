@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import IO, Dict, Iterator, List, Optional, Set, Tuple
+
+from .config import AppConfig
+from .odds_api import OddsIndex, normalize_book_key
+
+_DECODER = json.JSONDecoder()
+_WS = " \t\r\n"
+
+
+def iter_events(fp: IO[str], chunk_size: int = 1 << 16) -> Iterator[Dict]:
+	"""Yield the objects of a top-level JSON array one at a time.
+
+	Only the current chunk and the event being decoded are buffered, so peak
+	memory is bounded by the largest single event rather than the payload.
+	"""
+	buf = ""
+	pos = 0
+	eof = False
+
+	def fill() -> bool:
+		nonlocal buf, pos, eof
+		chunk = fp.read(chunk_size)
+		if not chunk:
+			eof = True
+			return False
+		buf = buf[pos:] + chunk
+		pos = 0
+		return True
+
+	# Opening bracket
+	while True:
+		while pos < len(buf) and buf[pos] in _WS:
+			pos += 1
+		if pos < len(buf):
+			break
+		if not fill():
+			return
+	if buf[pos] != "[":
+		raise ValueError("Expected a JSON array of events")
+	pos += 1
+
+	while True:
+		# Skip separators up to the next value or the closing bracket
+		while True:
+			while pos < len(buf) and (buf[pos] in _WS or buf[pos] == ","):
+				pos += 1
+			if pos < len(buf):
+				break
+			if not fill():
+				raise ValueError("Unexpected end of odds payload")
+		if buf[pos] == "]":
+			return
+		while True:
+			try:
+				obj, end = _DECODER.raw_decode(buf, pos)
+				break
+			except json.JSONDecodeError:
+				# Most likely a truncated event; retry with more data
+				if eof or not fill():
+					raise
+		pos = end
+		yield obj
+
+
+def filter_event(ev: Dict, markets: Set[str], books: Set[str]) -> Dict:
+	"""Drop bookmakers and markets we never look at (empty ``books`` keeps every book)."""
+	kept = []
+	for bk in ev.get("bookmakers", []):
+		key = normalize_book_key(bk.get("key", ""))
+		if books and key not in books:
+			continue
+		mkts = [m for m in bk.get("markets", []) if m.get("key") in markets]
+		if mkts:
+			kept.append({"key": key, "markets": mkts})
+	ev["bookmakers"] = kept
+	return ev
+
+
+def stream_odds(fp: IO[str], config: AppConfig, index: Optional[OddsIndex] = None) -> Tuple[List[Dict], OddsIndex]:
+	"""Stream a payload, keeping only the configured market/books and feeding an ``OddsIndex``."""
+	index = index or OddsIndex(config)
+	books = {normalize_book_key(b) for b in (config.sportsbooks or [])}
+	markets = {config.market, "h2h"}  # h2h also backs the game-index fallback
+	events: List[Dict] = []
+	for ev in iter_events(fp):
+		ev = filter_event(ev, markets, books)
+		index.add_event(ev)
+		events.append(ev)
+	return events, index
+
+
+def load_odds_file(path: str | Path, config: AppConfig) -> Tuple[List[Dict], OddsIndex]:
+	with open(path, "r", encoding="utf-8") as f:
+		return stream_odds(f, config)
@@ -2,53 +2,23 @@ from __future__ import annotations
 
 import re
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
-from .team_mapping import normalize_team, abbr
+from .team_mapping import normalize_team, abbr, resolve_team
 from .models import TeamSelection
 
 LINE_RE = re.compile(r"^:?(?P<team_name>[^:]+):\s+(?P<abbr>[A-Z]{2,3})\s+[–-]\s+(?P<prob>[0-9]+\.?[0-9]*)%\s*(\|\s*Margin:\s*(?P<margin>-?[0-9]+\.?[0-9]*))?", re.IGNORECASE)
 
 
-def parse_model_file(path: str | Path) -> List[TeamSelection]:
-	selections: List[TeamSelection] = []
-	for raw in Path(path).read_text(encoding="utf-8").splitlines():
-		line = raw.strip()
-		if not line:
-			continue
-		m = LINE_RE.match(line)
-		if not m:
-			continue
-		name = m.group("team_name").strip()
-		abbr_str = m.group("abbr").strip().upper()
-		prob = float(m.group("prob")) / 100.0
-		margin_str = m.group("margin")
-		margin = float(margin_str) if margin_str else None
-		team_full = normalize_team(abbr_str) or normalize_team(name) or name
-		team_abbr = abbr(team_full) or abbr_str
-		selections.append(
-			TeamSelection(
-				team_name=team_full,
-				team_abbr=team_abbr,
-				model_win_prob=prob,
-				margin=margin,
-			)
-		)
-	return selections
+ModelRow = Tuple[str, str, float, Optional[float]]  # (team full name, abbr, probability, margin)
 
 
-def parse_model_text(text: str) -> List[TeamSelection]:
-	"""Parse selections from raw text, one selection per line.
-
-	Accepts lines like:
-	  ":Vikings: MIN – 60.1% | Margin: 4.2"
-	  "Vikings: MIN - 60.1%"
-	  "MIN 60.1%"
-	  "Minnesota Vikings 60.1% margin 4.2"
+def iter_model_rows(text: str, loose: bool = True) -> Iterator[ModelRow]:
+	"""Yield one (team, abbr, prob, margin) row per recognised line of model text.
 
-	Abbreviation is optional; when present it improves mapping.
+	Strict ``:Team: ABR – 61.8% | Margin: 5.1`` lines always match; with
+	``loose`` also lines like "MIN 60.1%" or "Minnesota Vikings 60.1%".
 	"""
-	selections: List[TeamSelection] = []
 	for raw in text.splitlines():
 		line = raw.strip()
 		if not line:
@@ -62,7 +32,9 @@ def parse_model_text(text: str) -> List[TeamSelection]:
 			margin = float(margin_str) if margin_str else None
 			team_full = normalize_team(abbr_str) or normalize_team(name) or name
 			team_abbr = abbr(team_full) or abbr_str
-			selections.append(TeamSelection(team_name=team_full, team_abbr=team_abbr, model_win_prob=prob, margin=margin))
+			yield team_full, team_abbr, prob, margin
+			continue
+		if not loose:
 			continue
 		# Loose fallback: extract tokens and a trailing percent
 		percent_match = re.search(r"([0-9]+\.?[0-9]*)%", line)
@@ -76,5 +48,61 @@ def parse_model_text(text: str) -> List[TeamSelection]:
 		name_tokens = line_wo_pct
 		team_full = normalize_team(abbr_str) or normalize_team(name_tokens) or name_tokens
 		team_abbr = abbr(team_full) or (abbr_str if abbr_str else abbr(team_full) or team_full[:3].upper())
-		selections.append(TeamSelection(team_name=team_full, team_abbr=team_abbr, model_win_prob=prob, margin=None))
-	return selections
+		yield team_full, team_abbr, prob, None
+
+
+def parse_model_file(path: str | Path) -> List[TeamSelection]:
+	return [
+		TeamSelection(team_name=team, team_abbr=ab, model_win_prob=prob, margin=margin)
+		for team, ab, prob, margin in iter_model_rows(Path(path).read_text(encoding="utf-8"), loose=False)
+	]
+
+
+def parse_model_text(text: str) -> List[TeamSelection]:
+	"""Parse selections from raw text, one selection per line.
+
+	Accepts lines like:
+	  ":Vikings: MIN – 60.1% | Margin: 4.2"
+	  "Vikings: MIN - 60.1%"
+	  "MIN 60.1%"
+	  "Minnesota Vikings 60.1% margin 4.2"
+
+	Abbreviation is optional; when present it improves mapping.
+	"""
+	return [
+		TeamSelection(team_name=team, team_abbr=ab, model_win_prob=prob, margin=margin)
+		for team, ab, prob, margin in iter_model_rows(text)
+	]
+
+
+def parse_won(value) -> Optional[bool]:
+	"""True/False for a win/loss cell (1/0, W/L, win/loss, true/false), None otherwise."""
+	text = str(value).strip().lower()
+	if text in ("1", "w", "win", "won", "true", "yes"):
+		return True
+	if text in ("0", "l", "loss", "lost", "false", "no"):
+		return False
+	return None  # push / void / unknown
+
+
+def team_abbrs(names: Iterable[str], known: Iterable[str] = ()) -> Dict[str, str]:
+	"""Abbreviation per team name, nickname or abbreviation; ValueError naming any that do not resolve.
+
+	Names in ``known`` (abbreviations already on the tickets) are kept as they are.
+	"""
+	known = set(known)
+	out: Dict[str, str] = {}
+	unknown: List[str] = []
+	for name in names:
+		if name in known:
+			out[name] = name
+			continue
+		full = resolve_team(str(name))
+		ab = abbr(full) if full else None
+		if ab is None:
+			unknown.append(str(name))
+		else:
+			out[name] = ab
+	if unknown:
+		raise ValueError(f"Unknown team(s): {', '.join(sorted(set(unknown)))}")
+	return out
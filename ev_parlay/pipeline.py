@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import metrics
+from .builder import greedy_beam_build, ilp_select_with_derivation
+from .config import AppConfig
+from .ev_math import attach_single_metrics
+from .kelly import fill_budget, joint_kelly_stakes, round_stakes
+from .models import ParlayTicket, TeamSelection
+from .odds_api import OddsIndex
+from .team_mapping import abbr, normalize_team
+
+STAGES = ("parse", "index", "validate", "price", "build", "select", "stake")
+# config.stake_method values understood by allocate_stakes
+STAKE_METHODS = ("kelly_norm", "equal", "ev_sqrt", "kelly_joint")
+# Config fields the build stage depends on; runs agreeing on them get the same finalists
+BEAM_FIELDS = ("beam_width", "candidate_pool_size", "large_slate", "legs_per_game", "expansion_per_combo", "min_edge", "min_parlay_ev", "correlation_rho")
+
+
+@dataclass
+class StageStat:
+	name: str
+	seconds: float = 0.0
+	items: int = 0
+	cached: bool = False
+
+	def to_dict(self) -> Dict:
+		return {"stage": self.name, "ms": round(self.seconds * 1000.0, 3), "items": self.items, "cached": self.cached}
+
+
+class SlateError(ValueError):
+	"""Model picks that are not on the odds slate, as (team name, abbreviation) pairs."""
+
+	def __init__(self, missing: List[Tuple[str, str]]):
+		self.missing = missing
+		super().__init__(
+			"Some teams in the model are not in the current slate: "
+			+ ", ".join(sorted({ab for _, ab in missing}))
+		)
+
+
+def allocate_stakes(tickets: List[ParlayTicket], config: AppConfig) -> List[ParlayTicket]:
+	"""Split ``config.run_budget`` over the first tickets by ``stake_method``.
+
+	``kelly_norm``, ``ev_sqrt`` and ``equal`` spread the budget in proportion to
+	a per-ticket weight; ``kelly_joint`` maximizes expected log bankroll over
+	leg-outcome scenarios, so tickets sharing legs are staked together (and the
+	budget is not spent when that is not growth-optimal). Stakes respect
+	``max_stake_pct`` and ``min_stake``. Returns the selected tickets when
+	``desired_num_tickets`` is set, else all tickets.
+	"""
+	if config.run_budget is None or not tickets:
+		return tickets
+	budget = config.run_budget
+	n = config.desired_num_tickets or min(config.max_tickets, len(tickets))
+	selected = tickets[:n]
+	max_cap = config.max_stake_pct * budget if config.max_stake_pct else budget
+	if config.stake_method == "kelly_joint":
+		raw = joint_kelly_stakes(
+			selected,
+			bankroll=config.bankroll,
+			budget=budget,
+			max_stake=max_cap,
+			min_stake=config.min_stake,
+			fraction=config.kelly_fraction,
+			max_exact_legs=config.kelly_exact_legs,
+			samples=config.kelly_scenarios,
+		)
+		stakes = round_stakes(raw, budget, config.min_stake, max_cap)
+	else:
+		if config.stake_method == "equal":
+			weights = [1.0] * len(selected)
+		elif config.stake_method == "ev_sqrt":
+			weights = [max(0.0, (t.expected_value + 1e-9)) ** 0.5 for t in selected]
+		else:  # kelly_norm default
+			weights = [max(0.0, t.kelly_stake) for t in selected]
+		raw = fill_budget(np.array(weights), budget, config.min_stake, max_cap)
+		stakes = round_stakes(raw, budget, config.min_stake, max_cap)
+	for t, stake in zip(selected, stakes):
+		t.flat_stake = stake
+		t.kelly_stake = stake
+	if config.desired_num_tickets is not None:
+		return selected
+	return tickets
+
+
+class SlatePipeline:
+	"""Slate preparation and ticket building as explicit, timed stages.
+
+	parse -> index -> validate -> price -> build -> select -> stake. Each stage
+	is a method; ``stats`` records wall time and output size per stage (later
+	runs of a stage add to its entry). Callers that cache a stage's output can
+	``record`` it as cached instead of running it.
+	"""
+
+	def __init__(self, config: AppConfig):
+		self.config = config
+		self.stats: Dict[str, StageStat] = {}
+		self.missing_odds: List[str] = []
+		self.conflicts: List[Tuple[str, str]] = []
+
+	@contextmanager
+	def _stage(self, name: str) -> Iterator[StageStat]:
+		stat = StageStat(name)
+		start = time.perf_counter()
+		try:
+			yield stat
+		finally:
+			stat.seconds = time.perf_counter() - start
+			self.record(name, stat.seconds, stat.items)
+
+	def record(self, name: str, seconds: float = 0.0, items: int = 0, cached: bool = False) -> None:
+		if metrics.ENABLED:
+			if cached:
+				metrics.STAGE_CACHED.inc(1, name)
+			else:
+				metrics.STAGE_SECONDS.observe(seconds, name)
+		prev = self.stats.get(name)
+		if prev is None:
+			self.stats[name] = StageStat(name, seconds, items, cached)
+		else:
+			prev.seconds += seconds
+			prev.items += items
+			prev.cached = prev.cached and cached
+
+	def timings(self) -> List[Dict]:
+		return [self.stats[s].to_dict() for s in STAGES if s in self.stats]
+
+	def parse(self, load: Callable[[], List[TeamSelection]]) -> List[TeamSelection]:
+		with self._stage("parse") as st:
+			selections = load()
+			st.items = len(selections)
+		return selections
+
+	def index(self, load: Callable[[], OddsIndex]) -> OddsIndex:
+		with self._stage("index") as st:
+			odds_index = load()
+			st.items = odds_index.num_events
+		return odds_index
+
+	def validate(self, selections: Sequence[TeamSelection], odds_index: OddsIndex) -> List[TeamSelection]:
+		"""One pick per game on the slate (higher model probability wins); raises SlateError.
+
+		Picks are copied, so cached parse results are never mutated.
+		"""
+		with self._stage("validate") as st:
+			game_index = odds_index.game_index
+			by_game: Dict[str, TeamSelection] = {}  # insertion order = first pick per game
+			missing: List[Tuple[str, str]] = []
+			for s in selections:
+				norm = normalize_team(s.team_name) or s.team_name
+				team_ab = abbr(norm) or s.team_abbr
+				if team_ab not in game_index:
+					missing.append((s.team_name, team_ab))
+					continue
+				gid, opp_ab = game_index[team_ab]
+				prev = by_game.get(gid)
+				if prev is not None:
+					self.conflicts.append((team_ab, prev.team_abbr))
+					if s.model_win_prob <= prev.model_win_prob:
+						continue
+				by_game[gid] = s.model_copy(update={"game_id": gid, "opponent_abbr": opp_ab})
+			if missing:
+				raise SlateError(missing)
+			st.items = len(by_game)
+		return list(by_game.values())
+
+	def price(self, validated: Sequence[TeamSelection], odds_index: OddsIndex) -> List[TeamSelection]:
+		"""Attach best odds and single-leg metrics; legs below ``min_edge`` are dropped."""
+		with self._stage("price") as st:
+			with_odds: List[TeamSelection] = []
+			self.missing_odds = []
+			for s in validated:
+				od = odds_index.best_moneyline(s.team_name)
+				if od is None:
+					self.missing_odds.append(s.team_abbr)
+					continue
+				s.best_odds = od
+				s = attach_single_metrics(s)
+				if self.config.min_edge is not None and (s.edge or -1.0) < self.config.min_edge:
+					continue
+				with_odds.append(s)
+			st.items = len(with_odds)
+		return with_odds
+
+	def build(self, legs: List[TeamSelection], sizes: Optional[Sequence[int]] = None) -> Dict[int, List[List[TeamSelection]]]:
+		"""Beam finalists per parlay size (``sizes`` defaults to ``config.parlay_sizes``)."""
+		config = self.config if sizes is None else self.config.model_copy(update={"parlay_sizes": list(sizes)})
+		with self._stage("build") as st:
+			by_size = greedy_beam_build(legs, config)
+			st.items = sum(len(v) for v in by_size.values())
+		return by_size
+
+	def select(self, by_size: Dict[int, List[List[TeamSelection]]], legs: Optional[List[TeamSelection]] = None) -> List[ParlayTicket]:
+		"""Chosen tickets; the ``colgen`` selector also prices combos over ``legs``."""
+		with self._stage("select") as st:
+			tickets = ilp_select_with_derivation(by_size, self.config, legs)
+			if self.config.min_parlay_ev is not None and self.config.min_parlay_ev > 0:
+				tickets = [t for t in tickets if t.expected_value >= self.config.min_parlay_ev]
+			st.items = len(tickets)
+		return tickets
+
+	def stake(self, tickets: List[ParlayTicket]) -> List[ParlayTicket]:
+		with self._stage("stake") as st:
+			tickets = allocate_stakes(tickets, self.config)
+			st.items = len(tickets)
+		return tickets
+
+	def prepare(self, load_model: Callable[[], List[TeamSelection]], load_odds: Callable[[], OddsIndex]) -> Tuple[List[TeamSelection], OddsIndex]:
+		"""parse -> index -> validate -> price; returns the priced legs and the odds index."""
+		selections = self.parse(load_model)
+		odds_index = self.index(load_odds)
+		return self.price(self.validate(selections, odds_index), odds_index), odds_index
+
+	def run(self, load_model: Callable[[], List[TeamSelection]], load_odds: Callable[[], OddsIndex]) -> Tuple[List[TeamSelection], List[ParlayTicket]]:
+		"""All stages; returns the priced legs and the staked tickets."""
+		legs, _ = self.prepare(load_model, load_odds)
+		return legs, self.stake(self.select(self.build(legs), legs))
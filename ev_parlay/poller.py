@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from .config import AppConfig
+from .deltas import diff_snapshots
+from .logging_utils import get_logger
+from .odds_api import QuotaStatus, fresh_until_path, request_odds
+from .snapshot_store import SnapshotStore, to_epoch
+
+logger = get_logger(__name__)
+
+# Slack on the advertised fresh-until time to cover the poll request itself
+POLL_GRACE_SECONDS = 30.0
+
+
+def _iso(ts: float) -> str:
+	return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _kickoff(ev: Dict) -> Optional[int]:
+	try:
+		return to_epoch(ev.get("commence_time"))
+	except ValueError:
+		return None
+
+
+class OddsPoller:
+	"""Keep the odds cache warm while spending as little API quota as possible.
+
+	Each poll requests only games that have not started yet (started games keep
+	their last cached prices), then picks the next interval from the nearest
+	kickoff using ``config.poll_tiers``. When the API reports remaining quota,
+	the interval is stretched so the quota (minus ``poll_quota_reserve``) lasts
+	until the last kickoff. Polling stops once every game has started or the
+	reserve is reached. After each poll the next poll time is written beside
+	the cache (see ``odds_api.fresh_until_path``) so fetch_odds keeps serving
+	the cache until then instead of spending quota on its own request.
+	``clock``/``sleep`` are injectable for tests.
+	"""
+
+	def __init__(
+		self,
+		config: AppConfig,
+		cache_file: Optional[str] = None,
+		store: Optional[SnapshotStore] = None,
+		week: Optional[int] = None,
+		clock: Callable[[], float] = time.time,
+		sleep: Callable[[float], None] = time.sleep,
+		stop_event: Optional[threading.Event] = None,
+	):
+		self.config = config
+		self.cache_file = Path(cache_file or config.cache_file)
+		self.store = store
+		self.week = week
+		self.clock = clock
+		self.sleep = sleep
+		self.stop_event = stop_event or threading.Event()
+		self.quota = QuotaStatus()
+		self.payload: List[Dict] = []
+		self.polls = 0
+		if self.cache_file.exists():
+			try:
+				self.payload = json.loads(self.cache_file.read_text(encoding="utf-8"))
+			except ValueError:
+				self.payload = []
+
+	def upcoming_kickoffs(self, now: float) -> List[int]:
+		kicks = [_kickoff(ev) for ev in self.payload]
+		return sorted(k for k in kicks if k is not None and k > now)
+
+	def next_interval(self, now: float) -> Optional[float]:
+		"""Seconds until the next poll, or None when polling should stop."""
+		kicks = self.upcoming_kickoffs(now)
+		if not kicks:
+			return None
+		remaining = self.quota.remaining
+		reserve = self.config.poll_quota_reserve
+		if remaining is not None and remaining <= reserve:
+			return None
+		until_next = kicks[0] - now
+		interval = self.config.poll_far_interval
+		for horizon, tier_interval in sorted(self.config.poll_tiers):
+			if until_next <= horizon:
+				interval = tier_interval
+				break
+		if remaining is not None:
+			# Spread the remaining quota evenly until the last kickoff
+			cost = max(1, self.quota.last_cost or 1)
+			polls_left = max(1, (remaining - reserve) // cost)
+			interval = max(interval, (kicks[-1] - now) / polls_left)
+		# Never sleep past the next kickoff: the last pre-game prices matter most
+		return max(1.0, min(interval, until_next))
+
+	def poll_once(self) -> List[Dict]:
+		now = self.clock()
+		from_iso = self.config.commence_from_iso
+		if from_iso is None or (to_epoch(from_iso) or 0) < now:
+			from_iso = _iso(now)
+		fresh, self.quota = request_odds(self.config, commence_from_iso=from_iso)
+		fresh_ids = {ev.get("id") for ev in fresh}
+		started = [ev for ev in self.payload if ev.get("id") not in fresh_ids and (_kickoff(ev) or 0) <= now]
+		merged = started + list(fresh)
+		if self.payload:
+			changes = diff_snapshots(self.payload, merged, self.config)
+			logger.info("Poll %d: %d events, %d price changes", self.polls + 1, len(merged), len(changes))
+		self.payload = merged
+		self._write_cache(merged)
+		if self.store is not None:
+			self.store.append(merged, ts=now, week=self.week, label="poll")
+		self.polls += 1
+		return merged
+
+	def _write_cache(self, payload: List[Dict]) -> None:
+		tmp = self.cache_file.with_name(self.cache_file.name + ".tmp")
+		tmp.write_text(json.dumps(payload), encoding="utf-8")
+		os.replace(tmp, self.cache_file)
+
+	def _write_fresh_until(self, until: Optional[float]) -> None:
+		path = fresh_until_path(self.cache_file)
+		if until is None:
+			path.unlink(missing_ok=True)
+			return
+		tmp = path.with_name(path.name + ".tmp")
+		tmp.write_text(repr(until), encoding="utf-8")
+		os.replace(tmp, path)
+
+	def run(self, max_polls: Optional[int] = None) -> int:
+		"""Poll until all games started, quota reserve is hit, or ``stop_event`` is set."""
+		try:
+			while not self.stop_event.is_set():
+				try:
+					self.poll_once()
+					ok = True
+				except Exception as e:
+					logger.warning("Odds poll failed: %s", e)
+					if not self.payload:
+						raise
+					ok = False
+				if max_polls is not None and self.polls >= max_polls:
+					break
+				now = self.clock()
+				interval = self.next_interval(now)
+				if interval is None:
+					logger.info("Odds polling finished after %d polls (quota remaining: %s)", self.polls, self.quota.remaining)
+					break
+				# Builds trust the cache until the next poll (plus the time a poll takes)
+				self._write_fresh_until(now + interval + POLL_GRACE_SECONDS if ok else None)
+				logger.info("Next odds poll in %.0fs", interval)
+				self.sleep(interval)
+		finally:
+			# No more polls: the cache is only as fresh as its ttl again
+			self._write_fresh_until(None)
+		return self.polls
+
+
+def start_background_poller(config: AppConfig, cache_file: Optional[str] = None) -> OddsPoller:
+	"""Run an :class:`OddsPoller` in a daemon thread; stop it via ``poller.stop_event``."""
+	stop = threading.Event()
+	poller = OddsPoller(config, cache_file=cache_file, sleep=lambda s: stop.wait(s), stop_event=stop)
+	thread = threading.Thread(target=poller.run, name="odds-poller", daemon=True)
+	thread.start()
+	return poller
@@ -2,12 +2,13 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence
 
+import csv
 import json
-import pandas as pd
 
 from .models import ParlayTicket, TeamSelection
+from .ticket_archive import ARCHIVE_FILE, save_archive
 
 
 @dataclass
@@ -43,44 +44,90 @@ def print_console_report(selections: List[TeamSelection], tickets: List[ParlayTi
 	console.print(t2)
 
 
-def write_artifacts(outdir: str | Path, tickets: List[ParlayTicket]) -> SlateSummary:
-	Path(outdir).mkdir(parents=True, exist_ok=True)
-	# CSV of parlays
-	rows = []
+TABLE_FORMATS = ("csv", "jsonl", "parquet")
+PARLAY_FIELDS = ("size", "legs", "decimal_odds", "probability", "EV_dollars", "flat_stake", "kelly_stake")
+
+
+def _write_csv(path: Path, fields: Sequence[str], rows: Iterable[Dict]) -> None:
+	with path.open("w", newline="", encoding="utf-8") as fh:
+		writer = csv.DictWriter(fh, fieldnames=fields)
+		writer.writeheader()
+		writer.writerows(rows)
+
+
+def _write_jsonl(path: Path, fields: Sequence[str], rows: Iterable[Dict]) -> None:
+	with path.open("w", encoding="utf-8") as fh:
+		for row in rows:
+			fh.write(json.dumps(row) + "\n")
+
+
+def _write_parquet(path: Path, fields: Sequence[str], rows: Iterable[Dict]) -> None:
+	try:
+		import pyarrow as pa  # type: ignore
+		import pyarrow.parquet as pq  # type: ignore
+	except ImportError as e:
+		raise RuntimeError("Parquet output needs pyarrow (pip install pyarrow)") from e
+	columns: Dict[str, List] = {f: [] for f in fields}
+	for row in rows:
+		for f in fields:
+			columns[f].append(row[f])
+	pq.write_table(pa.table(columns), path)
+
+
+_WRITERS: Dict[str, Callable[[Path, Sequence[str], Iterable[Dict]], None]] = {
+	"csv": _write_csv,
+	"jsonl": _write_jsonl,
+	"parquet": _write_parquet,
+}
+
+
+def write_artifacts(outdir: str | Path, tickets: List[ParlayTicket], fmt: str = "csv") -> SlateSummary:
+	"""Write parlays and exposure tables (``fmt``: csv, jsonl or parquet), summary.json and tickets.npz.
+
+	Ticket rows are streamed to the writer; exposure and summary totals are
+	accumulated in the same pass.
+	"""
+	if fmt not in _WRITERS:
+		raise ValueError(f"Unknown artifact format {fmt!r}; expected one of {', '.join(TABLE_FORMATS)}")
+	out = Path(outdir)
+	out.mkdir(parents=True, exist_ok=True)
+	write = _WRITERS[fmt]
 	exposure_counts: Dict[str, int] = {}
-	for t in tickets:
-		for team in t.teams:
-			exposure_counts[team] = exposure_counts.get(team, 0) + 1
-		rows.append(
-			{
+	totals = {"count": 0, "legs": 0, "ev": 0.0}
+
+	def parlay_rows() -> Iterator[Dict]:
+		for t in tickets:
+			teams = t.teams
+			for team in teams:
+				exposure_counts[team] = exposure_counts.get(team, 0) + 1
+			totals["count"] += 1
+			totals["legs"] += t.size
+			totals["ev"] += t.expected_value
+			yield {
 				"size": t.size,
-				"legs": ",".join(t.teams),
+				"legs": ",".join(teams),
 				"decimal_odds": round(t.combined_decimal, 4),
 				"probability": round(t.combined_probability, 6),
 				"EV_dollars": round(t.expected_value, 2),
 				"flat_stake": round(t.flat_stake, 2),
 				"kelly_stake": round(t.kelly_stake, 2),
 			}
-		)
-	parlays_path = Path(outdir) / "parlays.csv"
-	pd.DataFrame(rows).to_csv(parlays_path, index=False)
-
-	# Exposure
-	total_tickets = max(1, len(tickets))
-	exposure = {team: cnt / total_tickets for team, cnt in exposure_counts.items()}
-	exposure_rows = [{"team": k, "exposure": v} for k, v in sorted(exposure.items())]
-	exposure_path = Path(outdir) / "exposure.csv"
-	pd.DataFrame(exposure_rows).to_csv(exposure_path, index=False)
-
-	# Summary JSON
-	div_score = sum(v * v for v in exposure.values())
+
+	write(out / f"parlays.{fmt}", PARLAY_FIELDS, parlay_rows())
+
+	count = totals["count"]
+	exposure = {team: cnt / max(1, count) for team, cnt in exposure_counts.items()}
+	write(out / f"exposure.{fmt}", ("team", "exposure"), ({"team": k, "exposure": v} for k, v in sorted(exposure.items())))
+
 	summary = SlateSummary(
-		count=len(tickets),
-		avg_size=(sum(t.size for t in tickets) / len(tickets)) if tickets else 0.0,
-		total_ev=sum(t.expected_value for t in tickets),
-		diversification_score=div_score,
+		count=count,
+		avg_size=totals["legs"] / count if count else 0.0,
+		total_ev=totals["ev"],
+		diversification_score=sum(v * v for v in exposure.values()),
 		exposure=exposure,
 	)
-	summary_path = Path(outdir) / "summary.json"
-	summary_path.write_text(json.dumps(summary.__dict__, indent=2), encoding="utf-8")
+	(out / "summary.json").write_text(json.dumps(summary.__dict__, indent=2), encoding="utf-8")
+
+	# Lossless binary copy (legs, membership, stakes) for simulate and later analysis
+	save_archive(out / ARCHIVE_FILE, tickets)
 	return summary
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .kelly import leg_index
+from .model_batch import ModelTable
+from .models import ParlayTicket
+
+METHODS = ("normal", "beta", "bootstrap")
+EPS = 1e-6
+
+
+def model_matrix(
+	table: ModelTable,
+	keys: Sequence[Tuple[str, str]],
+	weights: Optional[Dict[str, float]] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+	"""(models x legs weighted probabilities, models x legs weights) for bootstrap draws.
+
+	``keys`` are the (team abbr, game id) leg keys from ``leg_index`` and
+	``table`` one week of picks. Weights follow model_batch.blend (equal by
+	default); a model that does not rate a team has weight 0 there, so a
+	resampled blend is ``counts @ probs / counts @ weights``.
+	"""
+	models = table.model_ids
+	weights = weights or {}
+	w = {m: float(weights.get(m, 1.0 if not weights else 0.0)) for m in models}
+	col = {ab: j for j, (ab, _) in enumerate(keys)}
+	row = {m: i for i, m in enumerate(models)}
+	probs = np.zeros((len(models), len(keys)))
+	rated = np.zeros((len(models), len(keys)))
+	for m, ab, p in zip(table.model_id, table.team_abbr, table.prob):
+		j = col.get(ab)
+		if j is not None:
+			probs[row[m], j] = w[m] * p
+			rated[row[m], j] = w[m]
+	return probs, rated
+
+
+def draw_probabilities(
+	probs: np.ndarray,
+	draws: int,
+	method: str = "normal",
+	sd: float = 0.03,
+	seed: int = 42,
+	models: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+) -> np.ndarray:
+	"""draws x legs perturbed win probabilities around ``probs``.
+
+	``normal`` adds N(0, sd) noise; ``beta`` draws Beta with mean p and
+	standard deviation ``sd`` (capped where p(1-p) is too small for it);
+	``bootstrap`` resamples the models behind the blend (``models`` from
+	``model_matrix``) with replacement and re-blends them; legs no resampled
+	model rates keep their point probability.
+	"""
+	rng = np.random.default_rng(seed)
+	n = probs.shape[0]
+	if method == "normal":
+		out = probs + rng.normal(0.0, sd, size=(draws, n))
+	elif method == "beta":
+		var = np.minimum(sd * sd, probs * (1.0 - probs) * 0.99)
+		k = probs * (1.0 - probs) / np.maximum(var, 1e-12) - 1.0
+		out = rng.beta(np.maximum(probs * k, EPS), np.maximum((1.0 - probs) * k, EPS), size=(draws, n))
+	elif method == "bootstrap":
+		if models is None or models[0].shape[0] < 2:
+			raise ValueError("bootstrap needs at least two models to resample")
+		matrix, rated = models
+		m = matrix.shape[0]
+		counts = rng.multinomial(m, np.full(m, 1.0 / m), size=draws).astype(np.float64)  # draws x models
+		num = counts @ matrix
+		den = counts @ rated
+		out = np.where(den > 0, num / np.where(den > 0, den, 1.0), probs)
+	else:
+		raise ValueError(f"Unknown sensitivity method {method!r}; expected one of {', '.join(METHODS)}")
+	return np.clip(out, EPS, 1.0 - EPS)
+
+
+def ticket_ev_draws(
+	tickets: List[ParlayTicket],
+	leg_draws: np.ndarray,
+	membership: np.ndarray,
+	rho: float = 0.0,
+) -> Tuple[np.ndarray, np.ndarray]:
+	"""(draws x tickets win probability, draws x tickets EV per $1) in one batch.
+
+	Independent-leg products are a matrix product in log space; with ``rho``
+	the same min-probability blend as ev_math.parlay_probability is applied,
+	taking each ticket's minimum over its own legs (draws x legs per ticket,
+	never draws x tickets x legs).
+	"""
+	member = membership.astype(np.float64).T  # legs x tickets
+	P = np.exp(np.log(leg_draws) @ member)
+	if rho != 0.0:
+		lowest = np.stack([leg_draws[:, np.flatnonzero(row)].min(axis=1) for row in membership], axis=1)
+		P = P * (1.0 - rho) + rho * lowest
+	D = np.array([t.combined_decimal for t in tickets], dtype=np.float64)
+	return P, P * (D - 1.0) - (1.0 - P)
+
+
+def sensitivity(
+	tickets: List[ParlayTicket],
+	draws: int = 2000,
+	method: str = "normal",
+	sd: float = 0.03,
+	rho: float = 0.0,
+	bankroll: float = 1000.0,
+	kelly_fraction: float = 0.5,
+	table: Optional[ModelTable] = None,
+	weights: Optional[Dict[str, float]] = None,
+	seed: int = 42,
+) -> List[Dict]:
+	"""Per-ticket EV and Kelly stake distribution under leg-probability uncertainty.
+
+	Each row has the point EV, the mean/sd and 5/50/95th percentiles of EV per
+	$1 across draws, ``p_negative`` (share of draws with EV < 0) and Kelly
+	stake percentiles at ``bankroll`` x ``kelly_fraction``. Legless tickets are
+	perturbed as a single leg at their combined probability. ``bootstrap``
+	needs ``table`` (one week, two or more models) and its blend ``weights``.
+	"""
+	if not tickets:
+		return []
+	keys, probs, membership = leg_index(tickets)
+	models = model_matrix(table, keys, weights) if method == "bootstrap" and table is not None else None
+	leg_draws = draw_probabilities(probs, draws, method, sd, seed, models)
+	P, EV = ticket_ev_draws(tickets, leg_draws, membership, rho)
+	b = np.array([t.combined_decimal - 1.0 for t in tickets], dtype=np.float64)
+	kelly = bankroll * kelly_fraction * np.maximum(0.0, np.where(b > 0, (P * b - (1.0 - P)) / np.where(b > 0, b, 1.0), 0.0))
+	ev_pct = np.percentile(EV, [5, 50, 95], axis=0)
+	kelly_pct = np.percentile(kelly, [5, 50, 95], axis=0)
+	rows: List[Dict] = []
+	for i, t in enumerate(tickets):
+		rows.append({
+			"teams": t.teams,
+			"ev": t.expected_value,
+			"ev_mean": float(EV[:, i].mean()),
+			"ev_sd": float(EV[:, i].std()),
+			"ev_p05": float(ev_pct[0, i]),
+			"ev_p50": float(ev_pct[1, i]),
+			"ev_p95": float(ev_pct[2, i]),
+			"p_negative": float((EV[:, i] < 0).mean()),
+			"kelly_p05": float(kelly_pct[0, i]),
+			"kelly_p50": float(kelly_pct[1, i]),
+			"kelly_p95": float(kelly_pct[2, i]),
+		})
+	return rows
@@ -1,13 +1,29 @@
 from __future__ import annotations
 
-from typing import List, Dict, Optional
+from typing import TYPE_CHECKING, List, Dict, Optional
+
+import time
 
 import numpy as np
 
+from . import metrics
 from .models import ParlayTicket
 
+if TYPE_CHECKING:
+	from .ticket_archive import TicketArchive
+
+
+def _record_throughput(trials: int, tickets: int, start: float) -> None:
+	if not metrics.ENABLED:
+		return
+	elapsed = time.perf_counter() - start
+	metrics.SIM_TRIALS.inc(trials)
+	if elapsed > 0:
+		metrics.SIM_TRIALS_PER_SECOND.observe(trials * max(1, tickets) / elapsed)
+
 
 def simulate_slate(tickets: List[ParlayTicket], trials: int = 50000, random_seed: int = 42) -> Dict[str, float]:
+	start = time.perf_counter()
 	rng = np.random.default_rng(random_seed)
 	profits = np.zeros(trials)
 	for t in tickets:
@@ -16,6 +32,7 @@ def simulate_slate(tickets: List[ParlayTicket], trials: int = 50000, random_seed
 		stake = t.kelly_stake if t.kelly_stake > 0 else t.flat_stake
 		wins = rng.random(trials) < p
 		profits += wins * (stake * (dec - 1.0)) - (~wins) * stake
+	_record_throughput(trials, len(tickets), start)
 	return {
 		"mean": float(np.mean(profits)),
 		"median": float(np.median(profits)),
@@ -25,6 +42,7 @@ def simulate_slate(tickets: List[ParlayTicket], trials: int = 50000, random_seed
 
 
 def simulate_slate_samples(tickets: List[ParlayTicket], trials: int = 50000, random_seed: int = 42) -> np.ndarray:
+	start = time.perf_counter()
 	rng = np.random.default_rng(random_seed)
 	profits = np.zeros(trials)
 	for t in tickets:
@@ -33,6 +51,54 @@ def simulate_slate_samples(tickets: List[ParlayTicket], trials: int = 50000, ran
 		stake = t.kelly_stake if t.kelly_stake > 0 else t.flat_stake
 		wins = rng.random(trials) < p
 		profits += wins * (stake * (dec - 1.0)) - (~wins) * stake
+	_record_throughput(trials, len(tickets), start)
+	return profits
+
+
+def profit_stats(profits: np.ndarray) -> Dict[str, float]:
+	return {
+		"mean": float(np.mean(profits)),
+		"median": float(np.median(profits)),
+		"p05": float(np.percentile(profits, 5)),
+		"p95": float(np.percentile(profits, 95)),
+	}
+
+
+def simulate_archive_samples(
+	archive: "TicketArchive",
+	trials: int = 50000,
+	random_seed: int = 42,
+	chunk: int = 8192,
+	leg_probs: Optional[np.ndarray] = None,
+) -> np.ndarray:
+	"""Profit samples from simulated leg outcomes, so tickets sharing a leg win and lose together.
+
+	Legs are independent Bernoulli(model_win_prob) draws, or ``leg_probs`` when
+	given (e.g. 1/0 for settled legs); a ticket wins when none of its legs lose
+	(one trials x legs @ legs x tickets product per chunk). Archives without
+	legs (converted legacy CSVs) fall back to per-ticket draws on
+	``combined_probability``.
+	"""
+	start = time.perf_counter()
+	rng = np.random.default_rng(random_seed)
+	stakes = archive.stakes
+	win_profit = stakes * (archive.tickets["combined_decimal"] - 1.0)
+	profits = np.empty(trials)
+	if archive.has_legs:
+		probs = np.asarray(archive.legs["model_win_prob"] if leg_probs is None else leg_probs, dtype=np.float64)
+		member = np.asarray(archive.membership, dtype=np.float32).T  # legs x tickets
+		for lo in range(0, trials, chunk):
+			hi = min(trials, lo + chunk)
+			lost = (rng.random((hi - lo, probs.shape[0])) >= probs).astype(np.float32)
+			wins = (lost @ member) == 0
+			profits[lo:hi] = np.where(wins, win_profit, -stakes).sum(axis=1)
+	else:
+		probs = archive.tickets["combined_probability"]
+		for lo in range(0, trials, chunk):
+			hi = min(trials, lo + chunk)
+			wins = rng.random((hi - lo, probs.shape[0])) < probs
+			profits[lo:hi] = np.where(wins, win_profit, -stakes).sum(axis=1)
+	_record_throughput(trials, len(archive), start)
 	return profits
 
 
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import math
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from .config import AppConfig
+from .ev_math import kelly_fraction
+from .models import ParlayTicket, TeamSelection
+
+
+class TicketRecord:
+	"""A candidate ticket by leg index: what the builder passes around instead of ParlayTicket."""
+
+	__slots__ = ("legs", "mask", "probability", "decimal", "expected_value")
+
+	def __init__(self, legs: Tuple[int, ...], mask: int, probability: float, decimal: float, expected_value: float):
+		self.legs = legs
+		self.mask = mask  # bit i set when leg i is on the ticket
+		self.probability = probability
+		self.decimal = decimal
+		self.expected_value = expected_value
+
+	@property
+	def size(self) -> int:
+		return len(self.legs)
+
+	def __repr__(self) -> str:
+		return f"TicketRecord(legs={self.legs}, P={self.probability:.4f}, D={self.decimal:.2f}, EV={self.expected_value:.4f})"
+
+
+class SlateArrays:
+	"""Priced legs as parallel arrays; tickets refer to legs by position.
+
+	``prob``/``decimal`` are float64, ``game``/``team``/``book`` are indices into
+	``games``/``teams``/``books``. Legs without a game id get a game of their
+	own, legs without odds a NaN decimal. The builder's loops read the plain
+	list mirrors (``p``, ``d``, ``g``, ``t``), which index faster than numpy
+	scalars; whole-slate math uses the arrays. ``selections`` keeps the
+	original TeamSelections for converting results back at the boundary.
+	"""
+
+	__slots__ = ("selections", "prob", "decimal", "game", "team", "book", "games", "teams", "books", "p", "d", "g", "t")
+
+	def __init__(self, selections: Sequence[TeamSelection]):
+		self.selections = list(selections)
+		game_ids: Dict[str, int] = {}
+		team_ids: Dict[str, int] = {}
+		book_ids: Dict[str, int] = {}
+		games: List[int] = []
+		teams: List[int] = []
+		books: List[int] = []
+		for i, s in enumerate(self.selections):
+			games.append(game_ids.setdefault(s.game_id or f"_leg{i}", len(game_ids)))
+			teams.append(team_ids.setdefault(s.team_abbr, len(team_ids)))
+			books.append(book_ids.setdefault(s.best_odds.book if s.best_odds else "", len(book_ids)))
+		self.games = list(game_ids)
+		self.teams = list(team_ids)
+		self.books = list(book_ids)
+		self.p = [s.model_win_prob for s in self.selections]
+		self.d = [s.best_odds.decimal if s.best_odds else math.nan for s in self.selections]
+		self.g = games
+		self.t = teams
+		self.prob = np.array(self.p, dtype=np.float64)
+		self.decimal = np.array(self.d, dtype=np.float64)
+		self.game = np.array(games, dtype=np.int32)
+		self.team = np.array(teams, dtype=np.int32)
+		self.book = np.array(books, dtype=np.int16)
+
+	def __len__(self) -> int:
+		return len(self.selections)
+
+	@staticmethod
+	def mask(legs: Iterable[int]) -> int:
+		m = 0
+		for i in legs:
+			m |= 1 << i
+		return m
+
+	def evaluate(self, legs: Sequence[int], rho: float = 0.0) -> Tuple[float, float, float]:
+		"""(P, D, EV per $1) of a parlay; same arithmetic, in leg order, as ev_math."""
+		if not legs:
+			return (0.0, 1.0, -1.0)
+		P = D = 1.0
+		min_p = math.inf
+		for i in legs:
+			d = self.d[i]
+			if d != d:  # leg without odds
+				return (0.0, 0.0, -math.inf)
+			P *= self.p[i]
+			D *= d
+			min_p = min(min_p, self.p[i])
+		if rho != 0.0:
+			P = P * (1.0 - rho) + rho * min_p
+		return P, D, P * (D - 1.0) - (1.0 - P)
+
+	def record(self, legs: Sequence[int], rho: float = 0.0) -> TicketRecord:
+		P, D, EV = self.evaluate(legs, rho)
+		return TicketRecord(tuple(legs), self.mask(legs), P, D, EV)
+
+	def evaluate_many(self, legs: np.ndarray, rho: float = 0.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+		"""Vectorized ``evaluate`` for an (n tickets x size) index matrix."""
+		probs = self.prob[legs]
+		P = probs.prod(axis=1)
+		if rho != 0.0:
+			P = P * (1.0 - rho) + rho * probs.min(axis=1)
+		D = self.decimal[legs].prod(axis=1)
+		return P, D, P * (D - 1.0) - (1.0 - P)
+
+	def legs_of(self, record: TicketRecord) -> List[TeamSelection]:
+		return [self.selections[i] for i in record.legs]
+
+	def to_ticket(self, record: TicketRecord, config: AppConfig) -> ParlayTicket:
+		"""The pydantic ticket for a record, with the Kelly stake ilp_select assigns."""
+		legs = self.legs_of(record)
+		k = kelly_fraction(record.probability, record.decimal)
+		return ParlayTicket(
+			size=record.size,
+			legs=legs,
+			combined_decimal=record.decimal,
+			combined_probability=record.probability,
+			expected_value=record.expected_value,
+			flat_stake=config.flat_stake,
+			kelly_stake=round(config.bankroll * config.kelly_fraction * k, 2),
+			books={l.team_abbr: (l.best_odds.book if l.best_odds else "") for l in legs},
+		)
@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .odds_api import normalize_book_key
+from .team_mapping import normalize_team
+
+# One flat binary file per column; rows of a snapshot are contiguous.
+COLUMNS: Dict[str, type] = {
+	"snap": np.int32,  # snapshot id
+	"ts": np.int64,  # fetch time, unix seconds
+	"event": np.int32,  # index into meta["events"]
+	"book": np.int16,  # index into meta["books"]
+	"market": np.int16,  # index into meta["markets"]
+	"team": np.int32,  # index into meta["teams"] (outcome name)
+	"price": np.int32,  # american odds
+	"point": np.float32,  # spread/total line, NaN for h2h
+}
+
+META_FILE = "meta.json"
+STORE_VERSION = 1
+
+
+def to_epoch(value: float | int | str | None) -> Optional[int]:
+	"""Accept unix seconds or an ISO timestamp (``2025-09-28T17:00:00Z``)."""
+	if value is None:
+		return None
+	if isinstance(value, (int, float)):
+		return int(value)
+	text = value.strip()
+	if text.isdigit():
+		return int(text)
+	dt = datetime.fromisoformat(text.replace("Z", "+00:00"))
+	if dt.tzinfo is None:
+		dt = dt.replace(tzinfo=timezone.utc)
+	return int(dt.timestamp())
+
+
+@dataclass
+class SnapshotRows:
+	"""Columnar query result; string columns are still dictionary-encoded."""
+
+	columns: Dict[str, np.ndarray]
+	store: "SnapshotStore"
+
+	def __len__(self) -> int:
+		return int(self.columns["ts"].shape[0])
+
+	def to_records(self) -> List[Dict]:
+		meta = self.store.meta
+		out: List[Dict] = []
+		cols = self.columns
+		for i in range(len(self)):
+			point = float(cols["point"][i])
+			out.append(
+				{
+					"snapshot": int(cols["snap"][i]),
+					"ts": int(cols["ts"][i]),
+					"event_id": meta["events"][int(cols["event"][i])]["id"],
+					"book": meta["books"][int(cols["book"][i])],
+					"market": meta["markets"][int(cols["market"][i])],
+					"team": meta["teams"][int(cols["team"][i])],
+					"price": int(cols["price"][i]),
+					"point": None if np.isnan(point) else point,
+				}
+			)
+		return out
+
+
+class SnapshotStore:
+	"""Append-only, columnar store of odds payload snapshots.
+
+	Each appended payload is flattened to one row per outcome and written as
+	raw little-endian column files that are read back with ``np.memmap``.
+	``meta.json`` holds the string dictionaries and the snapshot row ranges and
+	is rewritten last, so it acts as the commit point: rows past the last
+	committed snapshot (e.g. from an interrupted append) are never visible and
+	are truncated on the next append.
+	"""
+
+	def __init__(self, root: str | Path):
+		self.root = Path(root)
+		self.meta: Dict = self._load_meta()
+		self._index = {
+			name: {v if isinstance(v, str) else v["id"]: i for i, v in enumerate(self.meta[name])}
+			for name in ("events", "books", "markets", "teams")
+		}
+
+	def _load_meta(self) -> Dict:
+		path = self.root / META_FILE
+		if path.exists():
+			return json.loads(path.read_text(encoding="utf-8"))
+		return {"version": STORE_VERSION, "events": [], "books": [], "markets": [], "teams": [], "snapshots": []}
+
+	def _write_meta(self) -> None:
+		tmp = self.root / (META_FILE + ".tmp")
+		tmp.write_text(json.dumps(self.meta), encoding="utf-8")
+		os.replace(tmp, self.root / META_FILE)
+
+	def _intern(self, table: str, key: str) -> int:
+		idx = self._index[table].get(key)
+		if idx is None:
+			idx = len(self.meta[table])
+			self.meta[table].append(key)
+			self._index[table][key] = idx
+		return idx
+
+	def _intern_event(self, ev: Dict) -> int:
+		event_id = ev.get("id") or ev.get("event_id") or ""
+		info = {
+			"id": event_id,
+			"sport_key": ev.get("sport_key"),
+			"commence_time": ev.get("commence_time"),
+			"home_team": ev.get("home_team") or ev.get("homeTeam"),
+			"away_team": ev.get("away_team") or ev.get("awayTeam"),
+		}
+		idx = self._index["events"].get(event_id)
+		if idx is None:
+			idx = len(self.meta["events"])
+			self.meta["events"].append(info)
+			self._index["events"][event_id] = idx
+		else:
+			# Kickoffs can move; keep the latest metadata seen for the event
+			self.meta["events"][idx] = info
+		return idx
+
+	@property
+	def snapshots(self) -> List[Dict]:
+		return self.meta["snapshots"]
+
+	@property
+	def num_rows(self) -> int:
+		return self.snapshots[-1]["stop"] if self.snapshots else 0
+
+	def append(self, payload: List[Dict], ts: float | str | None = None, week: Optional[int] = None, label: Optional[str] = None) -> int:
+		"""Flatten ``payload`` (The Odds API event list) and append it; return the snapshot id."""
+		self.root.mkdir(parents=True, exist_ok=True)
+		snap_id = len(self.snapshots)
+		fetched = to_epoch(ts) if ts is not None else int(time.time())
+		cols: Dict[str, List] = {name: [] for name in COLUMNS}
+		for ev in payload:
+			ev_idx = self._intern_event(ev)
+			for bk in ev.get("bookmakers", []):
+				book_idx = self._intern("books", normalize_book_key(bk.get("key", "")))
+				for market in bk.get("markets", []):
+					market_idx = self._intern("markets", market.get("key", ""))
+					for oc in market.get("outcomes", []):
+						name = oc.get("name")
+						try:
+							price = int(oc.get("price"))
+						except Exception:
+							continue
+						if not name:
+							continue
+						point = oc.get("point")
+						cols["event"].append(ev_idx)
+						cols["book"].append(book_idx)
+						cols["market"].append(market_idx)
+						cols["team"].append(self._intern("teams", name))
+						cols["price"].append(price)
+						cols["point"].append(np.nan if point is None else float(point))
+		n = len(cols["price"])
+		cols["snap"] = [snap_id] * n
+		cols["ts"] = [fetched] * n
+
+		start = self.num_rows
+		for name, dtype in COLUMNS.items():
+			path = self.root / f"{name}.bin"
+			itemsize = np.dtype(dtype).itemsize
+			with open(path, "ab") as f:
+				# Drop rows from an append that never committed its metadata
+				if f.tell() != start * itemsize:
+					f.truncate(start * itemsize)
+					f.seek(start * itemsize)
+				f.write(np.asarray(cols[name], dtype=dtype).tobytes())
+		self.snapshots.append({"id": snap_id, "ts": fetched, "week": week, "label": label, "start": start, "stop": start + n})
+		self._write_meta()
+		return snap_id
+
+	def column(self, name: str) -> np.ndarray:
+		"""Memory-mapped view of a column, limited to committed rows."""
+		n = self.num_rows
+		if n == 0:
+			return np.empty(0, dtype=COLUMNS[name])
+		return np.memmap(self.root / f"{name}.bin", dtype=COLUMNS[name], mode="r", shape=(n,))
+
+	def _snapshot_ids(self, week: Optional[int], start: Optional[int], end: Optional[int]) -> List[int]:
+		ids = []
+		for snap in self.snapshots:
+			if week is not None and snap.get("week") != week:
+				continue
+			if start is not None and snap["ts"] < start:
+				continue
+			if end is not None and snap["ts"] >= end:
+				continue
+			ids.append(snap["id"])
+		return ids
+
+	def _team_ids(self, team: str) -> List[int]:
+		target = normalize_team(team) or team
+		return [i for i, name in enumerate(self.meta["teams"]) if name == team or normalize_team(name) == target]
+
+	def query(
+		self,
+		week: Optional[int] = None,
+		team: Optional[str] = None,
+		book: Optional[str] = None,
+		market: Optional[str] = None,
+		start: float | str | None = None,
+		end: float | str | None = None,
+	) -> SnapshotRows:
+		"""Return rows matching all given filters; ``[start, end)`` bounds the fetch time."""
+		# Week/time filters select whole snapshots, i.e. contiguous row ranges
+		snap_ids = self._snapshot_ids(week, to_epoch(start), to_epoch(end))
+		ranges = [(self.snapshots[i]["start"], self.snapshots[i]["stop"]) for i in snap_ids]
+		if len(ranges) == len(self.snapshots):
+			rows = np.arange(self.num_rows)
+		elif ranges:
+			rows = np.concatenate([np.arange(a, b) for a, b in ranges])
+		else:
+			rows = np.empty(0, dtype=np.int64)
+
+		mask = np.ones(rows.shape[0], dtype=bool)
+		if team is not None:
+			mask &= np.isin(self.column("team")[rows], self._team_ids(team))
+		if book is not None:
+			book_idx = self._index["books"].get(normalize_book_key(book), -1)
+			mask &= self.column("book")[rows] == book_idx
+		if market is not None:
+			mask &= self.column("market")[rows] == self._index["markets"].get(market, -1)
+		rows = rows[mask]
+		return SnapshotRows(columns={name: np.asarray(self.column(name)[rows]) for name in COLUMNS}, store=self)
+
+	def find_snapshot(self, at: float | str | None = None, week: Optional[int] = None) -> Optional[int]:
+		"""Latest snapshot fetched at or before ``at`` (and in ``week`` when given)."""
+		cutoff = to_epoch(at)
+		best: Optional[int] = None
+		for snap in self.snapshots:
+			if week is not None and snap.get("week") != week:
+				continue
+			if cutoff is not None and snap["ts"] > cutoff:
+				continue
+			if best is None or snap["ts"] >= self.snapshots[best]["ts"]:
+				best = snap["id"]
+		return best
+
+	def payload(self, snapshot_id: int) -> List[Dict]:
+		"""Rebuild the event list of a snapshot in The Odds API shape."""
+		snap = self.snapshots[snapshot_id]
+		sl = slice(snap["start"], snap["stop"])
+		events = self.column("event")[sl]
+		books = self.column("book")[sl]
+		markets = self.column("market")[sl]
+		teams = self.column("team")[sl]
+		prices = self.column("price")[sl]
+		points = self.column("point")[sl]
+		meta = self.meta
+
+		out: List[Dict] = []
+		by_event: Dict[int, Dict] = {}
+		by_book: Dict[tuple, Dict] = {}
+		by_market: Dict[tuple, List[Dict]] = {}
+		for i in range(events.shape[0]):
+			e, b, m = int(events[i]), int(books[i]), int(markets[i])
+			ev = by_event.get(e)
+			if ev is None:
+				info = meta["events"][e]
+				ev = {k: v for k, v in info.items() if v is not None}
+				ev["bookmakers"] = []
+				by_event[e] = ev
+				out.append(ev)
+			bk = by_book.get((e, b))
+			if bk is None:
+				bk = {"key": meta["books"][b], "markets": []}
+				by_book[(e, b)] = bk
+				ev["bookmakers"].append(bk)
+			outcomes = by_market.get((e, b, m))
+			if outcomes is None:
+				outcomes = []
+				by_market[(e, b, m)] = outcomes
+				bk["markets"].append({"key": meta["markets"][m], "outcomes": outcomes})
+			oc: Dict = {"name": meta["teams"][int(teams[i])], "price": int(prices[i])}
+			if not np.isnan(points[i]):
+				oc["point"] = float(points[i])
+			outcomes.append(oc)
+		return out
+
+
+def load_payload(store_dir: str | Path, at: float | str | None = None, week: Optional[int] = None) -> List[Dict]:
+	"""Rebuild the latest matching payload from a store directory."""
+	store = SnapshotStore(store_dir)
+	snap_id = store.find_snapshot(at=at, week=week)
+	if snap_id is None:
+		raise FileNotFoundError(f"No odds snapshot in {store_dir} matches week={week} at={at}")
+	return store.payload(snap_id)
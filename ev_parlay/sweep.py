@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import csv
+import itertools
+import json
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .backtest import WeekInputs, prepare_week
+from .builder import SELECTORS
+from .config import AppConfig
+from .kelly import scenario_returns
+from .models import ParlayTicket, TeamSelection
+from .pipeline import BEAM_FIELDS, STAKE_METHODS, SlateError, SlatePipeline
+
+SWEEP_FIELDS = ("beam_width", "candidate_pool_size", "parlay_sizes", "team_exposure_cap", "correlation_rho", "stake_method", "selector")
+OBJECTIVES = ("expected_profit", "log_growth", "ev_sum")
+CHOICES = {"stake_method": STAKE_METHODS, "selector": SELECTORS}
+
+
+def _check_choices(name: str, values: List) -> List:
+	allowed = CHOICES.get(name)
+	bad = [v for v in values if allowed is not None and v not in allowed]
+	if bad:
+		raise ValueError(f"Unknown {name} {', '.join(map(repr, bad))}; expected one of {', '.join(allowed)}")
+	return values
+
+
+def parse_param(spec: str) -> Tuple[str, List]:
+	"""``beam_width=50,200`` -> ("beam_width", [50, 200]); ``parlay_sizes=2-3,2-4`` -> [[2, 3], [2, 3, 4]]."""
+	name, _, raw = spec.partition("=")
+	name = name.strip()
+	if name not in SWEEP_FIELDS:
+		raise ValueError(f"Cannot sweep {name!r}; choose from {', '.join(SWEEP_FIELDS)}")
+	values: List = []
+	for part in (p.strip() for p in raw.split(",") if p.strip()):
+		if name == "parlay_sizes":
+			lo, _, hi = part.partition("-")
+			values.append(list(range(int(lo), int(hi or lo) + 1)))
+		elif name in ("stake_method", "selector"):
+			values.append(part)
+		elif name in ("beam_width", "candidate_pool_size"):
+			values.append(int(part))
+		else:
+			values.append(float(part))
+	return name, _check_choices(name, values)
+
+
+def load_space(path: str | Path) -> Dict[str, List]:
+	"""Search space from YAML/JSON: ``{field: [values, ...]}``."""
+	import yaml
+
+	data = yaml.safe_load(Path(path).read_text(encoding="utf-8")) or {}
+	unknown = sorted(set(data) - set(SWEEP_FIELDS))
+	if unknown:
+		raise ValueError(f"Cannot sweep {', '.join(unknown)}; choose from {', '.join(SWEEP_FIELDS)}")
+	return {k: _check_choices(k, list(v)) for k, v in data.items()}
+
+
+def expand(space: Dict[str, List], samples: Optional[int] = None, seed: int = 0) -> List[Dict]:
+	"""Every combination of the space, or ``samples`` of them drawn without replacement."""
+	names = list(space)
+	total = 1
+	for name in names:
+		total *= len(space[name])
+	if samples is None or samples >= total:
+		return [dict(zip(names, combo)) for combo in itertools.product(*(space[n] for n in names))]
+	picks = random.Random(seed).sample(range(total), samples)
+	out = []
+	for flat in sorted(picks):  # mixed-radix decode keeps grid order
+		combo = {}
+		for name in reversed(names):
+			flat, i = divmod(flat, len(space[name]))
+			combo[name] = space[name][i]
+		out.append({n: combo[n] for n in names})
+	return out
+
+
+def score(tickets: List[ParlayTicket], bankroll: float) -> Dict[str, float]:
+	"""Objectives and exposure of one staked ticket set.
+
+	``log_growth`` is -inf when the stakes reach the bankroll (losing every
+	ticket would leave nothing), so such configs rank last.
+	"""
+	stakes = np.array([t.kelly_stake if t.kelly_stake > 0 else t.flat_stake for t in tickets], dtype=np.float64)
+	evs = np.array([t.expected_value for t in tickets], dtype=np.float64)
+	growth = 0.0
+	if tickets and stakes.sum() >= bankroll:
+		growth = -np.inf
+	elif tickets:
+		returns, weights = scenario_returns(tickets, samples=5000)
+		growth = float(weights @ np.log1p(returns @ stakes / bankroll))
+	counts: Dict[str, int] = {}
+	for t in tickets:
+		for team in t.teams:
+			counts[team] = counts.get(team, 0) + 1
+	exposure = np.array(list(counts.values()), dtype=np.float64) / max(1, len(tickets))
+	return {
+		"expected_profit": float(stakes @ evs),
+		"log_growth": growth,
+		"ev_sum": float(evs.sum()),
+		"staked": float(stakes.sum()),
+		"tickets": len(tickets),
+		"max_exposure": float(exposure.max()) if exposure.size else 0.0,
+		"diversification": float((exposure ** 2).sum()),
+	}
+
+
+# Per-process slate legs, installed once by the pool initializer instead of per task,
+# and beam finalists per (slate, size, beam settings) shared by the configs a worker runs
+_SLATES: List[Tuple[str, List[TeamSelection]]] = []
+_BEAMS: Dict[tuple, List[List[TeamSelection]]] = {}
+
+
+def _init(slates: List[Tuple[str, List[TeamSelection]]]) -> None:
+	global _SLATES
+	_SLATES = slates
+	_BEAMS.clear()
+
+
+def _finalists(slate: int, size: int, pipeline: SlatePipeline) -> Tuple[List[List[TeamSelection]], bool]:
+	config = pipeline.config
+	key = (slate, size) + tuple(getattr(config, f) for f in BEAM_FIELDS)
+	if key in _BEAMS:
+		pipeline.record("build", items=len(_BEAMS[key]), cached=True)
+		return _BEAMS[key], True
+	combos = _BEAMS[key] = pipeline.build(_SLATES[slate][1], sizes=[size])[size]
+	return combos, False
+
+
+def _evaluate(index: int, base: Dict, params: Dict) -> Dict:
+	"""One config on every prepared slate: build, select and stake, then score."""
+	config = AppConfig(**{**base, **params})
+	row: Dict = {"config": index, **params, "slates": 0, "seconds": 0.0, "beams_cached": 0}
+	totals: Dict[str, float] = {}
+	for slate in range(len(_SLATES)):
+		pipeline = SlatePipeline(config)
+		start = time.perf_counter()
+		by_size = {}
+		for size in config.parlay_sizes:
+			by_size[size], hit = _finalists(slate, size, pipeline)
+			row["beams_cached"] += hit
+		tickets = pipeline.stake(pipeline.select(by_size, _SLATES[slate][1]))
+		row["seconds"] += time.perf_counter() - start
+		row["slates"] += 1
+		for k, v in score(tickets, config.bankroll).items():
+			if k == "max_exposure":
+				totals[k] = max(totals.get(k, 0.0), v)
+			else:
+				totals[k] = totals.get(k, 0.0) + v
+	n = max(1, row["slates"])
+	totals["diversification"] = totals.get("diversification", 0.0) / n  # mean over slates
+	return {**row, **totals}
+
+
+def prepare_slates(slates: Sequence[WeekInputs], config: AppConfig, cache_dir: Optional[Path] = None) -> Tuple[List[Tuple[str, List[TeamSelection]]], Dict[str, str]]:
+	"""Priced legs per slate (the parse/index/validate/price stages run once per slate)."""
+	prepared: List[Tuple[str, List[TeamSelection]]] = []
+	errors: Dict[str, str] = {}
+	for inputs in slates:
+		name = f"week{inputs.week}"
+		try:
+			legs, _, _ = prepare_week(inputs, config, cache_dir)
+		except SlateError as e:
+			errors[name] = str(e)
+			continue
+		prepared.append((name, legs))
+	return prepared, errors
+
+
+def iter_sweep(
+	slates: List[Tuple[str, List[TeamSelection]]],
+	base: AppConfig,
+	configs: List[Dict],
+	workers: int = 0,
+) -> Iterator[Dict]:
+	"""One result row per config, in config order; ``workers`` 0 = one per CPU, 1 = inline.
+
+	Slates are shipped to each worker once (pool initializer). Configs that
+	share beam settings reuse a worker's finalists, so only selection and
+	staking rerun.
+	"""
+	base_fields = base.model_dump()
+	if workers == 1 or len(configs) <= 1:
+		_init(slates)
+		for i, params in enumerate(configs):
+			yield _evaluate(i, base_fields, params)
+		return
+	with ProcessPoolExecutor(max_workers=workers or None, initializer=_init, initargs=(slates,)) as pool:
+		futures = [pool.submit(_evaluate, i, base_fields, params) for i, params in enumerate(configs)]
+		for fut in futures:
+			yield fut.result()
+
+
+def write_table(path: str | Path, rows: List[Dict]) -> None:
+	"""CSV (or JSON lines for ``.jsonl``) of sweep rows; list values are joined with '-'."""
+	path = Path(path)
+	if path.suffix == ".jsonl":
+		path.write_text("".join(json.dumps(r) + "\n" for r in rows), encoding="utf-8")
+		return
+	fields: List[str] = []
+	for r in rows:
+		fields.extend(k for k in r if k not in fields)
+	with path.open("w", newline="", encoding="utf-8") as fh:
+		writer = csv.DictWriter(fh, fieldnames=fields)
+		writer.writeheader()
+		for r in rows:
+			writer.writerow({k: "-".join(map(str, v)) if isinstance(v, list) else v for k, v in r.items()})
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import random
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .config import AppConfig
+from .ev_math import attach_single_metrics
+from .models import MoneylineOdds, ParlayTicket, TeamSelection
+from .odds_api import OddsIndex
+
+SYNTHETIC_BOOKS = [
+	"draftkings", "fanduel", "betmgm", "caesars", "bet365", "pointsbetus", "espnbet",
+	"betrivers", "unibet_us", "wynnbet", "superbook", "bovada",
+]
+
+
+def prob_to_american(p: float) -> int:
+	p = min(max(p, 0.01), 0.99)
+	if p >= 0.5:
+		return -int(round(100.0 * p / (1.0 - p)))
+	return int(round(100.0 * (1.0 - p) / p))
+
+
+def synthetic_payload(
+	n_events: int,
+	books: Optional[Sequence[str]] = None,
+	markets: Sequence[str] = ("h2h",),
+	seed: int = 7,
+) -> List[Dict]:
+	"""Seeded Odds-API-shaped payload with vigged, per-book jittered prices.
+
+	Team names are synthetic (``Team 0``, ``Team 1``, ...) except that callers
+	can map them to real names; they do not resolve through ``team_mapping``.
+	"""
+	rng = random.Random(seed)
+	books = list(books or SYNTHETIC_BOOKS[:6])
+	events: List[Dict] = []
+	for g in range(n_events):
+		home, away = f"Team {2 * g}", f"Team {2 * g + 1}"
+		p_home = rng.uniform(0.2, 0.8)
+		bookmakers = []
+		for key in books:
+			vig = rng.uniform(0.02, 0.05)
+			noise = rng.gauss(0.0, 0.015)
+			mkts = []
+			for m in markets:
+				if m == "h2h":
+					ph = min(max(p_home + noise, 0.02), 0.98)
+					outcomes = [
+						{"name": home, "price": prob_to_american(ph + vig / 2)},
+						{"name": away, "price": prob_to_american(1.0 - ph + vig / 2)},
+					]
+				elif m == "spreads":
+					line = round((p_home - 0.5) * 28) / 2
+					outcomes = [
+						{"name": home, "price": prob_to_american(0.5 + vig / 2 + noise), "point": -line},
+						{"name": away, "price": prob_to_american(0.5 + vig / 2 - noise), "point": line},
+					]
+				else:
+					total = round(rng.uniform(37, 52) * 2) / 2
+					outcomes = [
+						{"name": "Over", "price": prob_to_american(0.5 + vig / 2 + noise), "point": total},
+						{"name": "Under", "price": prob_to_american(0.5 + vig / 2 - noise), "point": total},
+					]
+				mkts.append({"key": m, "last_update": "2025-09-28T12:00:00Z", "outcomes": outcomes})
+			bookmakers.append({"key": key, "title": key.title(), "last_update": "2025-09-28T12:00:00Z", "markets": mkts})
+		events.append({
+			"id": f"evt{g:05d}",
+			"sport_key": "americanfootball_nfl",
+			"sport_title": "NFL",
+			"commence_time": "2025-09-28T17:00:00Z",
+			"home_team": home,
+			"away_team": away,
+			"bookmakers": bookmakers,
+		})
+	return events
+
+
+def synthetic_legs(n_legs: int, legs_per_game: int = 2, seed: int = 7) -> List[TeamSelection]:
+	"""Seeded priced legs with metrics attached, ``legs_per_game`` legs sharing each game id.
+
+	Extra legs per game stand in for other markets on the same game (spreads,
+	totals); every leg gets a unique ``team_abbr``.
+	"""
+	rng = random.Random(seed)
+	legs: List[TeamSelection] = []
+	for i in range(n_legs):
+		p_market = rng.uniform(0.25, 0.8)
+		p_model = min(max(p_market + rng.gauss(0.02, 0.05), 0.05), 0.95)
+		american = prob_to_american(p_market + rng.uniform(0.01, 0.03))
+		dec = 1.0 + (american / 100.0 if american > 0 else 100.0 / abs(american))
+		sel = TeamSelection(
+			team_name=f"Team {i}",
+			team_abbr=f"T{i}",
+			game_id=f"g{i // max(1, legs_per_game)}",
+			model_win_prob=p_model,
+			best_odds=MoneylineOdds(book="draftkings", american=american, decimal=dec, implied_prob=1.0 / dec),
+		)
+		legs.append(attach_single_metrics(sel))
+	return legs
+
+
+def synthetic_books(n_books: int) -> List[str]:
+	"""``n_books`` distinct book keys: the real ones first, then numbered copies."""
+	k = len(SYNTHETIC_BOOKS)
+	return [SYNTHETIC_BOOKS[i % k] + (f"_{i // k}" if i >= k else "") for i in range(n_books)]
+
+
+def synthetic_slate(n_games: int, n_books: int = 6, seed: int = 7, model_sd: float = 0.04) -> Tuple[List[Dict], List[TeamSelection]]:
+	"""Seeded odds payload plus both sides of every game as priced model legs.
+
+	Each leg gets the best price across books; its model probability is that
+	price's implied probability, normalised over both sides, plus
+	N(0, ``model_sd``) noise. Edges come from model noise and line shopping.
+	"""
+	books = synthetic_books(n_books)
+	payload = synthetic_payload(n_games, books=books, seed=seed)
+	index = OddsIndex.from_payload(payload, AppConfig(sportsbooks=books))
+	rng = random.Random(seed + 1)
+	legs: List[TeamSelection] = []
+	for ev in payload:
+		home, away = ev["home_team"], ev["away_team"]
+		odds = {t: index.best_moneyline(t) for t in (home, away)}
+		if not all(odds.values()):
+			continue
+		overround = sum(o.implied_prob for o in odds.values())
+		for team, opp in ((home, away), (away, home)):
+			fair = odds[team].implied_prob / overround
+			sel = TeamSelection(
+				team_name=team,
+				team_abbr="T" + team.rsplit(" ", 1)[-1],
+				game_id=ev["id"],
+				opponent_name=opp,
+				opponent_abbr="T" + opp.rsplit(" ", 1)[-1],
+				model_win_prob=min(max(fair + rng.gauss(0.0, model_sd), 0.02), 0.98),
+				best_odds=odds[team],
+			)
+			legs.append(attach_single_metrics(sel))
+	return payload, legs
+
+
+def synthetic_tickets(n_tickets: int, legs: Sequence[TeamSelection], size: int = 3, seed: int = 7, stake: float = 10.0) -> List[ParlayTicket]:
+	"""Seeded random parlays (one leg per game) over ``legs`` with flat stakes."""
+	rng = random.Random(seed)
+	by_game: Dict[str, List[TeamSelection]] = {}
+	for leg in legs:
+		by_game.setdefault(leg.game_id or leg.team_abbr, []).append(leg)
+	games = list(by_game)
+	tickets: List[ParlayTicket] = []
+	for _ in range(n_tickets):
+		combo = [rng.choice(by_game[g]) for g in rng.sample(games, min(size, len(games)))]
+		prob = dec = 1.0
+		for leg in combo:
+			prob *= leg.model_win_prob
+			dec *= leg.best_odds.decimal if leg.best_odds else 1.0
+		tickets.append(ParlayTicket(
+			size=len(combo),
+			legs=combo,
+			combined_decimal=dec,
+			combined_probability=prob,
+			expected_value=prob * (dec - 1.0) - (1.0 - prob),
+			flat_stake=stake,
+			kelly_stake=0.0,
+			books={l.team_abbr: l.best_odds.book if l.best_odds else "" for l in combo},
+		))
+	return tickets
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from typing import Dict, Optional
+import difflib
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional
 
 # Map common abbreviations and names to canonical full team names
 TEAM_ALIASES: Dict[str, str] = {
@@ -151,13 +154,68 @@ TEAM_TO_ABBR: Dict[str, str] = {
 }
 
 
+_NON_WORD_RE = re.compile(r"[^\w\s]")
+
+
+def _norm_key(text: str) -> str:
+	# "N.Y. Jets " -> "ny jets"; "Tampa-Bay" -> "tampabay"
+	return " ".join(_NON_WORD_RE.sub("", text.casefold()).split())
+
+
+def _build_alias_index() -> Dict[str, str]:
+	index: Dict[str, str] = {}
+	for alias, full in TEAM_ALIASES.items():
+		index[_norm_key(alias)] = full
+	for full, ab in TEAM_TO_ABBR.items():
+		index[_norm_key(full)] = full
+		index[_norm_key(ab)] = full
+	return index
+
+
+# Normalized alias -> canonical name; built once at import
+_ALIAS_INDEX: Dict[str, str] = _build_alias_index()
+# Keys safe to match as a token run inside a longer string (no bare 2-3 letter abbreviations)
+_TOKEN_KEYS = {k for k in _ALIAS_INDEX if len(k) > 3 or " " in k}
+_FUZZY_KEYS: List[str] = sorted(_TOKEN_KEYS)
+FUZZY_CUTOFF = 0.85
+
+
+@lru_cache(maxsize=4096)
+def resolve_team(name_or_abbr: str) -> Optional[str]:
+	"""Resolve a team name, nickname or abbreviation to its canonical full name.
+
+	Tries, in order: exact canonical name, normalized alias (casefolded,
+	punctuation and extra whitespace removed), an unambiguous alias found as a
+	token run inside the text ("the Jaguars (home)"), then a bounded fuzzy match
+	for typos. Memoized, so repeated lookups from the odds scans are O(1).
+	"""
+	if name_or_abbr in TEAM_TO_ABBR:
+		return name_or_abbr
+	key = _norm_key(name_or_abbr)
+	if not key:
+		return None
+	hit = _ALIAS_INDEX.get(key)
+	if hit:
+		return hit
+	tokens = key.split()
+	found = set()
+	for n in range(min(3, len(tokens)), 0, -1):
+		for i in range(len(tokens) - n + 1):
+			run = " ".join(tokens[i : i + n])
+			if run in _TOKEN_KEYS:
+				found.add(_ALIAS_INDEX[run])
+		if found:
+			break
+	if len(found) == 1:
+		return found.pop()
+	if found or len(key) < 4 or len(key) > 40:
+		return None
+	close = difflib.get_close_matches(key, _FUZZY_KEYS, n=1, cutoff=FUZZY_CUTOFF)
+	return _ALIAS_INDEX[close[0]] if close else None
+
+
 def normalize_team(name_or_abbr: str) -> Optional[str]:
-	key = name_or_abbr.strip()
-	# If a canonical name is passed, return as-is
-	if key in TEAM_TO_ABBR:
-		return key
-	# Otherwise map alias/abbr to canonical
-	return TEAM_ALIASES.get(key)
+	return resolve_team(name_or_abbr)
 
 
 def abbr(team_full_name: str) -> Optional[str]:
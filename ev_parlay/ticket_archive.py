@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import math
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .models import MoneylineOdds, ParlayTicket, TeamSelection
+
+ARCHIVE_FILE = "tickets.npz"
+ARCHIVE_VERSION = 1
+
+TICKET_FLOAT = ("combined_decimal", "combined_probability", "expected_value", "flat_stake", "kelly_stake")
+
+
+@dataclass
+class TicketArchive:
+	"""Columnar tickets: unique legs, a ticket x leg membership matrix and ticket arrays.
+
+	``order[i]`` lists ticket i's leg indices in their original order (padded
+	with -1), so ``to_tickets`` rebuilds the same ParlayTickets that were saved.
+	Optional leg fields are stored as "" (strings) or NaN (floats).
+	"""
+
+	legs: Dict[str, np.ndarray]
+	american: np.ndarray  # int32 per leg, 0 when the leg had no odds
+	membership: np.ndarray  # bool, tickets x legs
+	order: np.ndarray  # int32, tickets x max size
+	size: np.ndarray  # int16 per ticket
+	tickets: Dict[str, np.ndarray]
+
+	def __len__(self) -> int:
+		return int(self.size.shape[0])
+
+	@property
+	def num_legs(self) -> int:
+		return int(self.american.shape[0])
+
+	@property
+	def stakes(self) -> np.ndarray:
+		"""Stake the simulation uses: Kelly stake when positive, else the flat stake."""
+		kelly = self.tickets["kelly_stake"]
+		return np.where(kelly > 0, kelly, self.tickets["flat_stake"])
+
+	@property
+	def has_legs(self) -> bool:
+		"""True when every ticket carries its legs (CSV round-trips do not)."""
+		return len(self) > 0 and bool((self.membership.sum(axis=1) == self.size).all())
+
+	@classmethod
+	def from_tickets(cls, tickets: List[ParlayTicket]) -> "TicketArchive":
+		leg_ids: Dict[Tuple[str, str], int] = {}
+		unique: List[TeamSelection] = []
+		books: List[str] = []
+		rows: List[List[int]] = []
+		for t in tickets:
+			row = []
+			for leg in t.legs:
+				key = (leg.team_abbr, leg.game_id or "")
+				idx = leg_ids.get(key)
+				if idx is None:
+					idx = leg_ids[key] = len(unique)
+					unique.append(leg)
+					books.append(leg.best_odds.book if leg.best_odds else t.books.get(leg.team_abbr, ""))
+				row.append(idx)
+			rows.append(row)
+
+		n, m = len(tickets), len(unique)
+		width = max((len(r) for r in rows), default=0)
+		order = np.full((n, width), -1, dtype=np.int32)
+		membership = np.zeros((n, m), dtype=bool)
+		for i, row in enumerate(rows):
+			order[i, : len(row)] = row
+			membership[i, row] = True
+
+		def opt_str(value: Optional[str]) -> str:
+			return value or ""
+
+		def opt_float(value: Optional[float]) -> float:
+			return math.nan if value is None else float(value)
+
+		legs: Dict[str, np.ndarray] = {
+			"team_name": np.array([l.team_name for l in unique], dtype=str),
+			"team_abbr": np.array([l.team_abbr for l in unique], dtype=str),
+			"game_id": np.array([opt_str(l.game_id) for l in unique], dtype=str),
+			"opponent_name": np.array([opt_str(l.opponent_name) for l in unique], dtype=str),
+			"opponent_abbr": np.array([opt_str(l.opponent_abbr) for l in unique], dtype=str),
+			"book": np.array(books, dtype=str),
+			"model_win_prob": np.array([l.model_win_prob for l in unique], dtype=np.float64),
+			"margin": np.array([opt_float(l.margin) for l in unique], dtype=np.float64),
+			"decimal": np.array([l.best_odds.decimal if l.best_odds else math.nan for l in unique], dtype=np.float64),
+			"implied_prob": np.array([l.best_odds.implied_prob if l.best_odds else math.nan for l in unique], dtype=np.float64),
+			"implied_prob_market": np.array([opt_float(l.implied_prob_market) for l in unique], dtype=np.float64),
+			"edge": np.array([opt_float(l.edge) for l in unique], dtype=np.float64),
+			"expected_value": np.array([opt_float(l.expected_value) for l in unique], dtype=np.float64),
+		}
+		american = np.array([l.best_odds.american if l.best_odds else 0 for l in unique], dtype=np.int32)
+		return cls(
+			legs=legs,
+			american=american,
+			membership=membership,
+			order=order,
+			size=np.array([t.size for t in tickets], dtype=np.int16),
+			tickets={f: np.array([getattr(t, f) for t in tickets], dtype=np.float64) for f in TICKET_FLOAT},
+		)
+
+	def _leg(self, j: int) -> TeamSelection:
+		cols = self.legs
+
+		def s(name: str) -> Optional[str]:
+			return str(cols[name][j]) or None
+
+		def f(name: str) -> Optional[float]:
+			v = float(cols[name][j])
+			return None if math.isnan(v) else v
+
+		odds = None
+		if not math.isnan(float(cols["decimal"][j])):
+			odds = MoneylineOdds(book=str(cols["book"][j]), american=int(self.american[j]), decimal=float(cols["decimal"][j]), implied_prob=float(cols["implied_prob"][j]))
+		return TeamSelection(
+			team_name=str(cols["team_name"][j]),
+			team_abbr=str(cols["team_abbr"][j]),
+			game_id=s("game_id"),
+			opponent_name=s("opponent_name"),
+			opponent_abbr=s("opponent_abbr"),
+			model_win_prob=float(cols["model_win_prob"][j]),
+			margin=f("margin"),
+			best_odds=odds,
+			implied_prob_market=f("implied_prob_market"),
+			edge=f("edge"),
+			expected_value=f("expected_value"),
+		)
+
+	def to_tickets(self) -> List[ParlayTicket]:
+		legs = [self._leg(j) for j in range(self.num_legs)]
+		book = self.legs["book"]
+		out: List[ParlayTicket] = []
+		for i in range(len(self)):
+			idx = [int(j) for j in self.order[i] if j >= 0]
+			out.append(
+				ParlayTicket(
+					size=int(self.size[i]),
+					legs=[legs[j] for j in idx],
+					**{f: float(self.tickets[f][i]) for f in TICKET_FLOAT},
+					books={str(self.legs["team_abbr"][j]): str(book[j]) for j in idx},
+				)
+			)
+		return out
+
+
+def save_archive(path: str | Path, archive: TicketArchive | List[ParlayTicket]) -> Path:
+	"""Write an uncompressed .npz (stored members can be memory-mapped by ``load_archive``)."""
+	if not isinstance(archive, TicketArchive):
+		archive = TicketArchive.from_tickets(archive)
+	arrays = {f"leg_{k}": v for k, v in archive.legs.items()}
+	arrays.update({f"ticket_{k}": v for k, v in archive.tickets.items()})
+	path = Path(path)
+	with path.open("wb") as fh:  # a file object keeps numpy from appending ".npz"
+		np.savez(
+			fh,
+			version=np.array(ARCHIVE_VERSION, dtype=np.int32),
+			leg_american=archive.american,
+			membership=archive.membership,
+			order=archive.order,
+			size=archive.size,
+			**arrays,
+		)
+	return path
+
+
+def _mapped_members(path: Path) -> Dict[str, np.ndarray]:
+	"""Memory-map every stored .npy member of an uncompressed zip in place.
+
+	Members that are compressed (or otherwise unmappable) are left out and read
+	normally by the caller.
+	"""
+	out: Dict[str, np.ndarray] = {}
+	with zipfile.ZipFile(path) as zf, path.open("rb") as fh:
+		for info in zf.infolist():
+			if info.compress_type != zipfile.ZIP_STORED or not info.filename.endswith(".npy"):
+				continue
+			# Local file header: 30 fixed bytes, then name and extra field
+			fh.seek(info.header_offset + 26)
+			name_len, extra_len = np.frombuffer(fh.read(4), dtype="<u2")
+			fh.seek(info.header_offset + 30 + int(name_len) + int(extra_len))
+			version = np.lib.format.read_magic(fh)
+			read_header = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+			shape, fortran, dtype = read_header(fh)
+			if dtype.hasobject:
+				continue
+			name = info.filename[: -len(".npy")]
+			if not shape or 0 in shape:
+				continue  # scalars and empty arrays are cheaper to read than to map
+			out[name] = np.memmap(path, dtype=dtype, mode="r", offset=fh.tell(), shape=shape, order="F" if fortran else "C")
+	return out
+
+
+def load_archive(path: str | Path, mmap: bool = True) -> TicketArchive:
+	"""Load a ticket archive; with ``mmap`` arrays are read-only views of the file."""
+	path = Path(path)
+	arrays = _mapped_members(path) if mmap else {}
+	with np.load(path, allow_pickle=False) as npz:
+		for name in npz.files:
+			if name not in arrays:
+				arrays[name] = npz[name]
+	version = int(arrays.pop("version"))
+	if version != ARCHIVE_VERSION:
+		raise ValueError(f"Unsupported ticket archive version {version} in {path}")
+	return TicketArchive(
+		legs={k[4:]: v for k, v in arrays.items() if k.startswith("leg_") and k != "leg_american"},
+		american=arrays["leg_american"],
+		membership=arrays["membership"],
+		order=arrays["order"],
+		size=arrays["size"],
+		tickets={f: arrays[f"ticket_{f}"] for f in TICKET_FLOAT},
+	)
+
+
+def archive_for(parlays: str | Path) -> Optional[Path]:
+	"""The archive to read for a ``--parlays`` argument: the file itself if it is
+	an .npz, else ``tickets.npz`` beside a parlays.csv, else None (legacy CSV)."""
+	parlays = Path(parlays)
+	if parlays.suffix == ".npz":
+		return parlays
+	sibling = parlays.with_name(ARCHIVE_FILE)
+	return sibling if sibling.exists() else None
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from helpers import WEEK, write_slate
+
+
+@pytest.fixture
+def season(tmp_path: Path) -> Path:
+	"""Two-week season directory: week 1 every pick wins, week 2 every pick loses."""
+	season = tmp_path / "season"
+	season.mkdir()
+	model_text = write_slate(tmp_path)
+	odds = (tmp_path / f".odds_cache_week{WEEK}_all.json").read_text(encoding="utf-8")
+	picks = [line.rsplit(" ", 1)[0] for line in model_text.splitlines()]
+	rows = ["week,team,won"]
+	for week in (1, 2):
+		(season / f"model_week{week}.txt").write_text(model_text, encoding="utf-8")
+		(season / f"odds_week{week}.json").write_text(odds, encoding="utf-8")
+		rows += [f"{week},{team},{1 if week == 1 else 0}" for team in picks]
+	(season / "results.csv").write_text("\n".join(rows) + "\n", encoding="utf-8")
+	return season
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from ev_parlay.synthetic import synthetic_payload
+from ev_parlay.team_mapping import TEAM_TO_ABBR
+
+WEEK = 7
+
+
+def write_slate(tmp_path: Path, n_games: int = 8) -> str:
+	"""Model text for a synthetic slate; its odds are cached as week WEEK in ``tmp_path``."""
+	names = sorted(TEAM_TO_ABBR)[: 2 * n_games]
+	payload = synthetic_payload(n_games, books=["draftkings", "fanduel"], seed=3)
+	lines = []
+	for g, ev in enumerate(payload):
+		rename = {ev["home_team"]: names[2 * g], ev["away_team"]: names[2 * g + 1]}
+		ev["home_team"], ev["away_team"] = names[2 * g], names[2 * g + 1]
+		for bk in ev["bookmakers"]:
+			for o in bk["markets"][0]["outcomes"]:
+				o["name"] = rename[o["name"]]
+		price = ev["bookmakers"][0]["markets"][0]["outcomes"][0]["price"]
+		implied = 100.0 / (price + 100.0) if price > 0 else -price / (-price + 100.0)
+		lines.append(f"{names[2 * g]} {min(95.0, 100 * implied + 8):.1f}%")
+	(tmp_path / f".odds_cache_week{WEEK}_all.json").write_text(json.dumps(payload), encoding="utf-8")
+	return "\n".join(lines)
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from api import main as api_main
+from api.main import BatchBuildRequest, BuildRequest, BuildVariant, SimRequest, api_build, api_build_batch, api_build_stream, api_simulate
+from helpers import WEEK, write_slate
+
+
+def test_build_batch_matches_individual_builds(tmp_path: Path, monkeypatch):
+	monkeypatch.chdir(tmp_path)
+	model_text = write_slate(tmp_path)
+	base = dict(model_text=model_text, week=WEEK, sportsbooks=["draftkings", "fanduel"], desired_num_tickets=4, parlay_sizes=[2, 3])
+	variants = [
+		BuildVariant(label="base"),
+		BuildVariant(label="big", budget=500.0),
+		BuildVariant(label="sizes", parlay_sizes=[2, 3, 4], stake_method="equal"),
+		BuildVariant(label="rho", correlation_rho=0.2),
+	]
+	batch = api_build_batch(BatchBuildRequest(variants=variants, **base))
+
+	assert [r.label for r in batch.results] == ["base", "big", "sizes", "rho"]
+	for v, result in zip(variants, batch.results):
+		overrides = v.model_dump(exclude_none=True, exclude={"label"})
+		single = api_build(BuildRequest(**{**base, **overrides}))
+		assert result.parlays == single.parlays
+		assert batch.singles == single.singles
+	assert batch.results[0].parlays
+	# Shared selection, independent staking
+	base_stakes = [p["flat_stake"] for p in batch.results[0].parlays]
+	big_stakes = [p["flat_stake"] for p in batch.results[1].parlays]
+	assert sum(big_stakes) > sum(base_stakes)
+
+
+def test_build_batch_caps_worker_threads(monkeypatch):
+	monkeypatch.setattr(api_main, "BATCH_MAX_WORKERS", 3)
+	assert api_main._batch_workers(1000) == 3
+	assert api_main._batch_workers(2) == 2
+	assert api_main._batch_workers(0) == 1
+
+
+def test_build_stream_emits_stages_and_matches_build(tmp_path: Path, monkeypatch):
+	import asyncio
+
+	monkeypatch.chdir(tmp_path)
+	req = BuildRequest(model_text=write_slate(tmp_path), week=WEEK, sportsbooks=["draftkings", "fanduel"], desired_num_tickets=4, parlay_sizes=[2, 3])
+	response = api_build_stream(req)
+
+	async def collect():
+		return "".join([chunk async for chunk in response.body_iterator])
+
+	events = []
+	for block in asyncio.run(collect()).strip().split("\n\n"):
+		name, data = block.split("\n")
+		events.append((name.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+	assert [e for e, _ in events] == ["slate", "singles", "finalists", "finalists", "tickets", "done"]
+	assert [d["size"] for e, d in events if e == "finalists"] == [2, 3]
+	built = api_build(req)
+	assert events[-2][1]["parlays"] == built.parlays
+	assert events[1][1]["singles"] == built.singles
+
+
+def test_simulate_endpoint_accepts_built_parlays(tmp_path: Path, monkeypatch):
+	monkeypatch.chdir(tmp_path)
+	built = api_build(BuildRequest(model_text=write_slate(tmp_path), week=WEEK, sportsbooks=["draftkings"], desired_num_tickets=3, parlay_sizes=[2]))
+	result = api_simulate(SimRequest(parlays=built.parlays, trials=2000))
+	assert set(result["stats"]) == {"mean", "median", "p05", "p95"} and result["image"] is None
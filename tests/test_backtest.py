@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from ev_parlay.backtest import discover_weeks, grade, run_backtest
+from ev_parlay.cli import app
+from ev_parlay.config import AppConfig
+from ev_parlay.synthetic import synthetic_slate, synthetic_tickets
+
+
+def test_backtest_grades_weeks_and_reuses_prep(season: Path):
+	assert sorted(discover_weeks(season)) == [1, 2]
+	base = dict(sportsbooks=["draftkings", "fanduel"], parlay_sizes=[2, 3], desired_num_tickets=3, run_budget=30.0)
+	configs = {"narrow": AppConfig(beam_width=5, **base), "wide": AppConfig(beam_width=50, **base)}
+	report = run_backtest(season, configs, workers=2)
+
+	for name, r in report["configs"].items():
+		assert r["weeks"] == 2 and not r["errors"]
+		week1, week2 = r["by_week"]
+		assert week1["profit"] > 0 and abs(week2["profit"] + week2["staked"]) < 1e-6
+		assert r["max_drawdown"] >= week2["staked"] - 1e-6
+		assert abs(r["roi"] - (week1["profit"] + week2["profit"]) / r["staked"]) < 1e-9
+		assert r["calibration"] and sum(b["tickets"] for b in r["calibration"]) == r["tickets"]
+	# Both configs share the prep fields: one of them (per week) hit the cache
+	rows = [w for r in report["configs"].values() for w in r["by_week"]]
+	assert sum(w["prep_cached"] for w in rows) >= 2
+	again = run_backtest(season, {"wide": configs["wide"]}, workers=1)
+	assert all(w["prep_cached"] for w in again["configs"]["wide"]["by_week"])
+	assert again["configs"]["wide"]["profit"] == report["configs"]["wide"]["profit"]
+
+
+def test_grade_voids_tickets_without_results():
+	_, legs = synthetic_slate(6, 2)
+	tickets = synthetic_tickets(5, legs, size=2)
+	first = tickets[0].teams
+	graded = grade(tickets, {first[0]: True, first[1]: True})
+	assert graded["won"][0] and not graded["void"][0]
+	assert graded["profit"][0] == tickets[0].flat_stake * (tickets[0].combined_decimal - 1.0)
+	others = [i for i, t in enumerate(tickets) if not set(t.teams) <= set(first)]
+	assert all(graded["void"][i] and graded["profit"][i] == 0.0 for i in others)
+
+
+def test_backtest_cli_writes_report(season: Path, tmp_path: Path):
+	cfg = tmp_path / "small.yaml"
+	cfg.write_text("sportsbooks: [draftkings, fanduel]\nparlay_sizes: [2, 3]\ndesired_num_tickets: 2\n", encoding="utf-8")
+	out = tmp_path / "report.json"
+	result = CliRunner().invoke(app, ["backtest", str(season), "--config", str(cfg), "--workers", "1", "--out", str(out)])
+	assert result.exit_code == 0, result.output
+	assert "small" in result.output
+	assert json.loads(out.read_text())["configs"]["small"]["weeks"] == 2
+
+
+def test_backtest_cli_rejects_unknown_result_teams(season: Path):
+	results = season / "results.csv"
+	results.write_text(results.read_text(encoding="utf-8") + "1,Foo Bar,1\n", encoding="utf-8")
+	result = CliRunner().invoke(app, ["backtest", str(season), "--workers", "1"])
+	assert result.exit_code == 0
+	assert result.stdout.strip() == f"{results}: Unknown team(s): Foo Bar"
@@ -74,3 +74,24 @@ def test_builder_with_mock_odds(tmp_path: Path):
 	tickets = ilp_select(by_size, config)
 	# With only two legs and default sizes 3..10, likely zero tickets
 	assert isinstance(tickets, list)
+
+
+def test_large_slate_mode_prunes_and_matches_default():
+	from ev_parlay.builder import _parlay_ev, greedy_beam_build, prune_dominated
+	from ev_parlay.synthetic import synthetic_legs
+
+	legs = synthetic_legs(24, legs_per_game=3)
+	kept = prune_dominated(legs)
+	for a in legs:
+		if a not in kept:
+			assert any(
+				b.game_id == a.game_id and b.model_win_prob >= a.model_win_prob and b.best_odds.decimal >= a.best_odds.decimal
+				for b in kept
+			)
+	base = dict(parlay_sizes=[3, 4], candidate_pool_size=0, min_edge=-1.0)
+	default = greedy_beam_build(legs, AppConfig(**base))
+	large = greedy_beam_build(legs, AppConfig(large_slate=True, **base))
+	for size in (3, 4):
+		assert all(len({l.game_id for l in c}) == size for c in large[size])
+		best = lambda combos: max(_parlay_ev(c, 0.0)[2] for c in combos)
+		assert best(large[size]) >= best(default[size]) - 1e-9
@@ -10,3 +10,28 @@ def test_cli_help():
 	result = runner.invoke(app, ["--help"])
 	assert result.exit_code == 0
 	assert "Parlay Builder" in result.stdout
+
+
+def test_cli_import_is_lazy():
+	# Heavy dependencies load inside the commands that need them, not at startup
+	import subprocess
+	import sys
+
+	code = (
+		"import sys, ev_parlay.cli, ev_parlay.odds_api; "
+		"print(','.join(m for m in ('numpy', 'pandas', 'pulp', 'requests', 'rich') if m in sys.modules))"
+	)
+	out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+	assert out.stdout.strip() == ""
+
+
+def test_parquet_without_pyarrow_fails_before_build(tmp_path, monkeypatch):
+	import importlib.util
+
+	find_spec = importlib.util.find_spec
+	monkeypatch.setattr(importlib.util, "find_spec", lambda name, *a: None if name == "pyarrow" else find_spec(name, *a))
+	runner = CliRunner()
+	result = runner.invoke(app, ["build-parlays", "--model", str(tmp_path / "missing.txt"), "--format", "parquet", "--outdir", str(tmp_path / "out")])
+	assert result.exit_code == 0
+	assert result.stdout.strip() == "--format parquet needs pyarrow (pip install pyarrow)"
+	assert not (tmp_path / "out").exists()
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import itertools
+from collections import Counter
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+from typer.testing import CliRunner
+
+from api.main import BatchBuildRequest, BuildRequest, BuildVariant, api_build, api_build_batch
+from ev_parlay.builder import ilp_select_with_derivation
+from ev_parlay.cli import app
+from ev_parlay.colgen import colgen_select, price_columns, solve_master
+from ev_parlay.config import AppConfig
+from ev_parlay.pipeline import SlatePipeline
+from ev_parlay.slate_arrays import SlateArrays
+from ev_parlay.synthetic import synthetic_slate
+
+
+def _legs(games: int = 16):
+	_, legs = synthetic_slate(games, 6, model_sd=0.06)
+	return legs
+
+
+def test_pricing_ranks_by_reduced_cost():
+	arrays = SlateArrays(_legs(6))
+	zero = np.zeros(len(arrays))
+	priced = price_columns(arrays, zero, 0.0, [2], width=10_000)
+	pairs = [c for c in itertools.combinations(range(len(arrays)), 2) if arrays.g[c[0]] != arrays.g[c[1]]]
+	best = max(arrays.evaluate(c)[2] for c in pairs)
+	assert priced[0][0] == pytest.approx(best)
+	assert all(a[0] >= b[0] for a, b in zip(priced, priced[1:]))
+	# A high enough ticket-count price leaves nothing to add
+	assert price_columns(arrays, zero, best + 1.0, [2], width=10_000) == []
+
+
+def test_colgen_matches_full_enumeration():
+	legs = _legs(6)
+	config = AppConfig(selector="colgen", parlay_sizes=[2], desired_num_tickets=5, team_exposure_cap=0.4, beam_width=10_000)
+	arrays = SlateArrays(legs)
+	everything = [
+		arrays.record(c) for c in itertools.combinations(range(len(arrays)), 2)
+		if arrays.g[c[0]] != arrays.g[c[1]] and arrays.evaluate(c)[2] > 0
+	]
+	values, _, _ = solve_master(everything, arrays, config, relax=False)
+	optimum = sum(r.expected_value for r, v in zip(everything, values) if v > 0.5)
+
+	tickets = colgen_select({2: [[legs[0], legs[2]]]}, config, legs)
+	assert len(tickets) == 5
+	assert sum(t.expected_value for t in tickets) == pytest.approx(optimum)
+
+
+def test_colgen_selector_fills_exposure_capped_slate():
+	legs = _legs()
+	config = AppConfig(selector="colgen", parlay_sizes=[2, 3, 4], desired_num_tickets=8, beam_width=50, candidate_pool_size=50, team_exposure_cap=0.35)
+	pipeline = SlatePipeline(config)
+	tickets = pipeline.select(pipeline.build(legs), legs)
+	assert len(tickets) == 8
+	assert len({tuple(sorted(t.teams)) for t in tickets}) == 8
+	assert max(Counter(team for t in tickets for team in t.teams).values()) <= 2  # floor(0.35 * 8)
+	assert all(t.expected_value > 0 and t.size in (2, 3, 4) for t in tickets)
+	for t in tickets:
+		assert len({l.game_id for l in t.legs}) == t.size
+
+
+def test_unknown_selector_is_rejected():
+	with pytest.raises(ValueError, match="Unknown selector"):
+		ilp_select_with_derivation({}, AppConfig(selector="greedy"))
+	for call in (
+		lambda: api_build(BuildRequest(model_text="x", selector="greedy")),
+		lambda: api_build_batch(BatchBuildRequest(model_text="x", variants=[BuildVariant(selector="greedy")])),
+	):
+		with pytest.raises(HTTPException) as e:
+			call()
+		assert e.value.status_code == 400
+	result = CliRunner().invoke(app, ["build-parlays", "--model", "missing.txt", "--selector", "greedy"])
+	assert result.stdout.strip() == "Unknown --selector 'greedy'; expected one of ilp, colgen"
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+from ev_parlay import daemon
+
+ODDS = [
+	{
+		"id": "g1",
+		"home_team": "Jacksonville Jaguars",
+		"away_team": "Green Bay Packers",
+		"bookmakers": [{"key": "draftkings", "markets": [{"key": "h2h", "outcomes": [
+			{"name": "Jacksonville Jaguars", "price": -110},
+			{"name": "Green Bay Packers", "price": -110},
+		]}]}],
+	},
+	{
+		"id": "g2",
+		"home_team": "Buffalo Bills",
+		"away_team": "Miami Dolphins",
+		"bookmakers": [{"key": "draftkings", "markets": [{"key": "h2h", "outcomes": [
+			{"name": "Buffalo Bills", "price": 100},
+			{"name": "Miami Dolphins", "price": -120},
+		]}]}],
+	},
+]
+
+
+@pytest.fixture()
+def running_daemon(tmp_path: Path, monkeypatch):
+	sock = Path("/tmp") / f"evp-test-{id(tmp_path)}.sock"  # AF_UNIX paths must stay short
+	monkeypatch.setenv("EV_PARLAY_SOCKET", str(sock))
+	monkeypatch.delenv("EV_PARLAY_NO_DAEMON", raising=False)
+	ready = threading.Event()
+	thread = threading.Thread(target=daemon.serve, kwargs={"ready": ready}, daemon=True)
+	thread.start()
+	assert ready.wait(5)
+	yield sock
+	daemon.send_control("stop")
+	thread.join(5)
+	assert not sock.exists()
+
+
+def test_forward_build_uses_warm_cache(tmp_path: Path, running_daemon):
+	(tmp_path / "model.txt").write_text(":Jaguars: JAX – 65% | Margin: 3\n:Bills: BUF – 60%\n", encoding="utf-8")
+	(tmp_path / "odds.json").write_text(json.dumps(ODDS), encoding="utf-8")
+	argv = [
+		"build-parlays", "--model", "model.txt", "--odds-file", "odds.json", "--sportsbooks", "draftkings",
+		"--parlay-sizes", "2", "--outdir", str(tmp_path / "out"),
+	]
+	cwd = os.getcwd()
+	os.chdir(tmp_path)  # relative paths resolve against the client's cwd
+	try:
+		assert daemon.try_forward(argv) == 0
+		assert daemon.try_forward(argv) == 0
+	finally:
+		os.chdir(cwd)
+	assert (tmp_path / "out").exists()
+	assert daemon.WARM is not None and daemon.WARM.hits == 2 and daemon.WARM.misses == 2
+	assert "hits=2" in daemon.send_control("status")["stdout"]
+
+
+def test_no_daemon_falls_back(tmp_path: Path, monkeypatch):
+	monkeypatch.setenv("EV_PARLAY_SOCKET", str(tmp_path / "missing.sock"))
+	assert daemon.try_forward(["build-parlays", "--model", "x"]) is None
+	assert daemon.try_forward(["poll-odds"]) is None
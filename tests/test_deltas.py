@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import copy
+
+from ev_parlay.builder import greedy_beam_build, ilp_select
+from ev_parlay.config import AppConfig
+from ev_parlay.deltas import TicketReevaluator, diff_snapshots
+from ev_parlay.ev_math import attach_single_metrics
+from ev_parlay.models import TeamSelection
+from ev_parlay.odds_api import get_best_moneyline
+
+GAMES = [
+	("g1", "Jacksonville Jaguars", "JAX", -120, "Tennessee Titans", 100, 0.66),
+	("g2", "Green Bay Packers", "GB", -110, "Chicago Bears", -110, 0.62),
+	("g3", "Buffalo Bills", "BUF", -130, "Miami Dolphins", 110, 0.75),
+]
+
+
+def _payload(overrides=None):
+	overrides = overrides or {}
+	events = []
+	for gid, home, _, hp, away, ap, _p in GAMES:
+		events.append({
+			"id": gid,
+			"home_team": home,
+			"away_team": away,
+			"bookmakers": [{"key": "draftkings", "markets": [{"key": "h2h", "outcomes": [
+				{"name": home, "price": overrides.get(home, hp)},
+				{"name": away, "price": overrides.get(away, ap)},
+			]}]}],
+		})
+	return events
+
+
+def _slate(config, payload):
+	legs = []
+	for gid, home, ab, _hp, _away, _ap, p in GAMES:
+		s = TeamSelection(team_name=home, team_abbr=ab, game_id=gid, model_win_prob=p)
+		s.best_odds = get_best_moneyline(home, config, payload)
+		legs.append(attach_single_metrics(s))
+	return legs
+
+
+def test_diff_snapshots_reports_changed_prices():
+	config = AppConfig(sportsbooks=["draftkings"])
+	changes = diff_snapshots(_payload(), _payload({"Buffalo Bills": -125}), config)
+	assert [(c.team, c.book, c.old, c.new) for c in changes] == [("Buffalo Bills", "draftkings", -130, -125)]
+
+
+def test_reevaluator_updates_only_affected_tickets():
+	config = AppConfig(sportsbooks=["draftkings"], parlay_sizes=[2], max_tickets=2, team_exposure_cap=1.0)
+	payload = _payload()
+	legs = _slate(config, payload)
+	tickets = ilp_select(greedy_beam_build(legs, config), config)
+	assert tickets
+	before = copy.deepcopy([t.expected_value for t in tickets])
+
+	reeval = TicketReevaluator(legs, tickets, config, payload)
+	result = reeval.ingest(_payload({"Buffalo Bills": -120}))
+	assert result.changed_legs == ["BUF"]
+	assert result.updated_tickets and result.updated_tickets == reeval.leg_to_tickets["BUF"]
+	for i, t in enumerate(tickets):
+		if i in result.updated_tickets:
+			assert t.expected_value > before[i]
+		else:
+			assert t.expected_value == before[i]
+
+	# Moving a price on an opponent we never bet does nothing
+	assert reeval.ingest(_payload({"Buffalo Bills": -120, "Miami Dolphins": 105})).changed_legs == []
+
+
+def test_reevaluator_flags_rebuild_when_edge_collapses():
+	config = AppConfig(sportsbooks=["draftkings"], parlay_sizes=[2], max_tickets=2, team_exposure_cap=1.0)
+	payload = _payload()
+	legs = _slate(config, payload)
+	tickets = ilp_select(greedy_beam_build(legs, config), config)
+	reeval = TicketReevaluator(legs, tickets, config, payload)
+	result = reeval.ingest(_payload({"Green Bay Packers": -400, "Jacksonville Jaguars": -400, "Buffalo Bills": -400}))
+	assert result.needs_rebuild
+	assert result.reasons
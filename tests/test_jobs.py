@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from api.jobs import JobFailed, JobManager, QueueFull
+from ev_parlay import metrics
+
+
+def _sleep_then(value, seconds=0.0):
+	time.sleep(seconds)
+	return value
+
+
+def _record_trials(n):
+	metrics.enable()
+	metrics.SIM_TRIALS.inc(n)
+	return n
+
+
+def _fail(detail):
+	raise JobFailed(detail)
+
+
+def _wait(manager: JobManager, job_id: str, timeout: float = 10.0):
+	deadline = time.time() + timeout
+	while time.time() < deadline:
+		job = manager.get(job_id)
+		if job.finished:
+			return job
+		time.sleep(0.02)
+	raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_jobs_run_report_and_fail():
+	manager = JobManager(max_workers=1, max_queue=2)
+	try:
+		ok = manager.submit("build", _sleep_then, {"parlays": [1]})
+		bad = manager.submit("build", _fail, {"status_code": 400, "detail": "no odds"})
+		assert _wait(manager, ok.id).to_dict()["result"] == {"parlays": [1]}
+		failed = _wait(manager, bad.id)
+		assert failed.status == "failed" and failed.error == {"status_code": 400, "detail": "no odds"}
+	finally:
+		manager.shutdown()
+
+
+def test_queue_limit_and_cancellation():
+	manager = JobManager(max_workers=1, max_queue=1)
+	try:
+		running = manager.submit("build", _sleep_then, "slow", 0.5)
+		queued = manager.submit("build", _sleep_then, "never", 0.0)
+		with pytest.raises(QueueFull):
+			manager.submit("build", _sleep_then, "rejected")
+		# Cancelling frees a slot; a cancelled job never reports a result
+		assert manager.cancel(queued.id).status == "cancelled"
+		extra = manager.submit("simulate", _sleep_then, "extra")
+		assert _wait(manager, running.id).result == "slow"
+		assert _wait(manager, extra.id).result == "extra"
+		assert manager.get(queued.id).status == "cancelled" and manager.get(queued.id).result is None
+		assert manager.cancel("missing") is None
+	finally:
+		manager.shutdown()
+
+
+def test_cancelled_running_job_keeps_its_slot():
+	manager = JobManager(max_workers=1, max_queue=1)
+	try:
+		running = manager.submit("build", _sleep_then, "slow", 0.5)
+		queued = manager.submit("build", _sleep_then, "next", 0.0)
+		# Only the job a worker holds is reported running
+		assert running.status == "running" and manager.get(queued.id).status == "queued"
+		manager.cancel(running.id)
+		manager.cancel(queued.id)
+		# Still occupying the worker, so repeated submit + cancel cannot exceed the limit
+		manager.submit("build", _sleep_then, "waits", 0.0)
+		with pytest.raises(QueueFull):
+			manager.submit("build", _sleep_then, "rejected")
+		deadline = time.time() + 10
+		while manager.unfinished() > 1 and time.time() < deadline:
+			time.sleep(0.02)
+		after = manager.submit("build", _sleep_then, "after", 0.0)
+		assert _wait(manager, after.id).result == "after"
+		assert manager.get(running.id).status == "cancelled" and manager.get(running.id).result is None
+	finally:
+		manager.shutdown()
+
+
+def test_worker_metrics_reach_the_parent():
+	prev = metrics.ENABLED
+	metrics.enable()
+	metrics.REGISTRY.reset()
+	manager = JobManager(max_workers=1, max_queue=1)
+	try:
+		for n in (300, 200):
+			assert _wait(manager, manager.submit("simulate", _record_trials, n).id).result == n
+		assert metrics.SIM_TRIALS.value() == 500
+		assert metrics.JOBS.value("simulate", "done") == 2
+	finally:
+		manager.shutdown()
+		metrics.enable(prev)
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import numpy as np
+
+from ev_parlay.config import AppConfig
+from ev_parlay.ev_math import kelly_fraction
+from ev_parlay.kelly import fill_budget, joint_kelly_stakes, round_stakes, scenario_returns
+from ev_parlay.models import ParlayTicket
+from ev_parlay.pipeline import allocate_stakes
+from ev_parlay.synthetic import synthetic_slate, synthetic_tickets
+
+
+def _bet(p, dec):
+	return ParlayTicket(size=1, legs=[], combined_decimal=dec, combined_probability=p, expected_value=p * dec - 1.0, flat_stake=0.0, kelly_stake=0.0, books={})
+
+
+def test_single_ticket_matches_kelly_and_shared_legs_split_it():
+	bankroll = 1000.0
+	alone = joint_kelly_stakes([_bet(0.55, 2.0)], bankroll, budget=bankroll, max_stake=bankroll)
+	assert abs(alone[0] - bankroll * kelly_fraction(0.55, 2.0)) < 0.01
+
+	_, legs = synthetic_slate(8, 4, model_sd=0.08)
+	ticket = max(synthetic_tickets(50, legs, size=2), key=lambda t: t.expected_value)
+	single = joint_kelly_stakes([ticket], bankroll, budget=bankroll, max_stake=bankroll)
+	pair = joint_kelly_stakes([ticket, ticket.model_copy()], bankroll, budget=bankroll, max_stake=bankroll)
+	assert abs(pair.sum() - single[0]) < 0.01 * max(1.0, single[0])
+
+
+def test_exact_scenarios_are_merged_and_sum_to_one():
+	_, legs = synthetic_slate(6, 2)
+	tickets = synthetic_tickets(4, legs, size=2)
+	returns, weights = scenario_returns(tickets)
+	assert returns.shape[1] == 4 and returns.shape[0] <= 16
+	assert abs(weights.sum() - 1.0) < 1e-12
+	win_prob = ((returns > 0) * weights[:, None]).sum(axis=0)
+	assert np.allclose(win_prob, [t.combined_probability for t in tickets])
+
+
+def test_kelly_joint_respects_budget_and_bounds():
+	_, legs = synthetic_slate(16, 6, model_sd=0.08)
+	tickets = [t for t in synthetic_tickets(200, legs, size=3) if t.expected_value > 0][:8]
+	config = AppConfig(run_budget=100.0, desired_num_tickets=8, stake_method="kelly_joint", max_stake_pct=0.25, min_stake=1.0)
+	stakes = [t.flat_stake for t in allocate_stakes(tickets, config)]
+	assert len(stakes) == 8
+	assert min(stakes) >= 1.0 and max(stakes) <= 25.0
+	assert round(sum(stakes), 2) <= 100.0
+
+
+def test_round_stakes_never_rounds_past_budget():
+	raw = np.array([33.335, 33.335, 33.33])
+	assert round(sum(round_stakes(raw, 100.0, 1.0, 50.0)), 2) == 100.0
+
+
+def test_fill_budget_spreads_leftovers_in_one_pass():
+	stakes = fill_budget(np.array([1000.0, 1.0, 1.0, 0.0]), budget=10000.0, lo=0.01, hi=4000.0)
+	assert abs(stakes.sum() - 10000.0) < 1e-6
+	assert stakes[0] == 4000.0 and abs(stakes[1] - stakes[2]) < 1e-9
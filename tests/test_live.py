@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+
+from api.main import LIVE_MAX_TRIALS, LiveRequest, api_live
+from ev_parlay.live import LiveSlate, load_updates
+from ev_parlay.synthetic import synthetic_slate, synthetic_tickets
+from ev_parlay.ticket_archive import TicketArchive
+
+
+def _tickets(n: int = 30, size: int = 3):
+	_, legs = synthetic_slate(10, 5, model_sd=0.08)
+	return synthetic_tickets(n, legs, size=size)
+
+
+def _expected(tickets, results, probs=None):
+	out = []
+	for t in tickets:
+		p = 1.0
+		for leg in t.legs:
+			won = results.get(leg.team_abbr)
+			p *= (1.0 if won else 0.0) if won is not None else (probs or {}).get(leg.team_abbr, leg.model_win_prob)
+		out.append(p)
+	return np.array(out)
+
+
+def test_updates_touch_only_affected_tickets():
+	tickets = _tickets()
+	live = LiveSlate(TicketArchive.from_tickets(tickets))
+	assert np.allclose(live.prob, [t.combined_probability for t in tickets])
+
+	first = tickets[0].legs[0].team_abbr
+	holding = sum(first in t.teams for t in tickets)
+	assert live.update(results={first: True}) == holding < len(tickets)
+	assert live.update(results={first: True}) == 0  # already settled
+
+	second, third = tickets[1].legs[0].team_abbr, tickets[2].legs[1].team_abbr
+	live.update(results={second: False}, probs={third: 0.9})
+	results = {first: True, second: False}
+	assert np.allclose(live.prob, _expected(tickets, results, {third: 0.9}))
+	rows = live.ticket_rows()
+	assert all(r["status"] == "lost" and r["probability"] == 0.0 for r in rows if second in r["teams"])
+
+
+def test_cached_leg_counts_follow_corrections():
+	tickets = _tickets()
+	live = LiveSlate(TicketArchive.from_tickets(tickets))
+	a, b = tickets[0].legs[0].team_abbr, tickets[0].legs[1].team_abbr
+	live.update(results={a: True, b: True})
+	live.update(results={a: False})  # corrected result
+	results = {a: False, b: True}
+	for t, row in zip(tickets, live.ticket_rows()):
+		assert row["open_legs"] == sum(leg.team_abbr not in results for leg in t.legs)
+		assert (row["status"] == "lost") == (a in t.teams)
+
+
+def test_no_vig_odds_and_hedge_locks_profit():
+	tickets = _tickets(1, size=2)
+	leg, last = tickets[0].legs
+	live = LiveSlate(TicketArchive.from_tickets(tickets))
+	live.update(results={leg.team_abbr: True}, odds={last.team_abbr: -150, last.opponent_abbr: 130})
+	implied = 0.6 / (0.6 + 100.0 / 230.0)
+	assert live.prob[0] == pytest.approx(implied)
+
+	(hedge,) = live.hedges()
+	assert hedge["hedge_on"] == last.opponent_abbr and hedge["hedge_decimal"] == pytest.approx(2.3)
+	stake, payout = live.stakes[0], hedge["payout"]
+	# Same profit whichever side wins
+	assert payout - stake - hedge["hedge_stake"] == pytest.approx(hedge["hedge_stake"] * 1.3 - stake, abs=0.02)
+
+	live.update(results={last.team_abbr: True})
+	assert live.hedges() == []
+	profit = live.profit(trials=500)
+	assert profit["p05"] == profit["p95"] == pytest.approx(payout - stake)
+
+
+def test_load_updates(tmp_path: Path):
+	path = tmp_path / "live.csv"
+	path.write_text("team,won,odds,prob\nKC,W,,\nBUF,,-120,\nMIA,,,0.3\nDAL,push,,\n", encoding="utf-8")
+	results, odds, probs = load_updates(path)
+	assert results == {"KC": True}
+	assert odds == {"BUF": -120}
+	assert probs == {"MIA": 0.3}
+	# Typos fail loudly; abbreviations already on the tickets pass through
+	path.write_text("team,won\nKansas City Chefs,W\nT1,L\n", encoding="utf-8")
+	with pytest.raises(ValueError, match="Unknown team\\(s\\): T1"):
+		load_updates(path)
+	assert load_updates(path, known=["T1"])[0] == {"KC": True, "T1": False}
+	path.write_text("team,won\nFoo Bar,W\n", encoding="utf-8")
+	with pytest.raises(ValueError, match="Foo Bar"):
+		load_updates(path, known=["T1"])
+
+
+def test_api_live_is_incremental():
+	tickets = _tickets(12)
+	team = tickets[0].legs[0].team_abbr
+	first = api_live(LiveRequest(parlays=tickets, trials=200, reset=True))
+	assert first.touched == 0 and first.recomputed == len(tickets)
+	second = api_live(LiveRequest(parlays=tickets, results={team: False}, trials=200))
+	assert second.touched == sum(team in t.teams for t in tickets)
+	assert second.recomputed == len(tickets) + second.touched
+	assert second.settled == {team: False}
+	assert all(r["status"] == "lost" for r in second.tickets if team in r["teams"])
+	with pytest.raises(HTTPException) as e:
+		api_live(LiveRequest(parlays=tickets, trials=LIVE_MAX_TRIALS + 1))
+	assert e.value.status_code == 400
+	with pytest.raises(HTTPException) as e:
+		api_live(LiveRequest(parlays=tickets, results={"Foo Bar": True}, trials=200))
+	assert e.value.status_code == 400
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import pytest
+
+from ev_parlay import metrics
+from ev_parlay.builder import greedy_beam_build
+from ev_parlay.config import AppConfig
+from ev_parlay.metrics import Registry
+from ev_parlay.synthetic import synthetic_legs
+
+
+@pytest.fixture()
+def enabled():
+	prev = metrics.ENABLED
+	metrics.enable()
+	metrics.REGISTRY.reset()
+	yield
+	metrics.enable(prev)
+
+
+def test_exposition_format(enabled):
+	reg = Registry()
+	c = reg.counter("demo_total", "Demo counter", ("outcome",))
+	h = reg.histogram("demo_seconds", "Demo latency", buckets=(0.1, 1.0))
+	c.inc(2, "hit")
+	c.inc(1, 'odd"label')
+	h.observe(0.05)
+	h.observe(0.5)
+	h.observe(3.0)
+	text = reg.render()
+	assert "# TYPE demo_total counter" in text
+	assert 'demo_total{outcome="hit"} 2' in text
+	assert 'demo_total{outcome="odd\\"label"} 1' in text
+	assert 'demo_seconds_bucket{le="0.1"} 1' in text
+	assert 'demo_seconds_bucket{le="1"} 2' in text
+	assert 'demo_seconds_bucket{le="+Inf"} 3' in text
+	assert "demo_seconds_count 3" in text and "demo_seconds_sum 3.55" in text
+
+
+def test_export_merges_into_another_registry(enabled):
+	worker, parent = Registry(), Registry()
+	for reg in (worker, parent):
+		reg.counter("jobs_total", "Jobs", ("kind",))
+		reg.histogram("job_seconds", "Job time", buckets=(1.0,))
+	worker.get("jobs_total").inc(2, "build")
+	worker.get("job_seconds").observe(0.5)
+	parent.get("jobs_total").inc(1, "build")
+	parent.merge(worker.export())
+	parent.merge(worker.export())
+	assert parent.get("jobs_total").value("build") == 5
+	assert parent.get("job_seconds").count() == 2
+	assert 'job_seconds_bucket{le="1"} 2' in parent.render()
+
+
+def test_disabled_metrics_record_nothing():
+	prev = metrics.ENABLED
+	metrics.enable(False)
+	try:
+		reg = Registry()
+		c = reg.counter("off_total", "Off")
+		c.inc()
+		assert c.value() == 0.0 and reg.render() == "# HELP off_total Off\n# TYPE off_total counter\n"
+	finally:
+		metrics.enable(prev)
+
+
+@pytest.mark.parametrize("large_slate", [False, True])
+def test_beam_counts_evaluated_and_pruned(enabled, large_slate):
+	config = AppConfig(parlay_sizes=[2, 3], beam_width=5, large_slate=large_slate)
+	greedy_beam_build(synthetic_legs(24, legs_per_game=2, seed=5), config)
+	mode = "large_slate" if large_slate else "beam"
+	evaluated = metrics.BEAM_EVALUATED.value(mode)
+	pruned = metrics.BEAM_PRUNED.value(mode)
+	assert evaluated > 0 and 0 < pruned <= evaluated
+
+
+def test_metrics_endpoint_reports_stage_latency(enabled):
+	from api.main import api_metrics
+	from ev_parlay.pipeline import SlatePipeline
+
+	SlatePipeline(AppConfig()).parse(lambda: synthetic_legs(3))
+	body = api_metrics().body.decode("utf-8")
+	assert 'ev_parlay_stage_seconds_count{stage="parse"} 1' in body
+	assert "# TYPE ev_parlay_ilp_solve_seconds histogram" in body
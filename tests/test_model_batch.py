@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from ev_parlay.model_batch import blend, load_models, parse_weights
+
+
+def _write_inputs(tmp_path: Path):
+	(tmp_path / "elo_week5.txt").write_text(":Jaguars: JAX – 60% | Margin: 4.0\n:Packers: GB – 70%\n", encoding="utf-8")
+	(tmp_path / "sim_week5.csv").write_text("team,prob,margin\njaguars,0.70,6.0\nBUF,65.5,\n", encoding="utf-8")
+	(tmp_path / "elo_week6.json").write_text(json.dumps([{"team": "JAX", "probability": 0.5}]), encoding="utf-8")
+	return sorted(tmp_path.iterdir())
+
+
+def test_load_models_builds_columnar_table(tmp_path: Path):
+	table = load_models(_write_inputs(tmp_path))
+	assert len(table) == 5
+	assert set(table.model_ids) == {"elo", "sim"}
+	assert sorted(set(table.week.tolist())) == [5, 6]
+	week5 = table.select(week=5, model_id="sim")
+	assert week5.team.tolist() == ["Jacksonville Jaguars", "Buffalo Bills"]
+	assert week5.prob.tolist() == pytest.approx([0.70, 0.655])
+
+
+def test_blend_weights_renormalize_per_team(tmp_path: Path):
+	table = load_models(_write_inputs(tmp_path))
+	with pytest.raises(ValueError):
+		blend(table)
+	picks = {s.team_abbr: s for s in blend(table, {"elo": 0.75, "sim": 0.25}, week=5)}
+	assert picks["JAX"].model_win_prob == pytest.approx(0.75 * 0.60 + 0.25 * 0.70)
+	assert picks["JAX"].margin == pytest.approx(0.75 * 4.0 + 0.25 * 6.0)
+	# Only one model rates GB/BUF, so its probability passes through unchanged
+	assert picks["GB"].model_win_prob == pytest.approx(0.70)
+	assert picks["BUF"].model_win_prob == pytest.approx(0.655)
+	assert picks["BUF"].margin is None
+
+
+def test_parse_weights():
+	assert parse_weights("0.6,0.4", ["elo", "sim"]) == {"elo": 0.6, "sim": 0.4}
+	assert parse_weights("sim=2", ["elo", "sim"]) == {"sim": 2.0}
+	assert parse_weights(None, ["elo"]) is None
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import io
+import json
+
+from ev_parlay.config import AppConfig
+from ev_parlay.odds_api import OddsIndex, build_game_index, get_best_moneyline
+from ev_parlay.odds_stream import iter_events, stream_odds
+from ev_parlay.synthetic import synthetic_payload
+
+
+def test_iter_events_small_chunks_roundtrip():
+	payload = synthetic_payload(5, markets=("h2h", "totals"))
+	text = json.dumps(payload, indent=1)
+	assert list(iter_events(io.StringIO(text), chunk_size=7)) == payload
+	assert list(iter_events(io.StringIO("  [ ]"))) == []
+
+
+def test_stream_odds_filters_and_matches_full_parse():
+	payload = synthetic_payload(8, markets=("h2h", "spreads", "totals"))
+	for ev in payload[:2]:
+		ev["home_team"], ev["away_team"] = "Jacksonville Jaguars", "Green Bay Packers"
+		for bk in ev["bookmakers"]:
+			bk["markets"][0]["outcomes"][0]["name"] = "Jacksonville Jaguars"
+			bk["markets"][0]["outcomes"][1]["name"] = "Green Bay Packers"
+	config = AppConfig(sportsbooks=["DK", "fanduel"])
+	events, index = stream_odds(io.StringIO(json.dumps(payload)), config, OddsIndex(config))
+
+	assert {bk["key"] for ev in events for bk in ev["bookmakers"]} == {"draftkings", "fanduel"}
+	assert {m["key"] for ev in events for bk in ev["bookmakers"] for m in bk["markets"]} == {"h2h"}
+	assert index.game_index == build_game_index(payload)
+	for team in ("Jacksonville Jaguars", "Green Bay Packers", "Team 5", "Team 9", "Nobody"):
+		assert index.best_moneyline(team) == get_best_moneyline(team, config, payload)
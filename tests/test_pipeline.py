@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import pytest
+
+from ev_parlay.config import AppConfig
+from ev_parlay.models import ParlayTicket
+from ev_parlay.odds_api import OddsIndex
+from ev_parlay.parser import parse_model_text
+from ev_parlay.pipeline import STAGES, SlateError, SlatePipeline, allocate_stakes
+
+
+def _game(gid, home, away, home_price, away_price):
+	return {
+		"id": gid,
+		"home_team": home,
+		"away_team": away,
+		"bookmakers": [{"key": "draftkings", "markets": [{"key": "h2h", "outcomes": [
+			{"name": home, "price": home_price},
+			{"name": away, "price": away_price},
+		]}]}],
+	}
+
+
+PAYLOAD = [
+	_game("g1", "Jacksonville Jaguars", "Green Bay Packers", -110, -110),
+	_game("g2", "Buffalo Bills", "Miami Dolphins", 120, -140),
+	_game("g3", "Detroit Lions", "Chicago Bears", -105, -115),
+]
+
+
+def test_pipeline_runs_all_stages_and_resolves_conflicts():
+	config = AppConfig(sportsbooks=["draftkings"], parlay_sizes=[2, 3], desired_num_tickets=2, run_budget=50.0)
+	picks = parse_model_text("Jaguars 60%\nPackers 66%\nBills 58%\nLions 62%")
+	pipeline = SlatePipeline(config)
+	legs, tickets = pipeline.run(lambda: picks, lambda: OddsIndex.from_payload(PAYLOAD, config))
+
+	# Same game: the higher-probability pick wins and keeps the first pick's slot
+	assert [l.team_abbr for l in legs] == ["GB", "BUF", "DET"]
+	assert pipeline.conflicts == [("GB", "JAX")]
+	assert picks[1].game_id is None  # inputs are not mutated
+	assert legs[0].game_id == "g1" and legs[0].opponent_abbr == "JAX"
+	assert [row["stage"] for row in pipeline.timings()] == list(STAGES)
+	assert pipeline.stats["validate"].items == 3
+	# Stakes honour max_stake_pct (default 40% of the budget per ticket)
+	assert [t.flat_stake for t in tickets] == [20.0, 20.0]
+
+
+def test_validate_reports_missing_teams():
+	config = AppConfig(sportsbooks=["draftkings"])
+	pipeline = SlatePipeline(config)
+	with pytest.raises(SlateError) as exc:
+		pipeline.validate(parse_model_text("Jaguars 60%\nRams 55%"), OddsIndex.from_payload(PAYLOAD, config))
+	assert [ab for _, ab in exc.value.missing] == ["LAR"]
+
+
+def test_allocate_stakes_respects_cap_and_min():
+	tickets = [
+		ParlayTicket(size=2, legs=[], combined_decimal=3.0, combined_probability=0.4, expected_value=ev, flat_stake=10.0, kelly_stake=k, books={})
+		for ev, k in ((0.5, 90.0), (0.1, 5.0), (0.05, 5.0))
+	]
+	config = AppConfig(run_budget=100.0, desired_num_tickets=3, max_stake_pct=0.5, min_stake=10.0)
+	stakes = [t.flat_stake for t in allocate_stakes(tickets, config)]
+	assert max(stakes) <= 50.0 and min(stakes) >= 10.0
+	assert abs(sum(stakes) - 100.0) < 0.02
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from ev_parlay.config import AppConfig
+from ev_parlay.odds_api import OddsIndex, fetch_odds, fresh_until_path
+from ev_parlay.poller import OddsPoller
+from ev_parlay.snapshot_store import to_epoch
+
+T0 = to_epoch("2025-09-28T10:00:00Z")
+
+
+class FakeClock:
+	def __init__(self, now: float):
+		self.now = now
+		self.sleeps = []
+
+	def time(self) -> float:
+		return self.now
+
+	def sleep(self, seconds: float) -> None:
+		self.sleeps.append(seconds)
+		self.now += seconds
+
+
+def _event(gid: str, kickoff: str, home: str, away: str):
+	return {
+		"id": gid,
+		"commence_time": kickoff,
+		"home_team": home,
+		"away_team": away,
+		"bookmakers": [{"key": "draftkings", "markets": [{"key": "h2h", "outcomes": [
+			{"name": home, "price": -120},
+			{"name": away, "price": 100},
+		]}]}],
+	}
+
+
+EVENTS = [
+	_event("early", "2025-09-28T13:00:00Z", "Jacksonville Jaguars", "Tennessee Titans"),
+	_event("late", "2025-09-28T20:25:00Z", "Green Bay Packers", "Chicago Bears"),
+]
+
+
+@pytest.fixture()
+def stub_server():
+	state = {"remaining": 500, "requests": [], "events": EVENTS}
+
+	class Handler(BaseHTTPRequestHandler):
+		def do_GET(self):
+			params = parse_qs(urlparse(self.path).query)
+			state["requests"].append(params)
+			cutoff = to_epoch(params["commenceTimeFrom"][0])
+			body = json.dumps([e for e in state["events"] if to_epoch(e["commence_time"]) > cutoff]).encode()
+			state["remaining"] -= 1
+			self.send_response(200)
+			self.send_header("Content-Type", "application/json")
+			self.send_header("x-requests-remaining", str(state["remaining"]))
+			self.send_header("x-requests-used", str(500 - state["remaining"]))
+			self.send_header("x-requests-last", "1")
+			self.end_headers()
+			self.wfile.write(body)
+
+		def log_message(self, *args):
+			pass
+
+	server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+	thread = threading.Thread(target=server.serve_forever, daemon=True)
+	thread.start()
+	yield f"http://127.0.0.1:{server.server_address[1]}/odds", state
+	server.shutdown()
+
+
+def _config(base: str) -> AppConfig:
+	return AppConfig(odds_api_key="test", odds_api_base=base)
+
+
+def test_poller_speeds_up_near_kickoff_and_stops_after_start(tmp_path: Path, stub_server):
+	base, state = stub_server
+	clock = FakeClock(T0)
+	cache = tmp_path / "odds.json"
+	poller = OddsPoller(_config(base), cache_file=str(cache), clock=clock.time, sleep=clock.sleep)
+	polls = poller.run()
+
+	assert polls == len(state["requests"])
+	# 3h before the first game: 5-minute tier; final hour: one-minute polls
+	assert clock.sleeps[0] == 300
+	assert 60 in clock.sleeps
+	assert clock.now >= to_epoch("2025-09-28T20:25:00Z")
+	# Started games are no longer requested but keep their last cached prices
+	last_cutoff = to_epoch(state["requests"][-1]["commenceTimeFrom"][0])
+	assert last_cutoff > to_epoch("2025-09-28T13:00:00Z")
+	assert {e["id"] for e in json.loads(cache.read_text())} == {"early", "late"}
+	assert poller.quota.remaining == state["remaining"]
+
+
+def test_poller_stretches_interval_to_fit_quota(tmp_path: Path, stub_server):
+	base, state = stub_server
+	state["remaining"] = 40
+	clock = FakeClock(T0)
+	config = _config(base)
+	config.poll_quota_reserve = 30
+	poller = OddsPoller(config, cache_file=str(tmp_path / "odds.json"), clock=clock.time, sleep=clock.sleep)
+	poller.run()
+	# Never dips into the reserve
+	assert state["remaining"] >= 30
+	assert len(state["requests"]) <= 10
+
+
+def test_build_between_polls_reads_the_cache(tmp_path: Path, stub_server):
+	base, state = stub_server
+	now = time.time()
+	# Kickoff 10h out: the poller's next poll is 30 minutes away, far beyond ttl_seconds
+	state["events"] = [_event("future", time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now + 10 * 3600)), "Green Bay Packers", "Chicago Bears")]
+	config = _config(base)
+	cache = tmp_path / "odds.json"
+	builds = []
+
+	def between_polls(seconds: float) -> None:
+		assert seconds == 1800
+		stale = time.time() - 2 * config.ttl_seconds
+		os.utime(cache, (stale, stale))
+		builds.append(fetch_odds(config, cache_override=str(cache)))
+		poller.stop_event.set()
+
+	poller = OddsPoller(config, cache_file=str(cache), sleep=between_polls)
+	poller.run()
+	assert builds == [state["events"]]
+	assert len(state["requests"]) == 1  # the build made no request of its own
+	# Once the poller stops, the cache falls back to its ttl
+	assert not fresh_until_path(cache).exists()
+
+
+def test_live_fetch_streams_into_index(tmp_path: Path, stub_server):
+	base, _ = stub_server
+	config = _config(base)
+	config.commence_from_iso = "2025-09-28T00:00:00Z"
+	index = OddsIndex(config)
+	payload = fetch_odds(config, cache_override=str(tmp_path / "odds.json"), index=index)
+	assert payload == EVENTS
+	assert json.loads((tmp_path / "odds.json").read_text(encoding="utf-8")) == EVENTS
+	assert index.game_index == OddsIndex.from_payload(EVENTS, config).game_index
+	assert index.best_moneyline("Green Bay Packers") is not None
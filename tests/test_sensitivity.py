@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+
+from api.main import SENSITIVITY_MAX_DRAWS, BuildRequest, api_build, api_build_stream
+from ev_parlay.ev_math import parlay_probability
+from ev_parlay.kelly import leg_index
+from ev_parlay.model_batch import ModelTable
+from ev_parlay.sensitivity import draw_probabilities, sensitivity, ticket_ev_draws
+from ev_parlay.synthetic import synthetic_slate, synthetic_tickets
+
+from helpers import WEEK, write_slate
+
+
+def _tickets(n: int = 6):
+	_, legs = synthetic_slate(12, 5, model_sd=0.08)
+	return synthetic_tickets(n, legs, size=3)
+
+
+def test_zero_error_reproduces_point_ev():
+	tickets = _tickets()
+	keys, probs, membership = leg_index(tickets)
+	draws = draw_probabilities(probs, 4, "normal", sd=0.0)
+	P, EV = ticket_ev_draws(tickets, draws, membership)
+	assert np.allclose(P, [t.combined_probability for t in tickets])
+	assert np.allclose(EV, [t.expected_value for t in tickets])
+	rows = sensitivity(tickets, draws=10, sd=0.0)
+	assert all(r["ev_sd"] == pytest.approx(0.0, abs=1e-12) for r in rows)
+	assert [r["p_negative"] for r in rows] == [float(t.expected_value < 0) for t in tickets]
+
+
+def test_correlated_draws_match_parlay_probability():
+	tickets = _tickets()
+	keys, probs, membership = leg_index(tickets)
+	draws = draw_probabilities(probs, 50, "beta", sd=0.05, seed=3)
+	P, _ = ticket_ev_draws(tickets, draws, membership, rho=0.2)
+	col = {k: j for j, k in enumerate(keys)}
+	for d in (0, 49):
+		expected = [parlay_probability([draws[d, col[(l.team_abbr, l.game_id)]] for l in t.legs], 0.2) for t in tickets]
+		assert np.allclose(P[d], expected)
+
+
+def test_draws_centre_on_point_probability():
+	tickets = _tickets()
+	_, probs, _ = leg_index(tickets)
+	probs = probs[(probs > 0.1) & (probs < 0.9)]  # away from the clipped edges
+	for method in ("normal", "beta"):
+		draws = draw_probabilities(probs, 20000, method, sd=0.03, seed=1)
+		assert draws.shape == (20000, probs.shape[0])
+		assert np.allclose(draws.mean(axis=0), probs, atol=0.003)
+		assert np.allclose(draws.std(axis=0), 0.03, atol=0.003)
+	rows = sensitivity(tickets, draws=2000, method="beta", sd=0.05)
+	for r in rows:
+		assert r["ev_p05"] <= r["ev_p50"] <= r["ev_p95"]
+		assert 0.0 <= r["p_negative"] <= 1.0
+		assert r["kelly_p05"] <= r["kelly_p95"]
+
+
+def test_bootstrap_resamples_models():
+	tickets = _tickets(3)
+	keys, _, _ = leg_index(tickets)
+	teams = np.array([ab for ab, _ in keys] * 2, dtype=object)
+	n = len(keys)
+	table = ModelTable(
+		team=teams, team_abbr=teams, week=np.full(2 * n, 1, dtype=np.int32),
+		model_id=np.array(["a"] * n + ["b"] * n, dtype=object),
+		prob=np.array([0.4] * n + [0.6] * n), margin=np.full(2 * n, np.nan),
+	)
+	rows = sensitivity(tickets, draws=500, method="bootstrap", table=table)
+	assert all(r["ev_sd"] > 0 for r in rows)
+	with pytest.raises(ValueError):
+		sensitivity(tickets, draws=10, method="bootstrap")
+	with pytest.raises(ValueError):
+		sensitivity(tickets, draws=10, method="uniform")
+
+
+def test_build_attaches_sensitivity(tmp_path: Path, monkeypatch):
+	monkeypatch.chdir(tmp_path)
+	base = dict(model_text=write_slate(tmp_path), week=WEEK, sportsbooks=["draftkings", "fanduel"], desired_num_tickets=4, parlay_sizes=[2, 3])
+	plain = api_build(BuildRequest(**base))
+	assert plain.sensitivity is None
+	res = api_build(BuildRequest(**base, sensitivity="normal", sensitivity_draws=500))
+	assert res.parlays == plain.parlays
+	assert len(res.sensitivity) == len(res.parlays)
+	assert [r["teams"] for r in res.sensitivity] == [[l["team_abbr"] for l in p["legs"]] for p in res.parlays]
+
+
+def test_build_rejects_bad_sensitivity_settings_up_front():
+	bad = [
+		dict(sensitivity="normal", sensitivity_draws=SENSITIVITY_MAX_DRAWS + 1),
+		dict(sensitivity="gaussian"),
+		dict(sensitivity="beta", sensitivity_sd=-0.01),
+	]
+	for fields in bad:
+		# Rejected before the slate is read (the model text here would not parse)
+		with pytest.raises(HTTPException) as e:
+			api_build_stream(BuildRequest(model_text="x", **fields))
+		assert e.value.status_code == 400 and "sensitivity" in e.value.detail["error"]
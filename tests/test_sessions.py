@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import api.main as api_main
+import ev_parlay.pipeline as pipeline_mod
+from api.main import BuildRequest, api_build
+from api.sessions import SlateCache, SlateSession
+from helpers import WEEK, write_slate
+
+
+class FakeClock:
+	def __init__(self):
+		self.now = 0.0
+
+	def __call__(self) -> float:
+		return self.now
+
+
+def test_slate_cache_ttl_and_lru():
+	clock = FakeClock()
+	cache = SlateCache(max_entries=2, ttl_seconds=10, clock=clock)
+	for key in ("a", "b"):
+		cache.put(SlateSession(key, [], None))
+	assert cache.get("a") is not None  # "b" is now least recently used
+	cache.put(SlateSession("c", [], None))
+	assert cache.get("b") is None and len(cache) == 2
+	clock.now = 11
+	assert cache.get("a") is None and cache.get("c") is None
+
+
+def test_builds_reuse_prepared_slate_and_beams(tmp_path: Path, monkeypatch):
+	monkeypatch.chdir(tmp_path)
+	monkeypatch.setattr(api_main, "slates", SlateCache())
+	model_text = write_slate(tmp_path)
+	calls = {"parse": 0, "beam": 0}
+	real_parse, real_beam = api_main.parse_model_text, pipeline_mod.greedy_beam_build
+
+	def counting_parse(text):
+		calls["parse"] += 1
+		return real_parse(text)
+
+	def counting_beam(legs, config):
+		calls["beam"] += 1
+		return real_beam(legs, config)
+
+	monkeypatch.setattr(api_main, "parse_model_text", counting_parse)
+	monkeypatch.setattr(pipeline_mod, "greedy_beam_build", counting_beam)
+	base = dict(model_text=model_text, week=WEEK, sportsbooks=["draftkings", "fanduel"], desired_num_tickets=4, parlay_sizes=[2, 3])
+
+	first = api_build(BuildRequest(**base))
+	assert calls == {"parse": 1, "beam": 2}
+	# Only the staking changed: nothing upstream is recomputed
+	second = api_build(BuildRequest(**base, budget=300.0))
+	assert calls == {"parse": 1, "beam": 2} and second.session == first.session
+	assert [p["legs"] for p in second.parlays] == [p["legs"] for p in first.parlays]
+	assert sum(p["flat_stake"] for p in second.parlays) > sum(p["flat_stake"] for p in first.parlays)
+	# One new size: only its beam runs
+	api_build(BuildRequest(**{**base, "parlay_sizes": [2, 3, 4]}))
+	assert calls == {"parse": 1, "beam": 3}
+
+	# New odds snapshot (file rewritten) -> slate is prepared again
+	cache_file = tmp_path / f".odds_cache_week{WEEK}_all.json"
+	os.utime(cache_file, ns=(0, cache_file.stat().st_mtime_ns + 1_000_000))
+	third = api_build(BuildRequest(**base))
+	assert calls == {"parse": 2, "beam": 5} and third.session != first.session
+	assert third.parlays == first.parlays
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import numpy as np
+
+from ev_parlay.builder import _parlay_ev
+from ev_parlay.config import AppConfig
+from ev_parlay.slate_arrays import SlateArrays
+from ev_parlay.synthetic import synthetic_slate
+
+
+def test_records_match_pydantic_scoring():
+	_, legs = synthetic_slate(8, 4)
+	arrays = SlateArrays(legs)
+	assert len(arrays.games) == 8 and arrays.prob.dtype == np.float64 and arrays.book.dtype == np.int16
+	combos = [(0, 2, 5), (1, 3, 6, 9), (4, 11)]
+	for rho in (0.0, 0.15):
+		for c in combos:
+			assert arrays.evaluate(c, rho) == _parlay_ev([legs[i] for i in c], rho)
+		P, D, EV = arrays.evaluate_many(np.array([(0, 2, 5), (1, 3, 7)]), rho)
+		assert np.allclose(EV, [arrays.evaluate(c, rho)[2] for c in ((0, 2, 5), (1, 3, 7))])
+
+	rec = arrays.record((0, 2, 5))
+	assert rec.mask == 0b100101 and rec.size == 3
+	ticket = arrays.to_ticket(rec, AppConfig(bankroll=1000.0, flat_stake=5.0))
+	assert ticket.legs[0] is legs[0] and ticket.teams == [legs[i].team_abbr for i in (0, 2, 5)]
+	assert ticket.combined_probability == rec.probability and ticket.flat_stake == 5.0
+
+
+def test_leg_without_odds_scores_minus_infinity():
+	_, legs = synthetic_slate(4, 2)
+	legs[1] = legs[1].model_copy(update={"best_odds": None})
+	arrays = SlateArrays(legs)
+	assert arrays.evaluate((0, 1)) == _parlay_ev([legs[0], legs[1]], 0.0)
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from ev_parlay.snapshot_store import SnapshotStore, load_payload
+
+
+def _payload(jax_price: int):
+	return [
+		{
+			"id": "evt1",
+			"commence_time": "2025-09-28T17:00:00Z",
+			"home_team": "Jacksonville Jaguars",
+			"away_team": "Green Bay Packers",
+			"bookmakers": [
+				{
+					"key": "draftkings",
+					"markets": [
+						{
+							"key": "h2h",
+							"outcomes": [
+								{"name": "Jacksonville Jaguars", "price": jax_price},
+								{"name": "Green Bay Packers", "price": 120},
+							],
+						},
+						{
+							"key": "spreads",
+							"outcomes": [
+								{"name": "Jacksonville Jaguars", "price": -110, "point": -2.5},
+								{"name": "Green Bay Packers", "price": -110, "point": 2.5},
+							],
+						},
+					],
+				},
+				{
+					"key": "fanduel",
+					"markets": [
+						{
+							"key": "h2h",
+							"outcomes": [
+								{"name": "Jacksonville Jaguars", "price": jax_price + 5},
+								{"name": "Green Bay Packers", "price": 115},
+							],
+						}
+					],
+				},
+			],
+		}
+	]
+
+
+def test_roundtrip_payload(tmp_path: Path):
+	store = SnapshotStore(tmp_path / "snaps")
+	first = store.append(_payload(-150), ts="2025-09-27T12:00:00Z", week=4)
+	second = store.append(_payload(-140), ts="2025-09-28T12:00:00Z", week=4)
+	assert (first, second) == (0, 1)
+
+	reopened = SnapshotStore(tmp_path / "snaps")
+	assert reopened.payload(first) == _payload(-150)
+	assert reopened.payload(second) == _payload(-140)
+	# Latest snapshot at or before the cutoff
+	assert load_payload(tmp_path / "snaps", at="2025-09-27T23:00:00Z") == _payload(-150)
+	assert load_payload(tmp_path / "snaps", week=4) == _payload(-140)
+
+
+def test_query_filters(tmp_path: Path):
+	store = SnapshotStore(tmp_path / "snaps")
+	store.append(_payload(-150), ts=1000, week=3)
+	store.append(_payload(-140), ts=2000, week=4)
+
+	rows = store.query(team="JAX", book="DK", market="h2h")
+	assert rows.columns["price"].tolist() == [-150, -140]
+	assert rows.columns["ts"].tolist() == [1000, 2000]
+
+	week4 = store.query(week=4, book="fanduel")
+	assert len(week4) == 2
+	assert {r["team"] for r in week4.to_records()} == {"Jacksonville Jaguars", "Green Bay Packers"}
+
+	assert len(store.query(start=1500, end=2500, market="spreads")) == 2
+	assert len(store.query(start=3000)) == 0
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import csv
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from ev_parlay.backtest import discover_weeks
+from ev_parlay.cli import app
+from ev_parlay.config import AppConfig
+from ev_parlay.sweep import expand, iter_sweep, parse_param, prepare_slates, score
+from ev_parlay.synthetic import synthetic_slate, synthetic_tickets
+
+
+def test_expand_grid_and_random_subset():
+	space = dict([parse_param("beam_width=10,50"), parse_param("parlay_sizes=2-3,2-4"), parse_param("correlation_rho=0,0.1")])
+	assert space["parlay_sizes"] == [[2, 3], [2, 3, 4]]
+	grid = expand(space)
+	assert len(grid) == 8 and grid[0] == {"beam_width": 10, "parlay_sizes": [2, 3], "correlation_rho": 0.0}
+	picked = expand(space, samples=3, seed=1)
+	assert len(picked) == 3 and all(p in grid for p in picked)
+	assert picked == expand(space, samples=3, seed=1)
+
+
+def test_unknown_choices_are_rejected(season: Path):
+	with pytest.raises(ValueError, match="Unknown selector 'bogus'"):
+		parse_param("selector=ilp,bogus")
+	with pytest.raises(ValueError, match="Unknown stake_method 'bogus'"):
+		parse_param("stake_method=bogus")
+	result = CliRunner().invoke(app, ["sweep", str(season), "--param", "selector=bogus"])
+	assert result.exit_code == 0
+	assert result.stdout.strip() == "Unknown selector 'bogus'; expected one of ilp, colgen"
+
+
+def test_log_growth_ranks_ruinous_stakes_last():
+	_, legs = synthetic_slate(8, 4, model_sd=0.08)
+	tickets = [t for t in synthetic_tickets(50, legs, size=2) if t.expected_value > 0][:4]
+	for t in tickets:
+		t.kelly_stake = 10.0
+	assert score(tickets, bankroll=1000.0)["log_growth"] > float("-inf")
+	assert score(tickets, bankroll=40.0)["log_growth"] == float("-inf")
+
+
+def test_sweep_shares_beams_and_matches_across_workers(season: Path):
+	base = AppConfig(sportsbooks=["draftkings", "fanduel"], desired_num_tickets=3, run_budget=30.0)
+	slates, errors = prepare_slates(list(discover_weeks(season).values()), base)
+	assert len(slates) == 2 and not errors
+	configs = expand({"parlay_sizes": [[2, 3]], "team_exposure_cap": [0.4, 0.8], "stake_method": ["equal", "kelly_joint"]})
+	inline = list(iter_sweep(slates, base, configs, workers=1))
+	assert [r["config"] for r in inline] == [0, 1, 2, 3]
+	# Same beam settings throughout: only the first config builds the beams
+	assert inline[0]["beams_cached"] == 0 and all(r["beams_cached"] == 4 for r in inline[1:])
+	assert all(r["slates"] == 2 and r["tickets"] == 6 and r["expected_profit"] > 0 for r in inline)
+	pooled = list(iter_sweep(slates, base, configs, workers=2))
+	assert [r["expected_profit"] for r in pooled] == [r["expected_profit"] for r in inline]
+
+
+def test_sweep_cli_writes_table(season: Path, tmp_path: Path):
+	cfg = tmp_path / "base.yaml"
+	cfg.write_text("sportsbooks: [draftkings, fanduel]\ndesired_num_tickets: 2\n", encoding="utf-8")
+	out = tmp_path / "sweep.csv"
+	args = ["sweep", str(season), "--config", str(cfg), "--param", "beam_width=5,20", "--param", "parlay_sizes=2-3", "--workers", "1", "--out", str(out)]
+	result = CliRunner().invoke(app, args)
+	assert result.exit_code == 0, result.output
+	with out.open(newline="") as fh:
+		rows = list(csv.DictReader(fh))
+	assert len(rows) == 2 and {r["beam_width"] for r in rows} == {"5", "20"}
+	assert rows[0]["parlay_sizes"] == "2-3" and float(rows[0]["seconds"]) > 0
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from benchmarks.suite import compare
+from ev_parlay.synthetic import synthetic_books, synthetic_slate, synthetic_tickets
+
+
+def test_synthetic_slate_is_seeded_and_consistent():
+	payload, legs = synthetic_slate(10, n_books=14, seed=3)
+	again, legs2 = synthetic_slate(10, n_books=14, seed=3)
+	assert payload == again and legs == legs2
+	assert len(set(synthetic_books(14))) == 14
+	assert len(legs) == 20 and len({l.game_id for l in legs}) == 10
+	for leg in legs:
+		assert leg.best_odds is not None and 0.0 < leg.model_win_prob < 1.0
+		assert leg.edge == leg.model_win_prob - leg.best_odds.implied_prob
+	tickets = synthetic_tickets(5, legs, size=3)
+	assert all(len({l.game_id for l in t.legs}) == 3 for t in tickets)
+
+
+def test_compare_flags_only_real_regressions():
+	def results(**ms):
+		return {"results": {k: {"min_ms": v} for k, v in ms.items()}}
+
+	rows = compare(results(a=13.5, b=0.9, c=50.0, new=1.0), results(a=10.0, b=0.5, c=60.0), threshold=0.3, min_delta_ms=0.5)
+	assert {name: regressed for name, _, _, regressed in rows} == {"a": True, "b": False, "c": False}
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from ev_parlay.parser import parse_model_text
+from ev_parlay.team_mapping import normalize_team, resolve_team
+
+
+def test_resolve_team_variants():
+	assert normalize_team("jaguars") == "Jacksonville Jaguars"
+	assert normalize_team("N.Y. Jets") == "New York Jets"
+	assert normalize_team("LA Rams ") == "Los Angeles Rams"
+	assert normalize_team("the Jaguars (home)") == "Jacksonville Jaguars"
+	assert normalize_team("Pittsburg Steelers") == "Pittsburgh Steelers"
+	assert normalize_team("Green Bay Packers") == "Green Bay Packers"
+
+
+def test_resolve_team_rejects_ambiguous_and_unknown():
+	assert resolve_team("New York") is None
+	assert resolve_team("Over") is None
+	assert resolve_team("Team 5") is None
+	assert resolve_team("Jets vs Giants") is None
+
+
+def test_resolve_team_is_memoized():
+	resolve_team.cache_clear()
+	resolve_team("kc chiefs")
+	resolve_team("kc chiefs")
+	assert resolve_team.cache_info().hits == 1
+
+
+def test_parser_uses_resolver():
+	sel = parse_model_text("jaguars 61.8%\nN.Y. Jets 55%")
+	assert [s.team_abbr for s in sel] == ["JAX", "NYJ"]
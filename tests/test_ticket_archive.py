@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import numpy as np
+from typer.testing import CliRunner
+
+from ev_parlay.cli import app
+from ev_parlay.reporting import write_artifacts
+from ev_parlay.simulate import simulate_archive_samples
+from ev_parlay.synthetic import synthetic_slate, synthetic_tickets
+from ev_parlay.ticket_archive import TicketArchive, archive_for, load_archive, save_archive
+
+
+def _tickets(n=12):
+	_, legs = synthetic_slate(8, 4)
+	legs[0].margin = 3.5
+	return synthetic_tickets(n, legs, size=3)
+
+
+def test_archive_round_trip_is_lossless(tmp_path):
+	tickets = _tickets()
+	path = save_archive(tmp_path / "t.npz", tickets)
+	archive = load_archive(path)
+	assert isinstance(archive.membership, np.memmap)
+	assert archive.membership.shape == (len(tickets), archive.num_legs)
+	assert archive.membership.sum(axis=1).tolist() == [3] * len(tickets)
+	assert archive.has_legs
+	assert [t.model_dump() for t in archive.to_tickets()] == [t.model_dump() for t in tickets]
+	assert [t.model_dump() for t in load_archive(path, mmap=False).to_tickets()] == [t.model_dump() for t in tickets]
+
+
+def test_shared_legs_move_together():
+	tickets = _tickets(2)
+	tickets[1] = tickets[0].model_copy()  # identical tickets: both win or both lose
+	profits = simulate_archive_samples(TicketArchive.from_tickets(tickets), trials=2000)
+	stake = tickets[0].kelly_stake if tickets[0].kelly_stake > 0 else tickets[0].flat_stake
+	assert set(np.round(profits, 6)) == {round(-2 * stake, 6), round(2 * stake * (tickets[0].combined_decimal - 1.0), 6)}
+
+
+def test_simulate_prefers_archive_and_reads_legacy_csv(tmp_path):
+	write_artifacts(tmp_path, _tickets())
+	assert archive_for(tmp_path / "parlays.csv") == tmp_path / "tickets.npz"
+	runner = CliRunner()
+	with_archive = runner.invoke(app, ["simulate", "--parlays", str(tmp_path / "parlays.csv"), "--trials", "500"])
+	assert with_archive.exit_code == 0, with_archive.output
+	(tmp_path / "tickets.npz").unlink()
+	legacy = runner.invoke(app, ["simulate", "--parlays", str(tmp_path / "parlays.csv"), "--trials", "500"])
+	assert legacy.exit_code == 0, legacy.output
+	assert '"mean"' in legacy.output
+
+
+def test_artifact_formats_agree(tmp_path):
+	import csv
+	import json
+
+	tickets = _tickets()
+	summary = write_artifacts(tmp_path / "csv", tickets)
+	write_artifacts(tmp_path / "jsonl", tickets, fmt="jsonl")
+	with (tmp_path / "csv" / "parlays.csv").open(newline="") as fh:
+		csv_rows = list(csv.DictReader(fh))
+	jsonl_rows = [json.loads(line) for line in (tmp_path / "jsonl" / "parlays.jsonl").read_text().splitlines()]
+	assert [r["legs"] for r in csv_rows] == [r["legs"] for r in jsonl_rows] == [",".join(t.teams) for t in tickets]
+	assert [float(r["EV_dollars"]) for r in csv_rows] == [r["EV_dollars"] for r in jsonl_rows]
+	assert summary.count == len(tickets)
+	assert abs(summary.avg_size - 3.0) < 1e-9
+	assert abs(sum(summary.exposure.values()) - 3.0) < 1e-9
+	assert json.loads((tmp_path / "jsonl" / "summary.json").read_text()) == json.loads((tmp_path / "csv" / "summary.json").read_text())